@@ -1 +1,6 @@
-from .main_window import MainWindow
+def __getattr__(name):
+    # 延迟导入 MainWindow（PyQt5/pyqtgraph/numpy），仅使用 ConfigManager 等模块时不付出 GUI 启动开销
+    if name == "MainWindow":
+        from .main_window import MainWindow
+        return MainWindow
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
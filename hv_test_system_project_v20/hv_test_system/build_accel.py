@@ -0,0 +1,32 @@
+"""AOT 编译 DataBuffer 热点函数（可选）
+
+用法：python -m hv_test_system.build_accel
+在包目录生成 _accel 扩展模块（.so/.pyd），data_buffer 优先导入它，
+从而免去运行时 numba JIT 编译与缓存加载的启动开销。
+需要 numba 提供的 numba.pycc（较新的 numba 版本已移除该模块）。
+"""
+from __future__ import annotations
+
+from pathlib import Path
+
+from numba.pycc import CC  # type: ignore
+
+cc = CC("_accel")
+cc.output_dir = str(Path(__file__).resolve().parent)
+
+
+@cc.export("write_row", "void(f4[:,:], i8, f4, f4, f4, f4, f4, f4, f4)")
+def write_row(cols, idx, t, c, g, a, b, kv, v):
+    cols[idx, 0] = t
+    cols[idx, 1] = c
+    cols[idx, 2] = g
+    cols[idx, 3] = a
+    cols[idx, 4] = b
+    cols[idx, 5] = kv
+    cols[idx, 6] = v
+    cols[idx, 7] = g + a + b
+    cols[idx, 8] = 0.0 if c == 0.0 else a / c * 100.0
+
+
+if __name__ == "__main__":
+    cc.compile()
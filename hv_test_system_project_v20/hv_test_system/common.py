@@ -16,7 +16,6 @@ from PyQt5.QtCore import QTimer, QThread, pyqtSignal, Qt, QMutex, QMutexLocker,
 from PyQt5.QtGui import QFont, QColor
 import pyqtgraph as pg
 import numpy as np
-import warnings
 import gc
 import traceback
 import configparser
@@ -24,14 +23,11 @@ import os
 import csv
 import pathlib
 
-# 抑制各种警告
 from .constants import CONFIG_FILE, TEMP_DATA_FILE, DATA_HEADERS, DATA_HEADER_LINE
 from .logging_utils import setup_logger
 
 logger = setup_logger()
 
-warnings.filterwarnings("ignore")
-
 # 设置pyqtgraph使用抗锯齿
 pg.setConfigOptions(antialias=True)
 
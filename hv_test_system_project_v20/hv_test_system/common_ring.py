@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+from typing import Any, List
+
+
+class SPSCRing:
+    """Lock-free single-producer/single-consumer ring for telemetry handoff.
+
+    - put() never blocks; on overflow the oldest items are dropped (live data)
+    - get_many() drains into a caller-provided list (no per-call allocation)
+    - only the producer writes `head`, only the consumer writes `tail`;
+      under CPython's GIL the int stores are atomic, so no lock is needed
+
+    Use queue.Queue instead for control messages that need blocking semantics.
+    """
+
+    __slots__ = ("buf", "mask", "head", "tail")
+
+    def __init__(self, capacity: int = 4096):
+        size = 1
+        while size < max(2, int(capacity)):
+            size <<= 1
+        self.buf: List[Any] = [None] * size
+        self.mask = size - 1
+        self.head = 0  # total items written (producer)
+        self.tail = 0  # total items consumed (consumer)
+
+    def __len__(self) -> int:
+        return min(self.head - self.tail, self.mask + 1)
+
+    @property
+    def capacity(self) -> int:
+        return self.mask + 1
+
+    def put(self, item: Any) -> None:
+        h = self.head
+        self.buf[h & self.mask] = item
+        self.head = h + 1
+
+    def get_many(self, out: List[Any], max_n: int) -> int:
+        """Append up to max_n items to `out`; returns the number appended."""
+        h = self.head
+        t = self.tail
+        size = self.mask + 1
+        if h - t > size:
+            # producer lapped us: skip what was overwritten
+            t = h - size
+        n = min(h - t, int(max_n))
+        if n <= 0:
+            return 0
+        buf = self.buf
+        mask = self.mask
+        for i in range(t, t + n):
+            out.append(buf[i & mask])
+        self.tail = t + n
+        return n
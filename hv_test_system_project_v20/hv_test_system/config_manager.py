@@ -1,6 +1,8 @@
 from __future__ import annotations
 
-from .common import *
+import configparser
+import os
+
 from .constants import CONFIG_FILE
 
 class ConfigManager:
@@ -9,13 +11,32 @@ class ConfigManager:
     def __init__(self):
         self.config = configparser.ConfigParser()
         self.config_file = CONFIG_FILE
+        # (st_mtime_ns, st_size) of the file last parsed into self.config
+        self._cached_key: tuple[int, int] | None = None
+
+    def _stat_key(self):
+        try:
+            st = os.stat(self.config_file)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def has_changed(self) -> bool:
+        """配置文件自上次加载后是否被修改（不触发重新解析）"""
+        key = self._stat_key()
+        return key is None or key != self._cached_key
 
     def load_config(self):
-        """加载配置文件"""
+        """加载配置文件（文件未变化时直接返回已解析的配置）"""
         if not os.path.exists(self.config_file):
             self.create_default_config()
 
+        key = self._stat_key()
+        if key is not None and key == self._cached_key:
+            return self.config
+
         self.config.read(self.config_file, encoding='utf-8')
+        self._cached_key = key
         return self.config
 
     def save_config(self, config_data):
@@ -28,6 +49,7 @@ class ConfigManager:
 
         with open(self.config_file, 'w', encoding='utf-8') as f:
             self.config.write(f)
+        self._cached_key = None
 
     def create_default_config(self):
         """创建默认配置文件"""
@@ -51,7 +73,8 @@ class ConfigManager:
             'vacuum_port': '',
             'vacuum_coeff': '1.0',
             'vacuum_channel': '3',
-            'vacuum_baudrate': '19200'
+            'vacuum_baudrate': '19200',
+            'display_interval_ms': '150'
         }
 # Keithley 248高压源设置
         self.config['Keithley248'] = {
@@ -105,7 +128,7 @@ class ConfigManager:
             'influxdb_database': 'hv_test',
             'influx_measurement': 'hv_test',
             'influx_device': 'win10',
-            'influx_batch_size': '100',
+            'influx_batch_size': '1000',
             'influx_flush_interval_s': '1.0',
             'influx_timeout_s': '3.0'
         }
@@ -117,7 +140,14 @@ class ConfigManager:
             'synchronous': 'NORMAL',
             'auto_vacuum': 'INCREMENTAL',
             'commit_every_rows': '200',
-            'commit_every_ms': '500'
+            'commit_every_ms': '500',
+            'busy_timeout_ms': '5000',
+            'temp_store': 'MEMORY',
+            'cache_size_kib': '20000',
+            # true: 按天分库 session_YYYYMMDD.sqlite，保留策略按整文件删除
+            'shard_by_day': 'false',
+            # 仅在新建数据库文件时生效
+            'page_size': '8192'
         }
 
         # Retention / maintenance policy for SQLite
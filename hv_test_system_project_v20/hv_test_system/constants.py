@@ -4,3 +4,9 @@ CONFIG_FILE = "config.ini"
 TEMP_DATA_FILE = "临时数据.txt"
 DATA_HEADERS = ['时间', '高压源电压', '阴极', '栅极', '阳极', '收集极', '真空(Pa)', '栅极电压', '栅极+阳极+收集极', '(阳极/阴极)×100']
 DATA_HEADER_LINE = ",".join(DATA_HEADERS) + "\n"
+
+# 万用表通道（与控制面板中各行顺序一致）及显示名
+METER_TYPES = ('cathode', 'gate', 'anode', 'backup', 'vacuum')
+METER_NAMES = {'cathode': '阴极', 'gate': '栅极', 'anode': '阳极', 'backup': '收集极', 'vacuum': '真空'}
+# 稳流电流来源（元组序号即稳流设置对话框下拉框序号）
+CURRENT_SOURCES = ('keithley', 'cathode', 'gate', 'anode', 'backup')
@@ -1,7 +1,71 @@
 from __future__ import annotations
 
-from .common import *
-from .device_io.workers import VisaIOWorker, SerialIOWorker
+import random
+import struct
+import threading
+import time
+
+from .logging_utils import setup_logger
+from .device_io.workers import VisaIOWorker, SerialIOWorker, IOReq
+
+logger = setup_logger()
+
+
+def _crc16_modbus_entry(i: int) -> int:
+    crc = i
+    for _ in range(8):
+        if crc & 0x0001:
+            crc = (crc >> 1) ^ 0xA001
+        else:
+            crc >>= 1
+    return crc
+
+
+# Modbus CRC16（多项式 0xA001）查表：每字节一次查表，替代逐位移位
+_CRC16_MODBUS_TABLE = tuple(_crc16_modbus_entry(i) for i in range(256))
+
+# Modbus 寄存器中的 IEEE754 大端 float（2 regs）
+_BE_FLOAT = struct.Struct(">f")
+
+# HAPS06 寄存器地址
+_REG_VSET = 0x0A05
+_REG_VS = 0x0B00
+
+# 可选：crcmod 的 C 扩展（未安装时回退到上面的查表实现）
+try:
+    import crcmod.predefined  # type: ignore
+    _crc16_modbus_native = crcmod.predefined.mkPredefinedCrcFun("modbus")
+except Exception:  # pragma: no cover
+    _crc16_modbus_native = None
+
+
+def _crc16_modbus(data: bytes) -> bytes:
+    """Modbus CRC16，返回小端 2 字节。"""
+    if _crc16_modbus_native is not None:
+        return _crc16_modbus_native(bytes(data)).to_bytes(2, byteorder="little")
+    table = _CRC16_MODBUS_TABLE
+    crc = 0xFFFF
+    for byte in data:
+        crc = (crc >> 8) ^ table[(crc ^ byte) & 0xFF]
+    return crc.to_bytes(2, byteorder="little")
+
+
+def _build_frame(header: bytes) -> bytes:
+    """地址 + PDU 写入按最终帧长预分配的缓冲区，并就地追加 CRC。"""
+    n = len(header)
+    buf = bytearray(n + 2)
+    buf[:n] = header
+    buf[n:] = _crc16_modbus(memoryview(buf)[:n])
+    return bytes(buf)
+
+
+def _f_to_b(value: float) -> bytes:
+    return _BE_FLOAT.pack(float(value))
+
+
+def _b_to_f(byte_array: bytes, offset: int = 0) -> float:
+    return _BE_FLOAT.unpack_from(byte_array, offset)[0]
+
 
 class Keithley248Controller:
     """Keithley 248高压电源控制器（通过GPIB）"""
@@ -15,6 +79,10 @@ class Keithley248Controller:
         self._lock = threading.RLock()
         self.resource_name = ""
         self._worker: VisaIOWorker | None = None
+        # 设备是否响应 *OPC?（连接时探测；不支持时写命令后退回固定等待）
+        self._opc_supported = False
+        # 设备是否接受复合查询 VOUT?;IOUT?（连接时探测；不支持时直接走单独查询）
+        self.compound_query_supported = False
 
     def connect_gpib(self, address):
         """连接GPIB设备"""
@@ -35,6 +103,8 @@ class Keithley248Controller:
                         self.is_connected = True
                         self.gpib_address = int(address)
                         self.resource_name = resource_name
+                        self._opc_supported = self._probe_opc()
+                        self.compound_query_supported = self._probe_compound_query()
                         return True, f"GPIB连接成功，地址: {address}, 设备: {idn.strip()}"
                     last_err = "无法获取设备ID"
                 except ImportError:
@@ -51,6 +121,41 @@ class Keithley248Controller:
 
             return False, f"连接失败: {last_err}" if last_err else "连接失败"
 
+    def _probe_opc(self) -> bool:
+        """探测 *OPC? 同步查询是否可用（短超时，避免不支持的设备卡住连接）"""
+        def _do(inst):
+            old_timeout = inst.timeout
+            inst.timeout = 1000
+            try:
+                return inst.query("*OPC?").strip()
+            finally:
+                inst.timeout = old_timeout
+
+        try:
+            return self._worker.call(_do, timeout_s=2.5) == "1"
+        except Exception:
+            return False
+
+    def _probe_compound_query(self) -> bool:
+        """探测复合查询 VOUT?;IOUT? 是否返回两个数值（短超时，同 _probe_opc）"""
+        def _do(inst):
+            old_timeout = inst.timeout
+            inst.timeout = 1000
+            try:
+                return inst.query("VOUT?;IOUT?").strip()
+            finally:
+                inst.timeout = old_timeout
+
+        try:
+            parts = self._worker.call(_do, timeout_s=2.5).split(";")
+            if len(parts) != 2:
+                return False
+            float(parts[0])
+            float(parts[1])
+            return True
+        except Exception:
+            return False
+
     def disconnect(self):
         """断开连接"""
         with self._lock:
@@ -70,9 +175,18 @@ class Keithley248Controller:
                 self.instrument = None
             self.is_connected = False
             self.resource_name = ""
+            self._opc_supported = False
+            self.compound_query_supported = False
 
-    def send_command(self, command):
-        """发送命令到设备"""
+    def send_command(self, command, sync: bool = True):
+        """发送命令到设备
+
+        设置命令在 sync=True 时等待设备执行完成：支持 *OPC? 的设备在同一次
+        worker 调用内 write + *OPC?，否则退回写后固定等待 50ms。
+        """
+        # 未连接时（UI 常见轮询状态）无需加锁；检查与加锁之间被断开也无害，worker 调用会失败返回 None
+        if not self.is_connected or not self._worker:
+            return None
         with self._lock:
             if not self.is_connected or not self._worker:
                 return None
@@ -81,17 +195,28 @@ class Keithley248Controller:
                 if command.endswith("?"):
                     # 查询命令
                     return self._worker.call(lambda inst: inst.query(command).strip(), timeout_s=3.0)
+                elif sync and self._opc_supported:
+                    # 设置命令 + 完成同步（一次往返）
+                    def _write_sync(inst):
+                        inst.write(command)
+                        return inst.query("*OPC?").strip()
+
+                    self._worker.call(_write_sync, timeout_s=3.0)
+                    return "OK"
                 else:
                     # 设置命令
                     self._worker.call(lambda inst: inst.write(command), timeout_s=3.0)
-                    time.sleep(0.05)
+                    if sync:
+                        time.sleep(0.05)
                     return "OK"
             except Exception as e:
-                logger.info(f"发送命令错误: {command}, 错误: {str(e)}")
+                logger.info("发送命令错误: %s, 错误: %s", command, e)
                 return None
 
     def read_voltage(self):
         """读取实际输出电压（VOUT?命令）"""
+        if not self.is_connected:
+            return None
         with self._lock:
             response = self.send_command("VOUT?")
             if response:
@@ -105,6 +230,8 @@ class Keithley248Controller:
 
     def read_current(self):
         """读取实际输出电流（IOUT?命令）"""
+        if not self.is_connected:
+            return None
         with self._lock:
             response = self.send_command("IOUT?")
             if response:
@@ -116,8 +243,40 @@ class Keithley248Controller:
                     return None
             return None
 
+    def read_voltage_current(self):
+        """一次 GPIB 往返读取输出电压与电流（复合查询 VOUT?;IOUT?）
+
+        返回 (voltage_V, current_uA)；读取失败的一项为 None。
+        设备不接受复合查询（连接时探测）或本次复合查询失败时，使用两次单独查询。
+        """
+        if not self.is_connected:
+            return None, None
+        with self._lock:
+            if not self.compound_query_supported:
+                return self.read_voltage(), self.read_current()
+            response = self.send_command("VOUT?;IOUT?")
+            parts = response.split(";") if response else []
+            if len(parts) != 2:
+                return self.read_voltage(), self.read_current()
+
+            voltage = current_ua = None
+            try:
+                voltage = float(parts[0])
+                self.current_voltage = voltage
+            except ValueError:
+                pass
+            try:
+                current = float(parts[1])
+                self.current_current = current
+                current_ua = current * 1e6  # 转换为uA
+            except ValueError:
+                pass
+            return voltage, current_ua
+
     def set_voltage(self, voltage):
         """设置输出电压（VSET命令）"""
+        if not self.is_connected:
+            return False, "设置电压失败"
         with self._lock:
             success = self.send_command(f"VSET {voltage}")
             if success is not None:
@@ -127,6 +286,8 @@ class Keithley248Controller:
 
     def set_current_limit(self, current_ua):
         """设置电流限制（ILIM命令，单位转换为A）"""
+        if not self.is_connected:
+            return False, "设置电流限制失败"
         with self._lock:
             current_a = current_ua / 1e6
             success = self.send_command(f"ILIM {current_a}")
@@ -136,6 +297,8 @@ class Keithley248Controller:
 
     def set_current_trip(self, current_ua):
         """设置电流跳闸点（ITRP命令，单位转换为A）"""
+        if not self.is_connected:
+            return False, "设置电流跳闸点失败"
         with self._lock:
             current_a = current_ua / 1e6
             success = self.send_command(f"ITRP {current_a}")
@@ -145,6 +308,8 @@ class Keithley248Controller:
 
     def set_voltage_limit(self, voltage):
         """设置电压限制（VLIM命令）"""
+        if not self.is_connected:
+            return False, "设置电压限制失败"
         with self._lock:
             success = self.send_command(f"VLIM {voltage}")
             if success is not None:
@@ -153,6 +318,8 @@ class Keithley248Controller:
 
     def enable_high_voltage(self):
         """开启高压输出（HVON命令）"""
+        if not self.is_connected:
+            return False, "开启高压输出失败"
         with self._lock:
             success = self.send_command("HVON")
             if success is not None:
@@ -161,6 +328,8 @@ class Keithley248Controller:
 
     def disable_high_voltage(self):
         """关闭高压输出（HVOF命令）"""
+        if not self.is_connected:
+            return False, "关闭高压输出失败"
         with self._lock:
             success = self.send_command("HVOF")
             if success is not None:
@@ -202,8 +371,16 @@ class HAPS06Controller:
         # Modbus 从站地址(1~64)，可自动探测
         self.slave_addr = 1
 
-        # 长测稳定性
+        # 固定请求帧缓存（含 CRC），键为 (从站地址, 帧名)
+        self._frame_cache: dict[tuple[int, str], bytes] = {}
+        # 专用读取函数（连接/地址探测后生成），未连接时为 None
+        self._read_vs = None
+        self._read_vset = None
+
+        # 长测稳定性：连续失败后按指数退避重连（1s 起，翻倍至 30s 上限）
         self._consecutive_failures = 0
+        self._next_reconnect_monotonic = 0.0
+        self._reconnect_backoff_s = 1.0
         self._last_port: str | None = None
         self._last_baudrate: int | None = None
         self._open_kwargs: dict = {}
@@ -224,12 +401,15 @@ class HAPS06Controller:
         """连接串口（启动 SerialIOWorker）。"""
         with self._lock:
             self.disconnect()
+            self._frame_cache.clear()
+            self._reconnect_backoff_s = 1.0
+            self._next_reconnect_monotonic = 0.0
 
             try:
                 self._last_port = str(port)
                 self._last_baudrate = int(baudrate)
                 self._open_kwargs = {
-                    "timeout": 0.2,         # 配合 read_exact 轮询
+                    "timeout": 0.2,         # 初始值；worker 按帧设置整帧超时
                     "write_timeout": 3.0,   # 长测更稳
                     "rtscts": False,
                     "dsrdtr": False,
@@ -250,9 +430,10 @@ class HAPS06Controller:
                 # 探测从站地址（防止拨码/地址不一致导致无响应）
                 try:
                     self.slave_addr = self._probe_address(max_total_s=1.2)
-                    logger.info(f"HAPS06 Modbus 地址探测结果: {self.slave_addr}")
+                    logger.info("HAPS06 Modbus 地址探测结果: %s", self.slave_addr)
                 except Exception as e:
-                    logger.info(f"HAPS06 地址探测失败: {e}")
+                    logger.info("HAPS06 地址探测失败: %s", e)
+                self._build_readers()
 
                 return True, f"连接成功 ({self._last_port})"
             except Exception as e:
@@ -289,96 +470,95 @@ class HAPS06Controller:
 
             self.is_remote_control = False
             self._consecutive_failures = 0
+            self._read_vs = None
+            self._read_vset = None
 
     # ---------------------------
     # Modbus helpers
     # ---------------------------
-    def calculate_crc(self, data: bytes) -> bytes:
-        crc = 0xFFFF
-        for byte in data:
-            crc ^= byte
-            for _ in range(8):
-                if crc & 0x0001:
-                    crc >>= 1
-                    crc ^= 0xA001
-                else:
-                    crc >>= 1
-        return crc.to_bytes(2, byteorder="little")
-
-    def float_to_bytes(self, value: float) -> bytes:
-        return struct.pack(">f", float(value))
-
-    def bytes_to_float(self, byte_array: bytes) -> float:
-        return struct.unpack(">f", byte_array)[0]
-
-    def _read_exact(self, ser, n: int, total_timeout: float = 1.2) -> bytes:
-        data = bytearray()
-        t0 = time.monotonic()
-        while len(data) < n and (time.monotonic() - t0) < total_timeout:
-            chunk = ser.read(n - len(data))
-            if chunk:
-                data.extend(chunk)
-            else:
-                time.sleep(0.01)
-        return bytes(data)
+    # 兼容旧调用：帧编解码已移至模块级函数
+    calculate_crc = staticmethod(_crc16_modbus)
+    float_to_bytes = staticmethod(_f_to_b)
+    bytes_to_float = staticmethod(_b_to_f)
+
+    def _frame(self, key: str, pdu: tuple, addr: int | None = None) -> bytes:
+        """返回缓存的固定请求帧（地址 + PDU + CRC），首次使用时构建。"""
+        if addr is None:
+            addr = self.slave_addr
+        frame = self._frame_cache.get((addr, key))
+        if frame is None:
+            frame = _build_frame(bytes((addr,) + pdu))
+            self._frame_cache[(addr, key)] = frame
+        return frame
 
     def _exchange(self, cmd: bytes, resp_len: int, timeout_s: float = 2.0) -> bytes:
         """发送 Modbus-RTU 帧并读取固定长度响应（校验 CRC）。"""
         if not self._worker:
             raise RuntimeError("串口未连接")
 
-        def _do(ser):
-            # 帧间隔（9600bps 时约 4ms），这里取 6ms 保险
-            time.sleep(0.006)
-            try:
-                ser.reset_input_buffer()
-            except Exception:
-                pass
-            try:
-                ser.reset_output_buffer()
-            except Exception:
-                pass
-
-            ser.write(cmd)
-            try:
-                ser.flush()
-            except Exception:
-                pass
-
-            return self._read_exact(ser, resp_len, total_timeout=max(1.0, float(timeout_s)))
-
+        # 固定格式事务交给 worker 直接执行（无需每次构造闭包）
         # 重要：worker.call 的 timeout 要比串口读写总时长略大，避免误报“串口I/O超时”
-        resp = self._io(_do, timeout_s=float(timeout_s) + 2.0)
+        timeout_s = float(timeout_s)
+        resp = self._worker.submit(IOReq(cmd, resp_len, timeout_s=timeout_s), timeout_s=timeout_s + 2.0)
+        return self._check_resp(resp, resp_len)
 
+    def _check_resp(self, resp: bytes, resp_len: int) -> bytes:
         if len(resp) != resp_len:
             raise TimeoutError(f"无响应或响应长度不足(期望{resp_len}字节, 实际{len(resp)}字节)")
         received_crc = resp[-2:]
-        calculated_crc = self.calculate_crc(resp[:-2])
+        calculated_crc = _crc16_modbus(resp[:-2])
         if received_crc != calculated_crc:
+            if self._worker:
+                self._worker.request_resync()
             raise ValueError("CRC错误")
         return resp
 
+    def _make_reader(self, key: str, start_reg: int, count: int, st, timeout_s: float = 2.0):
+        """生成固定寄存器读取函数：请求帧、响应长度与解析函数在生成时确定。"""
+        worker = self._worker
+        resp_len = 5 + 2 * count
+        req = IOReq(self._frame(key, (0x03, start_reg >> 8, start_reg & 0xFF, 0x00, count)),
+                    resp_len, timeout_s=float(timeout_s))
+        call_timeout = float(timeout_s) + 2.0
+        unpack_from = st.unpack_from
+        check = self._check_resp
+
+        def read():
+            return unpack_from(check(worker.submit(req, timeout_s=call_timeout), resp_len), 3)[0]
+
+        return read
+
+    def _build_readers(self):
+        """按当前从站地址生成 VS / VSET 专用读取函数。"""
+        if not self._worker:
+            self._read_vs = self._read_vset = None
+            return
+        self._read_vs = self._make_reader("read_vs", _REG_VS, 2, _BE_FLOAT)
+        self._read_vset = self._make_reader("read_vset", _REG_VSET, 2, _BE_FLOAT)
+
     def _probe_address(self, max_total_s: float = 1.5) -> int:
         """尝试探测从站地址（优先当前；失败则有限时扫描 1~64）。
 
         说明：
         - 某些电脑/USB-232 适配器在“第一次打开串口”后，设备响应可能会延迟。
-        - 旧实现可能在无响应时扫描 1~64，导致连接阶段卡顿较长时间。
-        - 这里加了总耗时上限，优先保证 UI 连接阶段不卡死。
+        - 当前地址通常正确：首次尝试给较长超时（0.6s），其余地址用短超时（0.15s）快速扫描。
+        - max_total_s 为硬上限（含单次超时），优先保证 UI 连接/长测重连不卡死。
         """
-        def build(addr: int) -> bytes:
-            c = bytes([addr, 0x03, 0x0B, 0x04, 0x00, 0x01])  # MODEL=0x0B04, u16
-            return c + self.calculate_crc(c)
-
-        t0 = time.time()
-        candidates = [self.slave_addr] + [i for i in range(1, 65) if i != self.slave_addr]
+        t0 = time.monotonic()
+        deadline = t0 + float(max_total_s)
+        first = self.slave_addr
+        candidates = [first] + [i for i in range(1, 65) if i != first]
         for a in candidates:
-            if time.time() - t0 > float(max_total_s):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
                 break
+            timeout_s = min(0.6 if a == first else 0.15, remaining)
             try:
-                # 连接阶段尽量用较短超时，避免“第一次连接”卡住
-                resp = self._exchange(build(a), resp_len=7, timeout_s=0.25)
+                # MODEL=0x0B04, u16
+                cmd = self._frame("read_model", (0x03, 0x0B, 0x04, 0x00, 0x01), addr=a)
+                resp = self._exchange(cmd, resp_len=7, timeout_s=timeout_s)
                 if resp[0] == a and resp[1] == 0x03 and resp[2] == 0x02:
+                    self.slave_addr = a
                     return a
             except Exception:
                 continue
@@ -393,13 +573,15 @@ class HAPS06Controller:
             if not port or not baud:
                 return False
 
-            logger.info(f"HAPS06 触发自动重连: {reason} (port={port}, baud={baud})")
+            logger.info("HAPS06 触发自动重连: %s (port=%s, baud=%s)", reason, port, baud)
 
             # 记录当前状态，重连后尽量恢复
             want_remote = bool(self.is_remote_control)
             want_voltage = float(self.current_voltage or 0.0)
             testing = bool(self.is_testing or self.is_cycle_testing)
 
+            self._frame_cache.clear()
+
             # 停止旧 worker（不做 exit_remote_control，避免设备无响应时卡住）
             try:
                 if self._worker:
@@ -421,7 +603,7 @@ class HAPS06Controller:
                 self._worker.start()
                 time.sleep(0.2)
             except Exception as e:
-                logger.info(f"HAPS06 自动重连失败(打开串口): {e}")
+                logger.info("HAPS06 自动重连失败(打开串口): %s", e)
                 self._worker = None
                 return False
 
@@ -430,12 +612,13 @@ class HAPS06Controller:
                 self.slave_addr = self._probe_address(max_total_s=1.2)
             except Exception:
                 pass
+            self._build_readers()
 
             # 尝试恢复远控
             if want_remote:
                 ok, msg = self.enable_remote_control()
                 if not ok:
-                    logger.info(f"HAPS06 重连后启用远控失败: {msg}")
+                    logger.info("HAPS06 重连后启用远控失败: %s", msg)
                 else:
                     logger.info("HAPS06 重连后远控已启用")
 
@@ -443,9 +626,9 @@ class HAPS06Controller:
             if testing and want_voltage > 0.0:
                 ok, msg = self.set_voltage_only(want_voltage)
                 if not ok:
-                    logger.info(f"HAPS06 重连后恢复电压失败: {msg}")
+                    logger.info("HAPS06 重连后恢复电压失败: %s", msg)
                 else:
-                    logger.info(f"HAPS06 重连后已恢复电压: {want_voltage}V")
+                    logger.info("HAPS06 重连后已恢复电压: %sV", want_voltage)
 
             return True
 
@@ -458,8 +641,7 @@ class HAPS06Controller:
             if not self._worker:
                 return False, "串口未连接"
             try:
-                cmd = bytes([self.slave_addr, 0x05, 0x05, 0x00, 0xFF, 0x00])
-                cmd += self.calculate_crc(cmd)
+                cmd = self._frame("remote_on", (0x05, 0x05, 0x00, 0xFF, 0x00))
                 _ = self._exchange(cmd, resp_len=8, timeout_s=float(timeout_s))
                 time.sleep(0.05)
                 self.is_remote_control = True
@@ -473,8 +655,7 @@ class HAPS06Controller:
             if not self._worker:
                 return False, "串口未连接"
             try:
-                cmd = bytes([self.slave_addr, 0x05, 0x05, 0x00, 0x00, 0x00])
-                cmd += self.calculate_crc(cmd)
+                cmd = self._frame("remote_off", (0x05, 0x05, 0x00, 0x00, 0x00))
                 _ = self._exchange(cmd, resp_len=8, timeout_s=float(timeout_s))
                 time.sleep(0.05)
                 self.is_remote_control = False
@@ -488,12 +669,13 @@ class HAPS06Controller:
             if not self._worker:
                 return None
             try:
-                cmd = bytes([self.slave_addr, 0x03, 0x0A, 0x05, 0x00, 0x02])
-                cmd += self.calculate_crc(cmd)
+                if self._read_vset is not None:
+                    return self._read_vset()
+                cmd = self._frame("read_vset", (0x03, 0x0A, 0x05, 0x00, 0x02))
                 resp = self._exchange(cmd, resp_len=9, timeout_s=2.0)
-                return self.bytes_to_float(resp[3:7])
+                return _b_to_f(resp, 3)
             except Exception as e:
-                logger.info(f"读取设置电压失败: {e}")
+                logger.info("读取设置电压失败: %s", e)
                 return None
 
     def set_voltage_only(self, voltage: float):
@@ -505,15 +687,13 @@ class HAPS06Controller:
             max_retries = 3
             for attempt in range(max_retries):
                 try:
-                    vbytes = self.float_to_bytes(float(voltage))
+                    vbytes = _f_to_b(float(voltage))
                     # 写 VSET(0x0A05, 2 regs, float)
-                    cmd1 = bytes([self.slave_addr, 0x10, 0x0A, 0x05, 0x00, 0x02, 0x04]) + vbytes
-                    cmd1 += self.calculate_crc(cmd1)
+                    cmd1 = _build_frame(bytes((self.slave_addr, 0x10, 0x0A, 0x05, 0x00, 0x02, 0x04)) + vbytes)
                     _ = self._exchange(cmd1, resp_len=8, timeout_s=2.0)
 
                     # 写 CMD(0x0A00, 1 reg) = 1
-                    cmd2 = bytes([self.slave_addr, 0x10, 0x0A, 0x00, 0x00, 0x01, 0x02, 0x00, 0x01])
-                    cmd2 += self.calculate_crc(cmd2)
+                    cmd2 = self._frame("cmd_apply", (0x10, 0x0A, 0x00, 0x00, 0x01, 0x02, 0x00, 0x01))
                     _ = self._exchange(cmd2, resp_len=8, timeout_s=2.0)
 
                     self.current_voltage = float(voltage)
@@ -539,20 +719,21 @@ class HAPS06Controller:
 
         长测优化：
         - 失败时短重试 1 次
-        - 连续失败达到阈值后自动重连
+        - 连续失败达到阈值后自动重连；重连失败则指数退避，避免反复开关串口
         """
         with self._lock:
             if not self._worker:
                 return None
 
-            cmd = bytes([self.slave_addr, 0x03, 0x0B, 0x00, 0x00, 0x02])
-            cmd += self.calculate_crc(cmd)
+            read = self._read_vs
+            if read is None:
+                cmd = self._frame("read_vs", (0x03, 0x0B, 0x00, 0x00, 0x02))
+                read = lambda: _b_to_f(self._exchange(cmd, resp_len=9, timeout_s=2.0), 3)
 
             last_err = None
             for attempt in range(2):
                 try:
-                    resp = self._exchange(cmd, resp_len=9, timeout_s=2.0)
-                    voltage = self.bytes_to_float(resp[3:7])
+                    voltage = read()
                     self.actual_voltage = float(voltage)
                     self._consecutive_failures = 0
                     if self.voltage_update_callback:
@@ -567,14 +748,24 @@ class HAPS06Controller:
                     if attempt == 0:
                         time.sleep(0.05)
 
-            logger.info(f"读取实际电压失败: {last_err}")
+            logger.info("读取实际电压失败: %s", last_err)
 
-            if self._consecutive_failures >= 5:
+            if self._consecutive_failures >= 5 and time.monotonic() >= self._next_reconnect_monotonic:
                 self._consecutive_failures = 0
+                ok = False
                 try:
-                    self._reconnect(reason=str(last_err))
+                    ok = self._reconnect(reason=str(last_err))
                 except Exception as e:
-                    logger.info(f"HAPS06 自动重连异常: {e}")
+                    logger.info("HAPS06 自动重连异常: %s", e)
+                if ok:
+                    self._reconnect_backoff_s = 1.0
+                    self._next_reconnect_monotonic = 0.0
+                else:
+                    # 加随机抖动，避免与设备/驱动恢复节奏同步
+                    delay = self._reconnect_backoff_s * random.uniform(0.8, 1.2)
+                    self._next_reconnect_monotonic = time.monotonic() + delay
+                    self._reconnect_backoff_s = min(self._reconnect_backoff_s * 2.0, 30.0)
+                    logger.info("HAPS06 重连失败，%.1fs 后再试", delay)
 
             return None
 
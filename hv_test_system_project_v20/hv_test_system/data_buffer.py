@@ -1,136 +1,250 @@
 from __future__ import annotations
 
-from .common import *
+import time
+
+import numpy as np
+
+# 可选加速，按顺序尝试：
+# 1) AOT 编译的 _accel 扩展（python -m hv_test_system.build_accel 生成，无启动编译开销）
+# 2) numba JIT（cache=True，导入时预热）
+# 3) 纯 Python 路径（_write_row 为 None）
+try:
+    from ._accel import write_row as _write_row  # type: ignore
+except Exception:
+    _write_row = None
+
+if _write_row is None:
+    try:
+        from numba import njit  # type: ignore
+    except Exception:  # pragma: no cover
+        njit = None
+
+    if njit is not None:
+        try:
+            @njit(cache=True, fastmath=True)
+            def _write_row(cols, idx, t, c, g, a, b, kv, v):
+                cols[idx, 0] = t
+                cols[idx, 1] = c
+                cols[idx, 2] = g
+                cols[idx, 3] = a
+                cols[idx, 4] = b
+                cols[idx, 5] = kv
+                cols[idx, 6] = v
+                cols[idx, 7] = g + a + b
+                cols[idx, 8] = 0.0 if c == 0.0 else a / c * 100.0
+
+            # 导入时预热编译，避免首个采样点的编译延迟
+            _write_row(np.zeros((1, 9), dtype=np.float32), 0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0)
+        except Exception:  # pragma: no cover
+            _write_row = None
+
 
 class DataBuffer:
     """数据缓冲区，优化数据处理性能"""
 
+    # get_plot_data 返回顺序
+    _CHANNELS = (
+        "time_data", "cathode_data", "gate_data", "anode_data", "backup_data",
+        "keithley_voltage_data", "vacuum_data", "gate_plus_anode_data", "anode_cathode_ratio_data",
+    )
+    # 曲线名（与 MainWindow.plots 的键一致）-> 列序号
+    _CURVE_INDEX = {name[:-len("_data")]: k for k, name in enumerate(_CHANNELS) if k > 0}
+
     def __init__(self, max_points=3000):  # 减少最大点数，提高性能
-        self.max_points = max_points
-        self.time_data = np.zeros(max_points)
-        self.cathode_data = np.zeros(max_points)
-        self.gate_data = np.zeros(max_points)
-        self.anode_data = np.zeros(max_points)
-        self.backup_data = np.zeros(max_points)
-        self.keithley_voltage_data = np.zeros(max_points)
-        self.vacuum_data = np.zeros(max_points)  # 新增：真空  # 新增：Keithley电压数据
-        self.gate_plus_anode_data = np.zeros(max_points)
-        self.anode_cathode_ratio_data = np.zeros(max_points)
-        self.index = 0
-        self.is_full = False
-        self.start_time = time.time()
+        self._allocate(max_points)
+        self.index = 0          # 累计写入点数（单调递增）
+        self._write_idx = 0     # 下一个写入位置，始终在 [0, max_points)
+        # 单调时钟：不受系统校时（NTP）跳变影响，保证横轴时间递增
+        self.start_time = time.monotonic()
         self.last_plot_update = 0
         self.plot_update_interval = 0.2  # 图表更新间隔0.2秒
+        # get_plot_data 结果缓存：无新数据或未到更新间隔时直接复用
+        self._cache = None
+        self._cache_index = -1
+
+    def _allocate(self, max_points):
+        # 容量向上取整到 2 的幂（实际窗口可能略大于请求值）
+        self.max_points = 1 << (max(1, int(max_points)) - 1).bit_length()
+        # 所有通道存放在一个连续矩阵中（每行一个采样点，列顺序同 _CHANNELS）
+        # float32：测量精度远低于 7 位有效数字，且绘图端本身按 float32 处理，拷贝带宽减半
+        # 双倍长度镜像：每个点同时写入 idx 与 idx+max_points，
+        # 满缓冲时按时间顺序的窗口就是 _cols[start:start+max_points]，无需展开拷贝
+        self._cols = np.zeros((2 * self.max_points, len(self._CHANNELS)), dtype=np.float32)
+        # 时间另存 float64（同样双倍镜像）：float32 秒数在长测中分辨率变粗（1 天后约 1/128 s），
+        # 只在生成绘图数据时转 float32；_cols 第 0 列仅是写入函数顺带写入的 float32 副本，不用于绘图
+        self._times = np.zeros(2 * self.max_points, dtype=np.float64)
+        # 绘图用 float32 时间列（满缓冲时已重新基准）
+        self._scratch_time = np.empty(self.max_points, dtype=np.float32)
+        # 各通道命名列视图（兼容原有属性访问；前半段即环形缓冲区本身）
+        for k, name in enumerate(self._CHANNELS):
+            setattr(self, name, self._cols[:self.max_points, k])
+        self.time_data = self._times[:self.max_points]
 
     def add_data(self, cathode, gate, anode, backup, keithley_voltage, vacuum):
         """添加新数据点"""
-        current_time = time.time() - self.start_time
-
-        # 使用模运算实现循环缓冲区，避免数组拷贝
-        idx = self.index % self.max_points
+        now = time.monotonic()
+        if self.index == 0:
+            # 时间以首个采样点为零点存储，未满时绘图可直接返回视图
+            self.start_time = now
+        current_time = now - self.start_time
 
-        self.time_data[idx] = current_time
-        self.cathode_data[idx] = cathode
-        self.gate_data[idx] = gate
-        self.anode_data[idx] = anode
-        self.backup_data[idx] = backup
-        self.keithley_voltage_data[idx] = keithley_voltage  # 新增
-        self.vacuum_data[idx] = vacuum  # 新增：真空
-        self.gate_plus_anode_data[idx] = gate + anode + backup
-        self.anode_cathode_ratio_data[idx] = (anode / cathode * 100) if cathode != 0 else 0
+        # 循环缓冲区：写指针回绕时做一次减法，无需取模
+        idx = self._write_idx
+        if self.index >= self.max_points:
+            # 满缓冲时缓存结果是环形区视图，本次写入会覆盖其最早一行，缓存作废
+            self._cache = None
 
+        if _write_row is not None:
+            _write_row(self._cols, idx, float(current_time), float(cathode), float(gate), float(anode),
+                       float(backup), float(keithley_voltage), float(vacuum))
+        else:
+            # 一次写入整行：时间、阴极、栅极、阳极、备用、Keithley电压、真空、栅+阳+备用、阳/阴比
+            self._cols[idx] = (
+                current_time, cathode, gate, anode, backup, keithley_voltage, vacuum,
+                gate + anode + backup,
+                (anode / cathode * 100) if cathode != 0 else 0,
+            )
+        self._cols[idx + self.max_points] = self._cols[idx]
+        self._times[idx] = self._times[idx + self.max_points] = current_time
+
+        idx += 1
+        self._write_idx = idx - self.max_points if idx >= self.max_points else idx
         self.index += 1
-        if self.index >= self.max_points:
-            self.is_full = True
+
+    def add_data_batch(self, cathode, gate, anode, backup, keithley_voltage, vacuum, times=None,
+                       sample_rate=None):
+        """批量添加 N 个数据点（各参数为等长数组），向量化写入环形缓冲区
+
+        times: 相对 start_time 的时间（秒）；为 None 且给出 sample_rate(Hz) 时，
+        按采样率从一次取时推算各点时间（最后一点为当前时间）；否则均记为当前时间。
+        """
+        cathode = np.asarray(cathode, dtype=np.float32)
+        n = len(cathode)
+        if n == 0:
+            return
+        rows = np.empty((n, len(self._CHANNELS)), dtype=np.float32)
+        if times is None:
+            t_now = time.monotonic() - self.start_time
+            if sample_rate:
+                t = t_now - np.arange(n - 1, -1, -1) / float(sample_rate)
+            else:
+                t = np.full(n, t_now)
+        else:
+            t = np.array(times, dtype=np.float64)
+        if self.index == 0:
+            # 与 add_data 一致：以首个采样点为零点
+            t0 = float(t[0])
+            t -= t0
+            self.start_time += t0
+        rows[:, 0] = t
+        rows[:, 1] = cathode
+        rows[:, 2] = gate
+        rows[:, 3] = anode
+        rows[:, 4] = backup
+        rows[:, 5] = keithley_voltage
+        rows[:, 6] = vacuum
+        # 派生列：栅+阳+备用、阳/阴比（阴极为 0 时记 0）
+        np.add(rows[:, 2], rows[:, 3], out=rows[:, 7])
+        rows[:, 7] += rows[:, 4]
+        ratio = rows[:, 8]
+        ratio.fill(0.0)
+        np.divide(rows[:, 3], rows[:, 1], out=ratio, where=rows[:, 1] != 0)
+        ratio *= 100
+
+        total = n
+        if self.index + n > self.max_points:
+            # 本批会覆盖缓存视图中已有的行（见 add_data），缓存作废
+            self._cache = None
+        if n > self.max_points:
+            # 只保留最后 max_points 个点
+            skip = n - self.max_points
+            rows = rows[skip:]
+            t = t[skip:]
+            n = self.max_points
+            self._write_idx = (self._write_idx + skip) % self.max_points
+
+        start = self._write_idx
+        m = self.max_points
+        n1 = min(n, m - start)
+        self._cols[start:start + n1] = rows[:n1]
+        self._cols[:n - n1] = rows[n1:]
+        self._cols[m + start:m + start + n1] = rows[:n1]
+        self._cols[m:m + n - n1] = rows[n1:]
+        times_buf = self._times
+        times_buf[start:start + n1] = t[:n1]
+        times_buf[:n - n1] = t[n1:]
+        times_buf[m + start:m + start + n1] = t[:n1]
+        times_buf[m:m + n - n1] = t[n1:]
+
+        idx = start + n
+        self._write_idx = idx - self.max_points if idx >= self.max_points else idx
+        self.index += total
+
+    def last_derived(self):
+        """最近写入点的派生值 (栅+阳+备用, 阳/阴比×100)，与曲线数据同源，调用方无需重算"""
+        # _write_idx 为 0 时取 -1 即镜像区最后一行，与 max_points-1 处的数据相同
+        row = self._cols[self._write_idx - 1]
+        return float(row[7]), float(row[8])
+
+    @property
+    def is_full(self) -> bool:
+        return self.index >= self.max_points
 
     def get_plot_data(self):
-        """获取绘图数据 - 优化版本"""
+        """获取绘图数据 - 优化版本（按 plot_update_interval 限频，无新数据时复用上次结果）
+
+        缓冲区已满后，新写入会覆盖缓存视图中的行，add_data 会作废缓存，此时每次有新数据即重建。
+        """
+        now = time.monotonic()
+        if self._cache is not None and (
+                self._cache_index == self.index or now - self.last_plot_update < self.plot_update_interval):
+            return self._cache
+        self.last_plot_update = now
+        self._cache_index = self.index
+        self._cache = self._build_plot_data()
+        return self._cache
+
+    def get(self, key):
+        """单条曲线的 (时间, 数值) 视图，可直接用于 curve.setData(*buffer.get(key))"""
+        data = self.get_plot_data()
+        return data[0], data[self._CURVE_INDEX[key]]
+
+    def _build_plot_data(self):
         if self.index == 0:
-            return [np.array([])] * 9  # 修改：9个数组
+            return [np.array([], dtype=np.float32)] * 9  # 修改：9个数组
 
         # 计算实际数据点数量
         actual_points = min(self.index, self.max_points)
 
         if self.is_full:
-            # 数据已满，使用循环索引
-            start_idx = self.index % self.max_points
-            end_idx = (start_idx + self.max_points) % self.max_points
-
-            # 获取时间数据并重新基准
-            time_data = np.concatenate([
-                self.time_data[start_idx:self.max_points],
-                self.time_data[0:end_idx]
-            ])
-
-            # 重新基准时间
-            time_data = time_data - time_data[0]
-
-            # 获取其他数据
-            cathode_data = np.concatenate([
-                self.cathode_data[start_idx:self.max_points],
-                self.cathode_data[0:end_idx]
-            ])
-
-            gate_data = np.concatenate([
-                self.gate_data[start_idx:self.max_points],
-                self.gate_data[0:end_idx]
-            ])
-
-            anode_data = np.concatenate([
-                self.anode_data[start_idx:self.max_points],
-                self.anode_data[0:end_idx]
-            ])
-
-            backup_data = np.concatenate([
-                self.backup_data[start_idx:self.max_points],
-                self.backup_data[0:end_idx]
-            ])
-
-            keithley_voltage_data = np.concatenate([
-                self.keithley_voltage_data[start_idx:self.max_points],
-                self.keithley_voltage_data[0:end_idx]
-            ])
-
-            vacuum_data = np.concatenate([
-                self.vacuum_data[start_idx:self.max_points],
-                self.vacuum_data[0:end_idx]
-            ])
-
-            gate_plus_anode_data = np.concatenate([
-                self.gate_plus_anode_data[start_idx:self.max_points],
-                self.gate_plus_anode_data[0:end_idx]
-            ])
-
-            anode_cathode_ratio_data = np.concatenate([
-                self.anode_cathode_ratio_data[start_idx:self.max_points],
-                self.anode_cathode_ratio_data[0:end_idx]
-            ])
-
-        else:
-            # 数据未满
-            time_data = self.time_data[:actual_points] - self.time_data[0]
-            cathode_data = self.cathode_data[:actual_points]
-            gate_data = self.gate_data[:actual_points]
-            anode_data = self.anode_data[:actual_points]
-            backup_data = self.backup_data[:actual_points]
-            keithley_voltage_data = self.keithley_voltage_data[:actual_points]  # 新增
-            vacuum_data = self.vacuum_data[:actual_points]
-            gate_plus_anode_data = self.gate_plus_anode_data[:actual_points]
-            anode_cathode_ratio_data = self.anode_cathode_ratio_data[:actual_points]
-
-        return time_data, cathode_data, gate_data, anode_data, backup_data, keithley_voltage_data, vacuum_data, gate_plus_anode_data, anode_cathode_ratio_data
+            # 数据已满：镜像矩阵中的连续窗口即按时间排序的数据，直接返回列视图（零拷贝）
+            start_idx = self._write_idx
+            win = self._cols[start_idx:start_idx + self.max_points]
+
+            # 时间列重新基准（以窗口内最早点为零）：float64 相减后再转 float32 写入预分配数组
+            t = self._times[start_idx:start_idx + self.max_points]
+            np.subtract(t, t[0], out=self._scratch_time, casting="unsafe")
+            # 返回的是环形缓冲区视图：调用方需同步使用（Qt 绘图 / tolist）
+            return (self._scratch_time,) + tuple(win[:, k] for k in range(1, len(self._CHANNELS)))
+
+        # 数据未满：时间已以首点为零点存储，转 float32 后与其余列视图一并返回
+        cols = self._cols[:actual_points]
+        t = self._scratch_time[:actual_points]
+        np.copyto(t, self._times[:actual_points], casting="unsafe")
+        return (t,) + tuple(cols[:, k] for k in range(1, len(self._CHANNELS)))
 
     def clear(self):
         """清空缓冲区"""
-        self.time_data = np.zeros(self.max_points)
-        self.cathode_data = np.zeros(self.max_points)
-        self.gate_data = np.zeros(self.max_points)
-        self.anode_data = np.zeros(self.max_points)
-        self.backup_data = np.zeros(self.max_points)
-        self.keithley_voltage_data = np.zeros(self.max_points)  # 新增
-        self.gate_plus_anode_data = np.zeros(self.max_points)
-        self.anode_cathode_ratio_data = np.zeros(self.max_points)
+        # 就地清零（同时清空真空列）；命名列视图保持有效
+        self._cols.fill(0.0)
+        self._times.fill(0.0)
         self.index = 0
-        self.is_full = False
-        self.start_time = time.time()
-
+        self._write_idx = 0
+        self.start_time = time.monotonic()
+        self._cache = None
+        self._cache_index = -1
+
+    def resize(self, max_points):
+        """修改缓冲区容量（重新分配并清空；仅在容量变化时使用，平时清空请用 clear）"""
+        self._allocate(max_points)
+        self.clear()
@@ -1,21 +1,69 @@
 from __future__ import annotations
 
+import threading
 import time
 import traceback
 from dataclasses import dataclass
-from queue import Queue, Empty
-from typing import Any, Callable, Optional
+from queue import Empty, SimpleQueue
+from typing import Any, Callable, Optional, Union
 
 from PyQt5.QtCore import QThread, pyqtSignal
 
+# Modbus-RTU T3.5 silent interval: 11-bit chars, spec floor 1.75ms above 19200bps
+_BITS_PER_CHAR = 11
+_T35_MIN_S = 0.00175
+
+
+@dataclass(slots=True)
+class IOReq:
+    """Fixed-shape serial transaction: write `cmd`, then read `resp_len` bytes.
+
+    Executed inline by SerialIOWorker, so hot-path callers need no closure.
+    """
+    cmd: bytes
+    resp_len: int = 0
+    write_only: bool = False
+    timeout_s: float = 1.0
+
 
 @dataclass
 class _Call:
-    fn: Callable[[Any], Any]
-    reply_q: Queue
+    fn: Union[Callable[[Any], Any], IOReq]
+    reply_q: SimpleQueue
     timeout_s: float
 
 
+# Pushed by stop() to wake a worker blocked in queue.get()
+_SENTINEL = _Call(fn=None, reply_q=None, timeout_s=0)
+
+# One reply queue per calling thread, reused across calls (no per-call Queue allocation)
+_tls = threading.local()
+
+
+def _reply_q() -> SimpleQueue:
+    q = getattr(_tls, "reply_q", None)
+    if q is None:
+        q = _tls.reply_q = SimpleQueue()
+    return q
+
+
+def _await_reply(call: _Call, timeout_s: float):
+    """Wait for this call's (call, ok, payload) reply; raises Empty on timeout.
+
+    The queue is shared by the caller thread's calls, so a late reply to an
+    earlier call that timed out may arrive first; it is discarded.
+    """
+    deadline = time.monotonic() + timeout_s
+    q = call.reply_q
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise Empty
+        who, ok, payload = q.get(timeout=remaining)
+        if who is call:
+            return ok, payload
+
+
 class SerialIOWorker(QThread):
     """Exclusive serial-port I/O worker.
 
@@ -33,9 +81,17 @@ class SerialIOWorker(QThread):
         self.port = port
         self.baudrate = int(baudrate)
         self.open_kwargs = open_kwargs or {}
-        self._queue: Queue[_Call] = Queue()
+        self._queue: SimpleQueue[_Call] = SimpleQueue()
         self._running = True
         self._ser = None
+        # Receive buffer reused by every IOReq (Modbus-RTU frames are <= 256 bytes)
+        self._rx_scratch = bytearray(256)
+        self._frame_gap_s = max(_T35_MIN_S, 3.5 * _BITS_PER_CHAR / self.baudrate)
+        self._last_frame_end = 0.0
+        # Flush the input buffer before the next IOReq (set after timeouts / CRC errors)
+        self._needs_resync = False
+        # Tracebacks are formatted at most once per second (a dead device fails every poll)
+        self._last_err_ts = 0.0
 
     def run(self):
         try:
@@ -74,20 +130,26 @@ class SerialIOWorker(QThread):
             self.io_error.emit(f"串口打开失败({self.port}): {e}")
             self._running = False
 
+        pending: list[_Call] = []
         while self._running:
-            try:
-                call = self._queue.get(timeout=0.1)
-            except Empty:
-                continue
-            try:
-                if not self._ser or not getattr(self._ser, "is_open", False):
-                    raise RuntimeError("串口未打开")
-                res = call.fn(self._ser)
-                call.reply_q.put((True, res))
-            except Exception as e:
-                tb = traceback.format_exc(limit=2)
-                self.io_error.emit(f"串口I/O错误: {e}\n{tb}")
-                call.reply_q.put((False, e))
+            # Block without a timeout: idle workers do not wake; stop() pushes _SENTINEL
+            call = self._queue.get()
+            if call is _SENTINEL:
+                break
+            pending.append(call)
+            # Drain the burst queued meanwhile and run it back-to-back
+            while True:
+                try:
+                    call = self._queue.get_nowait()
+                except Empty:
+                    break
+                if call is _SENTINEL:
+                    self._running = False
+                    break
+                pending.append(call)
+            for call in pending:
+                self._execute(call)
+            pending.clear()
 
         try:
             if self._ser and getattr(self._ser, "is_open", False):
@@ -97,21 +159,97 @@ class SerialIOWorker(QThread):
         self._ser = None
         self.disconnected.emit()
 
+    def _execute(self, call: _Call):
+        try:
+            if not self._ser or not getattr(self._ser, "is_open", False):
+                raise RuntimeError("串口未打开")
+            fn = call.fn
+            res = self._transact(fn) if type(fn) is IOReq else fn(self._ser)
+            call.reply_q.put((call, True, res))
+        except Exception as e:
+            # Nothing listening: skip building the message entirely
+            if self.receivers(self.io_error) > 0:
+                now = time.monotonic()
+                if now - self._last_err_ts > 1.0:
+                    self._last_err_ts = now
+                    self.io_error.emit("串口I/O错误: %s\n%s" % (e, traceback.format_exc(limit=2)))
+                else:
+                    self.io_error.emit("串口I/O错误: %s" % e)
+            call.reply_q.put((call, False, e))
+
     def stop(self):
         self._running = False
+        self._queue.put(_SENTINEL)
         self.wait(1500)
 
+    def _read_exact(self, n: int, total_timeout: float) -> bytes:
+        """Read n bytes; the driver blocks (ser.timeout = frame timeout), no Python polling."""
+        ser = self._ser
+        deadline = time.monotonic() + total_timeout
+        if ser.timeout != total_timeout:
+            ser.timeout = total_timeout
+        mv = memoryview(self._rx_scratch)
+        got = ser.readinto(mv[:n]) or 0
+        if got < n:
+            # Some drivers return a partial frame early: top up once within the remaining time
+            remaining = deadline - time.monotonic()
+            if remaining > 0:
+                ser.timeout = remaining
+                got += ser.readinto(mv[got:n]) or 0
+            if got < n:
+                # Late bytes of this reply must not be taken as the next reply
+                self._needs_resync = True
+        return bytes(mv[:got])
+
+    def _transact(self, req: IOReq) -> bytes:
+        ser = self._ser
+        # 帧间隔从上一帧结束算起，只补足剩余部分（9600bps 时约 4ms）
+        gap = self._frame_gap_s - (time.monotonic() - self._last_frame_end)
+        if gap > 0:
+            time.sleep(gap)
+        # Steady state: no per-frame purge; only resync after a failed exchange
+        if self._needs_resync:
+            self._needs_resync = False
+            try:
+                ser.reset_input_buffer()
+            except Exception:
+                pass
+
+        try:
+            ser.write(req.cmd)
+            ser.flush()
+        except Exception:
+            self._needs_resync = True
+            raise
+
+        if req.write_only:
+            self._last_frame_end = time.monotonic()
+            return b""
+        try:
+            return self._read_exact(req.resp_len, req.timeout_s)
+        finally:
+            self._last_frame_end = time.monotonic()
+
+    def request_resync(self):
+        """Flush stale input before the next IOReq (e.g. after a CRC error)."""
+        self._needs_resync = True
+
     def call(self, fn: Callable[[Any], Any], timeout_s: float = 2.0):
-        reply_q: Queue = Queue(maxsize=1)
-        self._queue.put(_Call(fn=fn, reply_q=reply_q, timeout_s=float(timeout_s)))
+        call = _Call(fn=fn, reply_q=_reply_q(), timeout_s=float(timeout_s))
+        self._queue.put(call)
         try:
-            ok, payload = reply_q.get(timeout=timeout_s)
+            ok, payload = _await_reply(call, timeout_s)
         except Empty:
+            self._needs_resync = True
             raise TimeoutError("串口I/O超时")
         if ok:
             return payload
         raise payload
 
+    def submit(self, req: IOReq, timeout_s: float = 2.0) -> bytes:
+        """Run a fixed-shape transaction on the worker thread (no callback)."""
+        return self.call(req, timeout_s=timeout_s)
+
 
 class VisaIOWorker(QThread):
     """Exclusive VISA (pyvisa) I/O worker."""
@@ -124,9 +262,10 @@ class VisaIOWorker(QThread):
         super().__init__(parent)
         self.resource_name = resource_name
         self.timeout_ms = int(timeout_ms)
-        self._queue: Queue[_Call] = Queue()
+        self._queue: SimpleQueue[_Call] = SimpleQueue()
         self._running = True
         self._inst = None
+        self._last_err_ts = 0.0
 
     def run(self):
         try:
@@ -140,20 +279,24 @@ class VisaIOWorker(QThread):
             self.io_error.emit(f"VISA打开失败({self.resource_name}): {e}")
             self._running = False
 
+        pending: list[_Call] = []
         while self._running:
-            try:
-                call = self._queue.get(timeout=0.1)
-            except Empty:
-                continue
-            try:
-                if self._inst is None:
-                    raise RuntimeError("VISA资源未打开")
-                res = call.fn(self._inst)
-                call.reply_q.put((True, res))
-            except Exception as e:
-                tb = traceback.format_exc(limit=2)
-                self.io_error.emit(f"VISA I/O错误: {e}\n{tb}")
-                call.reply_q.put((False, e))
+            call = self._queue.get()
+            if call is _SENTINEL:
+                break
+            pending.append(call)
+            while True:
+                try:
+                    call = self._queue.get_nowait()
+                except Empty:
+                    break
+                if call is _SENTINEL:
+                    self._running = False
+                    break
+                pending.append(call)
+            for call in pending:
+                self._execute(call)
+            pending.clear()
 
         try:
             if self._inst is not None:
@@ -163,15 +306,32 @@ class VisaIOWorker(QThread):
         self._inst = None
         self.disconnected.emit()
 
+    def _execute(self, call: _Call):
+        try:
+            if self._inst is None:
+                raise RuntimeError("VISA资源未打开")
+            res = call.fn(self._inst)
+            call.reply_q.put((call, True, res))
+        except Exception as e:
+            if self.receivers(self.io_error) > 0:
+                now = time.monotonic()
+                if now - self._last_err_ts > 1.0:
+                    self._last_err_ts = now
+                    self.io_error.emit("VISA I/O错误: %s\n%s" % (e, traceback.format_exc(limit=2)))
+                else:
+                    self.io_error.emit("VISA I/O错误: %s" % e)
+            call.reply_q.put((call, False, e))
+
     def stop(self):
         self._running = False
+        self._queue.put(_SENTINEL)
         self.wait(1500)
 
     def call(self, fn: Callable[[Any], Any], timeout_s: float = 2.5):
-        reply_q: Queue = Queue(maxsize=1)
-        self._queue.put(_Call(fn=fn, reply_q=reply_q, timeout_s=float(timeout_s)))
+        call = _Call(fn=fn, reply_q=_reply_q(), timeout_s=float(timeout_s))
+        self._queue.put(call)
         try:
-            ok, payload = reply_q.get(timeout=timeout_s)
+            ok, payload = _await_reply(call, timeout_s)
         except Empty:
             raise TimeoutError("VISA I/O超时")
         if ok:
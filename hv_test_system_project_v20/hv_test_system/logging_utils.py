@@ -1,27 +1,42 @@
 from __future__ import annotations
 
+import atexit
 import logging
-from logging.handlers import RotatingFileHandler
+import queue
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
 from typing import Optional
 
+# 可选：跨进程安全的滚动文件 handler（文件锁），未安装时回退到标准 RotatingFileHandler
+try:
+    from concurrent_log_handler import ConcurrentRotatingFileHandler as _FileHandler  # type: ignore
+except Exception:  # pragma: no cover
+    _FileHandler = RotatingFileHandler
+
 _FMT = "%(asctime)s | %(levelname)s | %(name)s | %(message)s"
 
 def setup_logger(name: str = "hv_test_system", log_dir: Optional[str] = None, level: int = logging.INFO) -> logging.Logger:
     logger = logging.getLogger(name)
+    # 已配置则直接返回（不做任何系统调用）
     if getattr(logger, "_hv_configured", False):
         return logger
     logger.setLevel(level)
     logger.propagate = False
+    fmt = logging.Formatter(_FMT)
     ch = logging.StreamHandler()
     ch.setLevel(level)
-    ch.setFormatter(logging.Formatter(_FMT))
-    logger.addHandler(ch)
+    ch.setFormatter(fmt)
     base = Path(log_dir) if log_dir else Path("logs")
     base.mkdir(parents=True, exist_ok=True)
-    fh = RotatingFileHandler(base / "app.log", maxBytes=5*1024*1024, backupCount=3, encoding="utf-8")
+    fh = _FileHandler(str(base / "app.log"), maxBytes=5*1024*1024, backupCount=3, encoding="utf-8")
     fh.setLevel(level)
-    fh.setFormatter(logging.Formatter(_FMT))
-    logger.addHandler(fh)
+    fh.setFormatter(fmt)
+    # 调用线程只入队；格式化与磁盘/控制台写入在后台监听线程中完成
+    q: queue.SimpleQueue = queue.SimpleQueue()
+    logger.addHandler(QueueHandler(q))
+    listener = QueueListener(q, ch, fh, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)  # 退出时写完队列中剩余的记录
+    logger._hv_listener = listener
     logger._hv_configured = True
     return logger
@@ -1,11 +1,14 @@
 from __future__ import annotations
 
+from collections import namedtuple
+
 from .common import *
 
 from .utils import ScientificAxisItem
 from .config_manager import ConfigManager
+from .constants import METER_TYPES, METER_NAMES, CURRENT_SOURCES
 from .controllers import Keithley248Controller, HAPS06Controller
-from .threads import HVVoltagePoller, HVConnectThread, PIDController, CurrentStabilizationThread, SerialThread, CM52Thread, CountdownManager, DataSaver
+from .threads import HVVoltagePoller, HVConnectThread, GpibScanThread, PIDController, CurrentStabilizationThread, SerialThread, CM52Thread, CountdownManager, DataSaver
 from .ui_dialogs import TestSettingsDialog, CurrentStabilizationDialog, PlotColorDialog
 from .ui_panels import ControlPanel, ChartPanel
 from .data_buffer import DataBuffer
@@ -14,6 +17,187 @@ from .monitoring.influx_writer import InfluxWriter
 from .sqlite_recorder import SQLiteRecorder
 from .sqlite_maintenance import load_retention_from_config, db_stats, cleanup_db
 
+# 样式表在模块加载时构建一次，setup_ui 直接引用常量（不再每次实例化时拼接）
+_MAIN_QSS = """
+    QMainWindow {
+        background-color: #F5F7FA;
+    }
+    QWidget {
+        font-family: 'Microsoft YaHei', sans-serif;
+        font-size: 9pt;
+    }
+    QGroupBox {
+        font-weight: bold;
+        border: 1px solid #D1D9E6;
+        border-radius: 5px;
+        margin-top: 0.5ex;
+        padding-top: 8px;
+        background-color: #FFFFFF;
+    }
+    QGroupBox::title {
+        subcontrol-origin: margin;
+        subcontrol-position: top center;
+        padding: 2px 8px;
+        background-color: #4A6572;
+        color: #FFFFFF;
+        border-radius: 3px;
+        font-size: 9pt;
+    }
+    QPushButton {
+        background-color: #5D7B9D;
+        color: white;
+        border: none;
+        border-radius: 3px;
+        padding: 4px 8px;
+        min-height: 22px;
+        min-width: 60px;
+        font-weight: bold;
+        font-size: 9pt;
+    }
+    QPushButton:hover {
+        background-color: #4A6572;
+    }
+    QPushButton:pressed {
+        background-color: #344955;
+    }
+    QPushButton:disabled {
+        background-color: #B0BEC5;
+        color: #757575;
+    }
+    QLineEdit, QComboBox {
+        padding: 2px 6px;
+        border: 1px solid #D1D9E6;
+        border-radius: 3px;
+        background-color: white;
+        font-size: 9pt;
+        min-height: 22px;
+    }
+    QTextEdit {
+        border: 1px solid #D1D9E6;
+        border-radius: 3px;
+        background-color: white;
+        font-family: Consolas, monospace;
+        font-size: 8pt;
+    }
+    QLabel#titleLabel {
+        font-size: 12pt;
+        font-weight: bold;
+        padding: 6px;
+        background-color: #4A6572;
+        color: white;
+        border-radius: 3px;
+        text-align: center;
+    }
+    QLabel#chartTitle {
+        font-size: 11pt;
+        font-weight: bold;
+        padding: 5px;
+        background-color: #4A6572;
+        color: white;
+        border-radius: 3px;
+        text-align: center;
+    }
+    QLabel#voltageLabel {
+        font-size: 11pt;
+        font-weight: bold;
+        color: #D32F2F;
+        padding: 3px;
+        background-color: #FFEBEE;
+        border: 1px solid #EF5350;
+        border-radius: 3px;
+    }
+    QLabel#meterValue {
+        font-size: 8pt;
+        padding: 2px 4px;
+        background-color: #E8F5E8;
+        border: 1px solid #81C784;
+        border-radius: 3px;
+        min-width: 70px;
+        font-weight: bold;
+        color: #2E7D32;
+    }
+    QLabel#pathLabel {
+        background-color: #FFF3E0;
+        padding: 3px;
+        font-size: 8pt;
+        border: 1px solid #FFB74D;
+        border-radius: 3px;
+    }
+    QLabel#countdown {
+        font-size: 10pt;
+        font-weight: bold;
+        color: #D32F2F;
+        padding: 3px 5px;
+        background-color: #FFEBEE;
+        border: 1px solid #EF5350;
+        border-radius: 3px;
+    }
+    QLabel#settingsLabel {
+        background-color: #E3F2FD;
+        padding: 3px;
+        font-size: 8pt;
+        border: 1px solid #64B5F6;
+        border-radius: 3px;
+    }
+    QStatusBar {
+        background-color: #E1E8ED;
+        color: #2C3E50;
+        font-size: 9pt;
+    }
+    QScrollArea {
+        border: none;
+        background-color: transparent;
+    }
+"""
+
+_SPLITTER_QSS = """
+    QSplitter::handle {
+        background-color: #D1D9E6;
+        width: 2px;
+    }
+    QSplitter::handle:hover {
+        background-color: #5D7B9D;
+    }
+"""
+
+# 万用表单次读数（不可变）；meter_data[meter_type] 整条替换为新的 MeterSample
+MeterSample = namedtuple('MeterSample', 'value unit coefficient timestamp valid')
+# 万用表类型 -> _meter_snapshot 中的序号
+_METER_INDEX = {mt: i for i, mt in enumerate(METER_TYPES)}
+# 各万用表读数显示格式（真空用科学计数法），format(value, unit)
+_METER_FMT = {mt: ('{:.3e} {}' if mt == 'vacuum' else '{:.4f} {}').format for mt in METER_TYPES}
+# 稳流算法（元组序号即下拉框序号，反查用 .index）
+_ALGOS = ('pid', 'approach')
+# 配置文件中表示"接近算法"的写法（其余均按 PID 处理）
+_APPROACH_TOKENS = frozenset(('approach', '接近', '接近算法'))
+# 数值型配置项：(section, key, 参数字典属性名, 参数键)，load_config_to_ui / save_config_from_ui 共用
+_NUMERIC_CFG_SCHEMA = (
+    ('Keithley248', 'target_current', 'stabilization_params', 'target_current'),
+    ('Keithley248', 'stability_range', 'stabilization_params', 'stability_range'),
+    ('Keithley248', 'start_voltage', 'stabilization_params', 'start_voltage'),
+    ('Keithley248', 'adjust_frequency', 'stabilization_params', 'adjust_frequency'),
+    ('Keithley248', 'max_adjust_voltage', 'stabilization_params', 'max_adjust_voltage'),
+    ('TestParameters', 'start_voltage', 'test_params', 'start_voltage'),
+    ('TestParameters', 'target_voltage', 'test_params', 'target_voltage'),
+    ('TestParameters', 'voltage_step', 'test_params', 'voltage_step'),
+    ('TestParameters', 'step_delay', 'test_params', 'step_delay'),
+    ('TestParameters', 'cycle_time', 'test_params', 'cycle_time'),
+)
+# Influx 行协议字段顺序（与 _push_influx_point 的数值顺序一致，末尾三个为状态位）
+_INFLUX_FIELDS = (
+    'cathode', 'gate', 'anode', 'backup', 'vacuum', 'keithley_voltage', 'hv_vout',
+    'gate_plus_anode', 'anode_cathode_ratio', 'is_testing', 'is_stabilizing', 'is_recording',
+)
+# 真空规单位 -> Pa 换算系数（未知单位按 Pa 处理，系数 1.0）
+_VACUUM_PA_FACTORS = {
+    'mbar': 100.0, 'mb': 100.0, 'millibar': 100.0,
+    'bar': 1.0e5,
+    'torr': 133.32236842105263,
+    'mtorr': 0.13332236842105263,
+    'pa': 1.0,
+}
+
+
 class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
@@ -21,11 +205,26 @@ class MainWindow(QMainWindow):
         # Use request_quit() to perform a full shutdown.
         self._allow_quit = False
         self.tray_icon = None  # populated by launcher if tray is enabled
+        # 日志消息队列（deque.append 线程安全），由 log_flush_timer 每 100ms 批量写入日志框
+        self._log_queue = deque(maxlen=5000)
+        # 日志时间前缀缓存 (秒, "HH:MM:SS")；整体替换元组，多线程调用无需加锁
+        self._log_time_cache = (None, "")
         self.config_manager = ConfigManager()
         self.config = self.config_manager.load_config()
+        # 配置数值解析缓存：(section, key, 原始字符串) -> float，原始字符串不变时不再重复解析
+        self._parsed_cfg_cache = {}
+        self._reload_plot_colors_cache()
 
         # Optional: write time-series data to InfluxDB for dashboards/diagnostics
         self.influx_writer = InfluxWriter.from_config(self.config)
+        # Influx 点先在本地累积，按条数/时间整批交给写入线程（未启用时不构造数据点）
+        self._influx_on = bool(self.influx_writer.cfg.enabled)
+        self._influx_batch = []
+        self._influx_batch_capacity = 1000
+        self._influx_flush_interval = 1.0
+        self._influx_last_flush = time.monotonic()
+        self._influx_tpl_key = None
+        self._influx_tpl = ""
 
         # Crash-safe local persistence (SQLite) + retention
         self.sqlite_recorder = SQLiteRecorder.from_config(self.config)
@@ -142,30 +341,18 @@ class MainWindow(QMainWindow):
         testing = bool(state.get("testing", False))
 
         # Track transitions (lightweight monitoring)
-        try:
-            if testing != getattr(self, "_prev_testing", False):
-                self._prev_testing = testing
-        except Exception:
-            pass
-        try:
-            if bool(getattr(self, "is_stabilizing", False)) != getattr(self, "_prev_stabilizing", False):
-                self._prev_stabilizing = bool(getattr(self, "is_stabilizing", False))
-        except Exception:
-            pass
-        try:
-            if bool(getattr(self, "is_recording", False)) != getattr(self, "_prev_recording", False):
-                self._prev_recording = bool(getattr(self, "is_recording", False))
-        except Exception:
-            pass
+        self._prev_testing = testing
+        self._prev_stabilizing = self.is_stabilizing
+        self._prev_recording = self.is_recording
 
-        # Button enable/disable
+        # Button enable/disable：一次性更新，只重绘一次
+        self.setUpdatesEnabled(False)
         try:
-            self.start_test_btn.setEnabled(not testing)
-            self.cycle_test_btn.setEnabled(not testing)
+            for btn in self._btns_disabled_while_testing:
+                btn.setEnabled(not testing)
             self.stop_test_btn.setEnabled(testing)
-            self.manual_set_btn.setEnabled(not testing)
-        except Exception:
-            pass
+        finally:
+            self.setUpdatesEnabled(True)
 
     def _on_test_finished(self):
         """Test finished: stop auto-recording and compute single-test minima."""
@@ -188,13 +375,10 @@ class MainWindow(QMainWindow):
             # Single test: log min (I, V, time) for convenience
             if not was_cycle:
                 try:
-                    min_a = None
-                    min_v = None
-                    min_t = None
-                    if getattr(self, "anode_min_value", None) is not None:
-                        min_a = self.anode_min_value
-                        min_item = next(item for item in self.all_anode_data if item[0] == min_a)
-                        min_v, min_t = min_item[1], min_item[2]
+                    # 运行最小值在 save_data 中随采样更新，此处直接取用（O(1)）
+                    min_a = getattr(self, "anode_min_value", None)
+                    min_v = self.anode_min_voltage
+                    min_t = self.anode_min_time
                     if min_a is not None:
                         self.log_message(
                             f"单次测试最小阳极电流: {min_a:.6g}  对应电压: {float(min_v):.1f}V  时间: {min_t}"
@@ -209,137 +393,7 @@ class MainWindow(QMainWindow):
         self.setWindowTitle("高压电源与万用表测试系统")
         self.setGeometry(20, 20, 1260, 760)
 
-        self.setStyleSheet("""
-            QMainWindow {
-                background-color: #F5F7FA;
-            }
-            QWidget {
-                font-family: 'Microsoft YaHei', sans-serif;
-                font-size: 9pt;
-            }
-            QGroupBox {
-                font-weight: bold;
-                border: 1px solid #D1D9E6;
-                border-radius: 5px;
-                margin-top: 0.5ex;
-                padding-top: 8px;
-                background-color: #FFFFFF;
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                subcontrol-position: top center;
-                padding: 2px 8px;
-                background-color: #4A6572;
-                color: #FFFFFF;
-                border-radius: 3px;
-                font-size: 9pt;
-            }
-            QPushButton {
-                background-color: #5D7B9D;
-                color: white;
-                border: none;
-                border-radius: 3px;
-                padding: 4px 8px;
-                min-height: 22px;
-                min-width: 60px;
-                font-weight: bold;
-                font-size: 9pt;
-            }
-            QPushButton:hover {
-                background-color: #4A6572;
-            }
-            QPushButton:pressed {
-                background-color: #344955;
-            }
-            QPushButton:disabled {
-                background-color: #B0BEC5;
-                color: #757575;
-            }
-            QLineEdit, QComboBox {
-                padding: 2px 6px;
-                border: 1px solid #D1D9E6;
-                border-radius: 3px;
-                background-color: white;
-                font-size: 9pt;
-                min-height: 22px;
-            }
-            QTextEdit {
-                border: 1px solid #D1D9E6;
-                border-radius: 3px;
-                background-color: white;
-                font-family: Consolas, monospace;
-                font-size: 8pt;
-            }
-            QLabel#titleLabel {
-                font-size: 12pt;
-                font-weight: bold;
-                padding: 6px;
-                background-color: #4A6572;
-                color: white;
-                border-radius: 3px;
-                text-align: center;
-            }
-            QLabel#chartTitle {
-                font-size: 11pt;
-                font-weight: bold;
-                padding: 5px;
-                background-color: #4A6572;
-                color: white;
-                border-radius: 3px;
-                text-align: center;
-            }
-            QLabel#voltageLabel {
-                font-size: 11pt;
-                font-weight: bold;
-                color: #D32F2F;
-                padding: 3px;
-                background-color: #FFEBEE;
-                border: 1px solid #EF5350;
-                border-radius: 3px;
-            }
-            QLabel#meterValue {
-                font-size: 8pt;
-                padding: 2px 4px;
-                background-color: #E8F5E8;
-                border: 1px solid #81C784;
-                border-radius: 3px;
-                min-width: 70px;
-                font-weight: bold;
-                color: #2E7D32;
-            }
-            QLabel#pathLabel {
-                background-color: #FFF3E0;
-                padding: 3px;
-                font-size: 8pt;
-                border: 1px solid #FFB74D;
-                border-radius: 3px;
-            }
-            QLabel#countdown {
-                font-size: 10pt;
-                font-weight: bold;
-                color: #D32F2F;
-                padding: 3px 5px;
-                background-color: #FFEBEE;
-                border: 1px solid #EF5350;
-                border-radius: 3px;
-            }
-            QLabel#settingsLabel {
-                background-color: #E3F2FD;
-                padding: 3px;
-                font-size: 8pt;
-                border: 1px solid #64B5F6;
-                border-radius: 3px;
-            }
-            QStatusBar {
-                background-color: #E1E8ED;
-                color: #2C3E50;
-                font-size: 9pt;
-            }
-            QScrollArea {
-                border: none;
-                background-color: transparent;
-            }
-        """)
+        self.setStyleSheet(_MAIN_QSS)
 
         main_widget = QWidget()
         self.setCentralWidget(main_widget)
@@ -360,15 +414,7 @@ class MainWindow(QMainWindow):
 
         splitter.setMinimumSize(1380, 820)
 
-        splitter.setStyleSheet("""
-            QSplitter::handle {
-                background-color: #D1D9E6;
-                width: 2px;
-            }
-            QSplitter::handle:hover {
-                background-color: #5D7B9D;
-            }
-        """)
+        splitter.setStyleSheet(_SPLITTER_QSS)
 
         main_layout = QHBoxLayout(main_widget)
         main_layout.setContentsMargins(0, 0, 0, 0)
@@ -383,6 +429,35 @@ class MainWindow(QMainWindow):
 
         self.status_bar.showMessage("系统就绪 - 请连接设备开始测试")
 
+        # 连接/测试状态回调直接操作以下控件（不再逐个 try/except），在此确认面板已创建
+        for name in ("hv_connect_btn", "hv_port_combo", "hv_baudrate_combo", "hv_refresh_btn", "hv_voltage_label",
+                     "start_test_btn", "cycle_test_btn", "stop_test_btn", "reset_btn", "manual_set_btn",
+                     "keithley_voltage_label", "record_btn", "keithley_addr_combo"):
+            assert hasattr(self, name), name
+        # 测试进行中需禁用的按钮（_on_test_state_change 直接遍历）
+        self._btns_disabled_while_testing = (self.start_test_btn, self.cycle_test_btn, self.manual_set_btn)
+        # 高压源波特率在选择变化时解析一次，连接时直接使用
+        self._hv_baudrate_int = 9600
+        self.hv_baudrate_combo.currentTextChanged.connect(self._on_hv_baudrate_changed)
+        self._on_hv_baudrate_changed(self.hv_baudrate_combo.currentText())
+        # SQLite 保留策略控件是否齐全（加载/保存配置时只判断一次该标志）
+        self._has_retention_ui = all(hasattr(self, n) for n in (
+            "db_keep_days_edit", "db_keep_runs_edit", "db_archive_chk", "db_vacuum_mode_combo", "db_archive_dir_edit"))
+        # 各万用表控件句柄（面板以 f"{meter_type}_xxx" 属性创建），热路径直接按表取用
+        self._meter_widgets = {
+            mt: {
+                'coeff': getattr(self, f"{mt}_coeff"),
+                'value_label': getattr(self, f"{mt}_value_label"),
+                'port_combo': getattr(self, f"{mt}_port_combo"),
+                'connect_btn': getattr(self, f"{mt}_connect_btn"),
+            }
+            for mt in METER_TYPES
+        }
+        # 系数解析缓存：meter_type -> (原始文本, 系数)；编辑完成时失效
+        self._coeff_cache = {}
+        for mt, widgets in self._meter_widgets.items():
+            widgets['coeff'].editingFinished.connect(lambda mt=mt: self._coeff_cache.pop(mt, None))
+
     # -------- 曲线颜色（UI可配置）--------
     def _default_plot_colors(self):
         return {
@@ -396,15 +471,24 @@ class MainWindow(QMainWindow):
             'vacuum': '#7F8C8D'
         }
 
-    def get_plot_color(self, key, fallback='#000000'):
+    def _reload_plot_colors_cache(self):
+        """从 config 读取 PlotColors 到字典缓存（加载/保存配置后调用）
+
+        已知曲线先填入默认颜色，再以配置中的非空值覆盖，get_plot_color 只需一次 dict.get。
+        """
+        cache = self._default_plot_colors()
         try:
             if self.config and self.config.has_section('PlotColors'):
-                v = self.config.get('PlotColors', key, fallback=fallback)
-                if v:
-                    return str(v).strip()
+                for k, v in self.config.items('PlotColors'):
+                    v = str(v).strip()
+                    if v:
+                        cache[k] = v
         except Exception:
             pass
-        return fallback
+        self._plot_colors_cache = cache
+
+    def get_plot_color(self, key, fallback='#000000'):
+        return self._plot_colors_cache.get(key, fallback)
 
     def _save_plot_colors_to_config(self, colors_dict):
         try:
@@ -416,6 +500,7 @@ class MainWindow(QMainWindow):
             self.config_manager.save_config(cfg)
             # 重新加载到内存
             self.config = self.config_manager.load_config()
+            self._reload_plot_colors_cache()
             return True
         except Exception as e:
             self.log_message(f"保存曲线颜色失败: {e}")
@@ -479,14 +564,17 @@ class MainWindow(QMainWindow):
 
         self.meter_threads = {}
         self.meter_data = {
-            'cathode': {'value': 0, 'unit': '', 'coefficient': 1.0, 'timestamp': 0.0, 'valid': False},
-            'gate': {'value': 0, 'unit': '', 'coefficient': 1.0, 'timestamp': 0.0, 'valid': False},
-            'anode': {'value': 0, 'unit': '', 'coefficient': 1.0, 'timestamp': 0.0, 'valid': False},
-            'backup': {'value': 0, 'unit': '', 'coefficient': 1.0, 'timestamp': 0.0, 'valid': False}
-        ,
-            'vacuum': {'value': 0, 'unit': 'Pa', 'coefficient': 1.0, 'timestamp': 0.0, 'valid': False}
+            'cathode': MeterSample(0, '', 1.0, 0.0, False),
+            'gate': MeterSample(0, '', 1.0, 0.0, False),
+            'anode': MeterSample(0, '', 1.0, 0.0, False),
+            'backup': MeterSample(0, '', 1.0, 0.0, False),
+            'vacuum': MeterSample(0, 'Pa', 1.0, 0.0, False),
         }
-        self.data_mutex = QMutex()
+        # 各万用表最新数值快照（按 METER_TYPES 顺序的不可变元组）：写入方整体替换引用，
+        # 绘图/记录定时器取一次引用后解包，得到同一时刻的一组数值，无需加锁
+        self._meter_snapshot = (0.0,) * len(METER_TYPES)
+        # meter_data 不加锁：写入方（UI 线程）整条替换为新的不可变 MeterSample（字典项赋值在 GIL 下是原子的），
+        # 读取方取一次引用即得到一致的值、单位与时间戳
 
         # 使用优化的数据缓冲区
         self.data_buffer = DataBuffer(max_points=3000)
@@ -501,6 +589,8 @@ class MainWindow(QMainWindow):
         self.current_cycle_anode_data = []
 
         # 优化内存使用
+        # 仅保留最近的尾部（有上限）；完整记录由 SQLite 记录线程与 CSV 保存线程落盘，
+        # 阳极最小值统计使用运行最小值，不依赖这里的内容
         self.recorded_data = deque(maxlen=10000)  # 限制最大记录数
         self.all_anode_data = deque(maxlen=10000)
         # 长测优化：用运行最小值记录阳极最小值，避免 deque 截断导致统计不准，也避免停止时扫描大列表
@@ -508,9 +598,12 @@ class MainWindow(QMainWindow):
         self.anode_min_voltage = None
         self.anode_min_time = None
 
-        # 添加批量数据缓存
-        self.data_cache = []
-        self.cache_size = 50  # 增加缓存大小，减少写入频率
+        # CSV 行由 save_data 直接入队到 DataSaver（保存线程按 batch_size / 1 秒落盘）
+        self.cache_size = 1000  # 增加缓存大小，减少写入频率（另有 cache_send_interval 定时入队）
+        # SQLite 行批量缓存，flush 时整批交给记录线程（一次事务写入）
+        # 固定容量 deque（2×cache_size，正常在 cache_size 时即 flush）：稳态下追加不触发列表扩容
+        self._sqlite_cache = deque(maxlen=2 * self.cache_size)
+        self._time_text_cache = (None, "")
         # 小批量也要定期入队，避免 batch 未触发导致长时间不落盘
         self.cache_send_interval = 1.0  # seconds
         self._last_cache_send_ts = 0.0
@@ -539,78 +632,112 @@ class MainWindow(QMainWindow):
 
         # 优化：添加数据更新队列
         self.data_update_queue = []
-        self.last_meter_update_time = 0
-        self.meter_update_interval = 0.5  # 万用表标签更新间隔100ms
+        # 各标签上次显示的 (文本, 样式)，见 _set_label_text
+        self._last_label_text = {}
+        # 真空规读数换算到 Pa 的系数（连接时按真空规上报单位确定）
+        self._vac_factor = 1.0
+        # 各万用表上次显示的 (数值, 单位)，见 _show_meter_value
+        self._last_label_state = {}
+        # 万用表标签刷新周期（秒），仅由 meter_display_timer 驱动；可在 [Multimeter] display_interval_ms 调整
+        try:
+            interval_ms = int(self.config.get('Multimeter', 'display_interval_ms', fallback='150'))
+        except Exception:
+            interval_ms = 150
+        self.meter_update_interval = min(max(interval_ms, 50), 1000) / 1000.0
+        # 各万用表上次刷新显示时的记录时间戳；时间戳未前进的通道不再格式化
+        self._meter_painted_ts = {}
+        # 串口枚举结果缓存 (monotonic 时间, 端口列表)，见 refresh_ports
+        self._ports_cache = None
+        self._ports_cache_ttl = 1.5
 
     def setup_timers(self):
         """初始化定时器"""
-        self.hv_voltage_update_timer = QTimer()
-        self.hv_voltage_update_timer.timeout.connect(self.update_hv_voltage)
-        self.hv_voltage_update_timer.start(1000)  # 高压源电压更新500ms
-
-        # 新增：Keithley 248电压更新定时器
-        self.keithley_voltage_update_timer = QTimer()
-        self.keithley_voltage_update_timer.timeout.connect(self.update_keithley_voltage)
-        self.keithley_voltage_update_timer.start(1000)  # 每秒更新一次
+        # 1 Hz 合并定时器：高压源电压、Keithley 248电压、状态栏依次更新（一次唤醒）
+        self._tick_1hz = QTimer()
+        self._tick_1hz.timeout.connect(self._on_tick_1hz)
+        self._tick_1hz.start(1000)
 
         # 优化：降低图表更新频率，提高性能
         self.data_update_timer = QTimer()
         self.data_update_timer.timeout.connect(self.update_plots)
-        self.data_update_timer.start(1000)  # 图表更新200ms
+        self.data_update_timer.start(1000)  # 采样入缓冲区 1s
 
-        self.status_update_timer = QTimer()
-        self.status_update_timer.timeout.connect(self.update_status_display)
-        self.status_update_timer.start(1000)  # 状态更新1s
+        # 曲线重绘与采样解耦：按缓冲区的绘图间隔刷新，缓冲区数据未变化时不调用 setData
+        self._plot_drawn_data = None
+        self.plot_redraw_timer = QTimer()
+        self.plot_redraw_timer.timeout.connect(self._redraw_plots)
+        self.plot_redraw_timer.start(int(self.data_buffer.plot_update_interval * 1000))
 
         # 优化：添加万用表标签更新定时器
         self.meter_display_timer = QTimer()
         self.meter_display_timer.timeout.connect(self.update_meter_displays)
-        self.meter_display_timer.start(500)  # 万用表标签更新100ms
+        self.meter_display_timer.start(int(self.meter_update_interval * 1000))
+
+        # 日志框批量刷新（合并 100ms 内的消息为一次文档更新）
+        self.log_flush_timer = QTimer()
+        self.log_flush_timer.timeout.connect(self._flush_log_queue)
+        self.log_flush_timer.start(100)
 
-        # 添加数据缓存定时器
-        self.cache_flush_timer = QTimer()
-        self.cache_flush_timer.timeout.connect(self.flush_data_cache)
-        self.cache_flush_timer.start(5000)  # 每5秒强制刷新一次缓存
+        # 配置保存去抖：500ms 内的多次修改合并为一次写盘（退出时直接保存）
+        self._save_cfg_timer = QTimer(self)
+        self._save_cfg_timer.setSingleShot(True)
+        self._save_cfg_timer.setInterval(500)
+        self._save_cfg_timer.timeout.connect(self.save_config_from_ui)
+
+    def schedule_save_config(self):
+        """请求保存配置（去抖，500ms 后由 _save_cfg_timer 写盘）"""
+        self._save_cfg_timer.start()
+
+    def _on_tick_1hz(self):
+        """1 Hz 定时分发（原 hv_voltage / keithley_voltage / status 三个定时器）
+
+        三个更新方法各自捕获并记录异常，这里逐个调用即可。
+        """
+        self.update_hv_voltage()
+        self.update_keithley_voltage()
+        self.update_status_display()
 
     def refresh_gpib_ports(self):
-        """刷新GPIB端口（仅添加实际扫描到的GPIB资源，不再填充默认地址）"""
+        """刷新GPIB端口（仅添加实际扫描到的GPIB资源，不再填充默认地址）
+
+        VISA 枚举在 GpibScanThread 中进行，结果经排队信号回到UI线程填充下拉框。
+        """
         try:
             # Keithley已连接时，地址下拉框被锁定；此时不刷新列表，避免改变当前选择
             if not self.keithley_addr_combo.isEnabled():
                 self.log_message("Keithley已连接，跳过GPIB列表刷新")
                 return
-            try:
-                import pyvisa
-                rm = pyvisa.ResourceManager()
-                resources = rm.list_resources()
-
-                # 清空下拉框（只保留扫描结果）
-                self.keithley_addr_combo.clear()
-
-                gpib_devices = []
-                for resource in resources:
-                    if 'GPIB' in resource or 'gpib' in resource.lower():
-                        gpib_devices.append(resource)
-
-                # 只把扫描到的资源加入下拉框
-                if gpib_devices:
-                    for r in gpib_devices:
-                        self.keithley_addr_combo.addItem(r)
-                    self.log_message(f"找到 {len(gpib_devices)} 个GPIB资源")
-                else:
-                    # 不再填充默认地址；下拉框保持为空，但可手动输入
-                    self.log_message("未找到GPIB资源（下拉框保持空，可手动输入地址）")
-
-            except ImportError:
-                self.log_message("未安装pyvisa库，请使用 'pip install pyvisa' 安装（下拉框保持空，可手动输入地址）")
-                self.keithley_addr_combo.clear()
-
+            th = getattr(self, "_gpib_scan_thread", None)
+            if th is not None and th.isRunning():
+                return
+            self._gpib_scan_thread = GpibScanThread(self)
+            self._gpib_scan_thread.finished.connect(self._on_gpib_scan_finished)
+            self._gpib_scan_thread.start()
         except Exception as e:
             error_msg = f"刷新GPIB端口错误: {str(e)}"
             self.log_message(error_msg)
             # 出错时也不再填充默认地址；保持为空
             self.keithley_addr_combo.clear()
 
+    def _on_gpib_scan_finished(self, gpib_devices, error):
+        """GPIB 扫描结果（UI线程）"""
+        # 扫描期间可能已连接 Keithley（下拉框被锁定），此时不改变当前选择
+        if not self.keithley_addr_combo.isEnabled():
+            return
+        # 清空下拉框（只保留扫描结果）
+        self.keithley_addr_combo.clear()
+        if error == "import":
+            self.log_message("未安装pyvisa库，请使用 'pip install pyvisa' 安装（下拉框保持空，可手动输入地址）")
+        elif error:
+            self.log_message(f"刷新GPIB端口错误: {error}")
+        elif gpib_devices:
+            # 只把扫描到的资源加入下拉框
+            self.keithley_addr_combo.addItems(gpib_devices)
+            self.log_message(f"找到 {len(gpib_devices)} 个GPIB资源")
+        else:
+            # 不再填充默认地址；下拉框保持为空，但可手动输入
+            self.log_message("未找到GPIB资源（下拉框保持空，可手动输入地址）")
+
     def _start_hv_connection_async(self, port: str, baudrate: int):
         """异步连接HAPS06，避免UI线程被超时阻塞。"""
         try:
@@ -621,80 +748,61 @@ class MainWindow(QMainWindow):
         except Exception:
             pass
 
-        # UI lock during connect
+        # UI lock during connect（批量更新控件状态，只重绘一次）
+        self.setUpdatesEnabled(False)
         try:
             self.hv_connect_btn.setEnabled(False)
             self.hv_connect_btn.setText("连接中...")
-        except Exception:
-            pass
-        try:
             self.hv_port_combo.setEnabled(False)
             self.hv_baudrate_combo.setEnabled(False)
-        except Exception:
-            pass
-        try:
             self.hv_refresh_btn.setEnabled(False)
-        except Exception:
-            pass
 
-        # Prevent starting tests while connecting
-        try:
+            # Prevent starting tests while connecting
             self.start_test_btn.setEnabled(False)
             self.cycle_test_btn.setEnabled(False)
             self.reset_btn.setEnabled(False)
             self.manual_set_btn.setEnabled(False)
-        except Exception:
-            pass
 
-        try:
             self.status_bar.showMessage("高压源连接中...")
-        except Exception:
-            pass
+        finally:
+            self.setUpdatesEnabled(True)
 
         self._hv_connect_thread = HVConnectThread(self.hv_controller, port, baudrate, remote_timeout_s=1.5)
         try:
-            self._hv_connect_thread.progress.connect(lambda m: self.log_message(f"[HAPS06] {m}"))
+            self._hv_connect_thread.progress.connect(self._hv_log)
         except Exception:
-            try:
-                self._hv_connect_thread.progress.connect(self.log_message)
-            except Exception:
-                pass
+            pass
         try:
             self._hv_connect_thread.finished.connect(self._on_hv_connect_finished)
         except Exception:
             pass
         self._hv_connect_thread.start()
 
+    def _hv_log(self, msg):
+        """HVConnectThread.progress 槽（绑定方法，避免每次连接创建闭包）"""
+        self.log_message("[HAPS06] " + str(msg))
+
     def _on_hv_connect_finished(self, success: bool, message: str, port: str):
         """HAPS06异步连接结果处理"""
-        try:
-            self.hv_connect_btn.setEnabled(True)
-        except Exception:
-            pass
-
         if success:
+            # 控件状态批量更新，只重绘一次
+            self.setUpdatesEnabled(False)
             try:
+                self.hv_connect_btn.setEnabled(True)
                 self.hv_connect_btn.setText("断开高压源")
-            except Exception:
-                pass
-            # Lock port/baud combos, but keep refresh disabled
-            try:
+                # Lock port/baud combos, but keep refresh disabled
                 self.hv_port_combo.setEnabled(False)
                 self.hv_baudrate_combo.setEnabled(False)
-            except Exception:
-                pass
-            try:
                 self.hv_refresh_btn.setEnabled(False)
-            except Exception:
-                pass
 
-            try:
                 self.start_test_btn.setEnabled(True)
                 self.cycle_test_btn.setEnabled(True)
                 self.reset_btn.setEnabled(True)
                 self.manual_set_btn.setEnabled(True)
-            except Exception:
-                pass
+
+                self.status_bar.showMessage(f"高压源已连接 - {port}")
+            finally:
+                self.setUpdatesEnabled(True)
 
             self.log_message(f"高压源已连接到: {port}")
             self.log_message(f"{message}")
@@ -702,10 +810,6 @@ class MainWindow(QMainWindow):
                 self._attach_hv_worker_signals()
             except Exception:
                 pass
-            try:
-                self.status_bar.showMessage(f"高压源已连接 - {port}")
-            except Exception:
-                pass
             # Start poller for actual voltage
             try:
                 self.start_hv_voltage_poller(interval_ms=800)
@@ -722,32 +826,20 @@ class MainWindow(QMainWindow):
             except Exception:
                 pass
 
+            self.setUpdatesEnabled(False)
             try:
+                self.hv_connect_btn.setEnabled(True)
                 self.hv_port_combo.setEnabled(True)
                 self.hv_baudrate_combo.setEnabled(True)
-            except Exception:
-                pass
-            try:
                 self.hv_refresh_btn.setEnabled(True)
-            except Exception:
-                pass
-            try:
                 self.hv_connect_btn.setText("连接高压源")
-            except Exception:
-                pass
-            try:
                 self.hv_voltage_label.setText("未连接")
                 self.hv_voltage_label.setStyleSheet("font-size: 11pt; font-weight: bold; color: #D32F2F; padding: 3px;")
-            except Exception:
-                pass
-
-            self.log_message(f"高压源连接失败: {message}")
-            try:
                 self.status_bar.showMessage("高压源连接失败")
-            except Exception:
-                pass
-
+            finally:
+                self.setUpdatesEnabled(True)
 
+            self.log_message(f"高压源连接失败: {message}")
 
     def toggle_keithley_connection(self):
         """连接/断开Keithley 248高压源"""
@@ -802,7 +894,7 @@ class MainWindow(QMainWindow):
                 self.current_stabilization_btn.setEnabled(False)
                 self.start_stabilization_btn.setEnabled(False)
                 self.stop_stabilization_btn.setEnabled(False)
-                self.keithley_voltage_label.setText("未连接")
+                self._set_label_text(self.keithley_voltage_label, "未连接")
                 self.log_message("Keithley 248已断开")
                 self.status_bar.showMessage("Keithley 248已断开")
 
@@ -817,13 +909,11 @@ class MainWindow(QMainWindow):
                 voltage = self.keithley_controller.read_voltage()
 
                 if voltage is not None:
-                    self.keithley_voltage_label.setText(f"{voltage:.1f} V")
-                    self.keithley_voltage_label.setStyleSheet(
-                        "font-size: 11pt; font-weight: bold; color: #2E7D32; padding: 3px;")
+                    self._set_label_text(self.keithley_voltage_label, f"{voltage:.1f} V",
+                                         "font-size: 11pt; font-weight: bold; color: #2E7D32; padding: 3px;")
                 else:
-                    self.keithley_voltage_label.setText("读取失败")
-                    self.keithley_voltage_label.setStyleSheet(
-                        "font-size: 11pt; font-weight: bold; color: #D32F2F; padding: 3px;")
+                    self._set_label_text(self.keithley_voltage_label, "读取失败",
+                                         "font-size: 11pt; font-weight: bold; color: #D32F2F; padding: 3px;")
 
         except Exception as e:
             error_msg = f"更新Keithley电压错误: {str(e)}"
@@ -839,15 +929,8 @@ class MainWindow(QMainWindow):
         dialog.start_voltage_edit.setText(str(self.stabilization_params['start_voltage']))
 
         # 设置电流数据来源
-        source_index = 0
-        if self.stabilization_params['current_source'] == 'cathode':
-            source_index = 1
-        elif self.stabilization_params['current_source'] == 'gate':
-            source_index = 2
-        elif self.stabilization_params['current_source'] == 'anode':
-            source_index = 3
-        elif self.stabilization_params['current_source'] == 'backup':
-            source_index = 4
+        src = self.stabilization_params['current_source']
+        source_index = CURRENT_SOURCES.index(src) if src in CURRENT_SOURCES else 0
         dialog.current_source_combo.setCurrentIndex(source_index)
 
         dialog.adjust_frequency_edit.setText(str(self.stabilization_params['adjust_frequency']))
@@ -856,7 +939,7 @@ class MainWindow(QMainWindow):
         # 稳流算法
         algo = str(self.stabilization_params.get('algorithm', 'pid')).lower()
         if hasattr(dialog, 'algorithm_combo'):
-            dialog.algorithm_combo.setCurrentIndex(0 if algo != 'approach' else 1)
+            dialog.algorithm_combo.setCurrentIndex(_ALGOS.index(algo) if algo in _ALGOS else 0)
 
         if dialog.exec_() == QDialog.Accepted:
             # 保存设置
@@ -867,26 +950,20 @@ class MainWindow(QMainWindow):
 
                 # 获取电流数据来源
                 source_index = dialog.current_source_combo.currentIndex()
-                if source_index == 0:
-                    self.stabilization_params['current_source'] = 'keithley'
-                elif source_index == 1:
-                    self.stabilization_params['current_source'] = 'cathode'
-                elif source_index == 2:
-                    self.stabilization_params['current_source'] = 'gate'
-                elif source_index == 3:
-                    self.stabilization_params['current_source'] = 'anode'
-                elif source_index == 4:
-                    self.stabilization_params['current_source'] = 'backup'
+                if 0 <= source_index < len(CURRENT_SOURCES):
+                    self.stabilization_params['current_source'] = CURRENT_SOURCES[source_index]
 
                 self.stabilization_params['adjust_frequency'] = float(dialog.adjust_frequency_edit.text())
                 self.stabilization_params['max_adjust_voltage'] = float(dialog.max_adjust_voltage_edit.text())
 
                 # 保存稳流算法
                 if hasattr(dialog, 'algorithm_combo'):
-                    self.stabilization_params['algorithm'] = 'pid' if dialog.algorithm_combo.currentIndex() == 0 else 'approach'
+                    algo_index = dialog.algorithm_combo.currentIndex()
+                    if 0 <= algo_index < len(_ALGOS):
+                        self.stabilization_params['algorithm'] = _ALGOS[algo_index]
 
                 self.log_message("稳流参数已更新")
-                self.save_config_from_ui()
+                self.schedule_save_config()
 
             except ValueError as e:
                 self.log_message(f"稳流参数设置错误: {str(e)}")
@@ -914,7 +991,6 @@ class MainWindow(QMainWindow):
         self.stabilization_thread = CurrentStabilizationThread(
             self.keithley_controller,
             self.meter_data,
-            self.data_mutex,
             self.stabilization_params
         )
 
@@ -958,16 +1034,8 @@ class MainWindow(QMainWindow):
             except Exception as e:
                 self.log_message(f"关闭高压失败: {e}")
 
-        # UI归零
-        try:
-            self.keithley_voltage_label.setText("0.0 V")
-        except Exception:
-            pass
-        try:
-            # 确保稳流线程的电压显示也归零
-            self.on_keithley_voltage_updated(0.0)
-        except Exception:
-            pass
+        # UI归零（电压标签在 setup_ui 中必定创建）
+        self.on_keithley_voltage_updated(0.0)
 
         self.is_stabilizing = False
         self.start_stabilization_btn.setEnabled(True)
@@ -977,7 +1045,7 @@ class MainWindow(QMainWindow):
     def on_keithley_voltage_updated(self, voltage):
         """Keithley电压更新回调"""
         # 更新电压显示
-        self.keithley_voltage_label.setText(f"{voltage:.1f} V")
+        self._set_label_text(self.keithley_voltage_label, f"{voltage:.1f} V")
 
     def on_stabilization_complete(self):
         """进入稳定区间回调（不自动停止）"""
@@ -1000,10 +1068,7 @@ class MainWindow(QMainWindow):
                 self.log_message("临时数据转换完成")
         finally:
             self.is_converting = False
-            try:
-                self.record_btn.setEnabled(True)
-            except Exception:
-                pass
+            self.record_btn.setEnabled(True)
 
     def show_test_settings(self):
         """显示测试设置对话框"""
@@ -1040,6 +1105,17 @@ class MainWindow(QMainWindow):
 
         self.current_settings_label.setText(f"当前设置: {settings_text}")
 
+    def _cfg_float(self, section, key, default):
+        """读取配置数值（缺省时返回 default），按原始字符串缓存 float 解析结果"""
+        if not self.config.has_option(section, key):
+            return default
+        raw = self.config.get(section, key)
+        cache_key = (section, key, raw)
+        value = self._parsed_cfg_cache.get(cache_key)
+        if value is None:
+            value = self._parsed_cfg_cache[cache_key] = float(raw)
+        return value
+
     def load_config_to_ui(self):
         """将配置加载到界面"""
         try:
@@ -1055,19 +1131,19 @@ class MainWindow(QMainWindow):
                     self.hv_baudrate_combo.setCurrentText(baudrate)
 
             # 修改：增加备用万用表的配置加载
-            for meter_type in ['cathode', 'gate', 'anode', 'backup', 'vacuum']:
+            for meter_type in METER_TYPES:
                 port_key = f'{meter_type}_port'
                 coeff_key = f'{meter_type}_coeff'
 
                 if self.config.has_option('Multimeter', port_key):
                     port = self.config.get('Multimeter', port_key)
-                    port_combo = getattr(self, f"{meter_type}_port_combo")
+                    port_combo = self._meter_widgets[meter_type]['port_combo']
                     if port and port in [port_combo.itemText(i) for i in range(port_combo.count())]:
                         port_combo.setCurrentText(port)
 
                 if self.config.has_option('Multimeter', coeff_key):
                     coeff = self.config.get('Multimeter', coeff_key)
-                    coeff_edit = getattr(self, f"{meter_type}_coeff")
+                    coeff_edit = self._meter_widgets[meter_type]['coeff']
                     coeff_edit.setText(coeff)
 
             # 加载Keithley 248配置
@@ -1086,38 +1162,14 @@ class MainWindow(QMainWindow):
             if self.config.has_option('Keithley248', 'current_source'):
                 self.stabilization_params['current_source'] = self.config.get('Keithley248', 'current_source')
 
-            if self.config.has_option('Keithley248', 'target_current'):
-                self.stabilization_params['target_current'] = float(self.config.get('Keithley248', 'target_current'))
-
-            if self.config.has_option('Keithley248', 'stability_range'):
-                self.stabilization_params['stability_range'] = float(self.config.get('Keithley248', 'stability_range'))
-
-            if self.config.has_option('Keithley248', 'start_voltage'):
-                self.stabilization_params['start_voltage'] = float(self.config.get('Keithley248', 'start_voltage'))
-
-            if self.config.has_option('Keithley248', 'adjust_frequency'):
-                self.stabilization_params['adjust_frequency'] = float(
-                    self.config.get('Keithley248', 'adjust_frequency'))
-
-            if self.config.has_option('Keithley248', 'max_adjust_voltage'):
-                self.stabilization_params['max_adjust_voltage'] = float(
-                    self.config.get('Keithley248', 'max_adjust_voltage'))
+            # 稳流参数与测试参数中的数值项
+            for section, key, attr, pkey in _NUMERIC_CFG_SCHEMA:
+                params = getattr(self, attr)
+                params[pkey] = self._cfg_float(section, key, params[pkey])
 
             if self.config.has_option('Keithley248', 'algorithm'):
-                algo = str(self.config.get('Keithley248', 'algorithm')).strip().lower()
-                self.stabilization_params['algorithm'] = 'approach' if algo in ('approach','接近','接近算法') else 'pid'
-
-            # 加载测试参数到对话框
-            if self.config.has_option('TestParameters', 'start_voltage'):
-                self.test_params['start_voltage'] = float(self.config.get('TestParameters', 'start_voltage'))
-            if self.config.has_option('TestParameters', 'target_voltage'):
-                self.test_params['target_voltage'] = float(self.config.get('TestParameters', 'target_voltage'))
-            if self.config.has_option('TestParameters', 'voltage_step'):
-                self.test_params['voltage_step'] = float(self.config.get('TestParameters', 'voltage_step'))
-            if self.config.has_option('TestParameters', 'step_delay'):
-                self.test_params['step_delay'] = float(self.config.get('TestParameters', 'step_delay'))
-            if self.config.has_option('TestParameters', 'cycle_time'):
-                self.test_params['cycle_time'] = float(self.config.get('TestParameters', 'cycle_time'))
+                algo = str(self.config.get('Keithley248', 'algorithm')).strip().casefold()
+                self.stabilization_params['algorithm'] = 'approach' if algo in _APPROACH_TOKENS else 'pid'
 
             if self.config.has_option('TestParameters', 'save_interval'):
                 interval = self.config.get('TestParameters', 'save_interval')
@@ -1130,19 +1182,20 @@ class MainWindow(QMainWindow):
 
             # Retention (SQLite maintenance) -> UI
             try:
-                if hasattr(self, "db_keep_days_edit") and self.config.has_option("Retention", "keep_days"):
-                    self.db_keep_days_edit.setText(self.config.get("Retention", "keep_days"))
-                if hasattr(self, "db_keep_runs_edit") and self.config.has_option("Retention", "keep_runs"):
-                    self.db_keep_runs_edit.setText(self.config.get("Retention", "keep_runs"))
-                if hasattr(self, "db_archive_chk") and self.config.has_option("Retention", "archive_before_delete"):
-                    v = str(self.config.get("Retention", "archive_before_delete")).strip().lower()
-                    self.db_archive_chk.setChecked(v not in ("0", "false", "no"))
-                if hasattr(self, "db_archive_dir_edit") and self.config.has_option("Retention", "archive_dir"):
-                    self.db_archive_dir_edit.setText(self.config.get("Retention", "archive_dir"))
-                if hasattr(self, "db_vacuum_mode_combo") and self.config.has_option("Retention", "vacuum_mode"):
-                    vm = str(self.config.get("Retention", "vacuum_mode")).strip().lower()
-                    idx = 0 if vm != "vacuum" else 1
-                    self.db_vacuum_mode_combo.setCurrentIndex(idx)
+                if self._has_retention_ui:
+                    if self.config.has_option("Retention", "keep_days"):
+                        self.db_keep_days_edit.setText(self.config.get("Retention", "keep_days"))
+                    if self.config.has_option("Retention", "keep_runs"):
+                        self.db_keep_runs_edit.setText(self.config.get("Retention", "keep_runs"))
+                    if self.config.has_option("Retention", "archive_before_delete"):
+                        v = str(self.config.get("Retention", "archive_before_delete")).strip().lower()
+                        self.db_archive_chk.setChecked(v not in ("0", "false", "no"))
+                    if self.config.has_option("Retention", "archive_dir"):
+                        self.db_archive_dir_edit.setText(self.config.get("Retention", "archive_dir"))
+                    if self.config.has_option("Retention", "vacuum_mode"):
+                        vm = str(self.config.get("Retention", "vacuum_mode")).strip().lower()
+                        idx = 0 if vm != "vacuum" else 1
+                        self.db_vacuum_mode_combo.setCurrentIndex(idx)
                 # refresh label
                 try:
                     self.update_db_status_label()
@@ -1169,9 +1222,9 @@ class MainWindow(QMainWindow):
 
             config_data['Multimeter'] = {}
             # 修改：增加备用万用表的配置保存
-            for meter_type in ['cathode', 'gate', 'anode', 'backup', 'vacuum']:
-                port_combo = getattr(self, f"{meter_type}_port_combo")
-                coeff_edit = getattr(self, f"{meter_type}_coeff")
+            for meter_type in METER_TYPES:
+                port_combo = self._meter_widgets[meter_type]['port_combo']
+                coeff_edit = self._meter_widgets[meter_type]['coeff']
 
                 config_data['Multimeter'][f'{meter_type}_port'] = port_combo.currentText()
                 config_data['Multimeter'][f'{meter_type}_coeff'] = coeff_edit.text()
@@ -1180,22 +1233,12 @@ class MainWindow(QMainWindow):
             config_data['Keithley248'] = {
                 'gpib_address': self.keithley_addr_combo.currentText(),
                 'current_source': self.stabilization_params['current_source'],
-                'target_current': str(self.stabilization_params['target_current']),
-                'stability_range': str(self.stabilization_params['stability_range']),
-                'start_voltage': str(self.stabilization_params['start_voltage']),
-                'adjust_frequency': str(self.stabilization_params['adjust_frequency']),
-                'max_adjust_voltage': str(self.stabilization_params['max_adjust_voltage']),
-                'algorithm': str(self.stabilization_params.get('algorithm','pid'))
-            }
-
-            config_data['TestParameters'] = {
-                'start_voltage': str(self.test_params['start_voltage']),
-                'target_voltage': str(self.test_params['target_voltage']),
-                'voltage_step': str(self.test_params['voltage_step']),
-                'step_delay': str(self.test_params['step_delay']),
-                'cycle_time': str(self.test_params['cycle_time']),
-                'save_interval': self.interval_edit.text()
             }
+            config_data['TestParameters'] = {}
+            for section, key, attr, pkey in _NUMERIC_CFG_SCHEMA:
+                config_data[section][key] = str(getattr(self, attr)[pkey])
+            config_data['Keithley248']['algorithm'] = str(self.stabilization_params.get('algorithm','pid'))
+            config_data['TestParameters']['save_interval'] = self.interval_edit.text()
 
             config_data['DataRecord'] = {
                 'save_path': self.path_label.text()
@@ -1203,23 +1246,24 @@ class MainWindow(QMainWindow):
 
             # SQLite retention / maintenance settings (optional UI)
             try:
-                if hasattr(self, "db_keep_days_edit") and hasattr(self, "db_keep_runs_edit"):
+                if self._has_retention_ui:
                     keep_days = int(float(self.db_keep_days_edit.text() or self.retention_policy.keep_days))
                     keep_runs = int(float(self.db_keep_runs_edit.text() or self.retention_policy.keep_runs))
-                    archive_before_delete = bool(getattr(self, "db_archive_chk", None).isChecked()) if hasattr(self, "db_archive_chk") else bool(self.retention_policy.archive_before_delete)
-                    vacuum_mode = str(getattr(self, "db_vacuum_mode_combo", None).currentData() or "incremental") if hasattr(self, "db_vacuum_mode_combo") else str(self.retention_policy.vacuum_mode)
+                    archive_before_delete = self.db_archive_chk.isChecked()
+                    vacuum_mode = str(self.db_vacuum_mode_combo.currentData() or "incremental")
                     config_data['Retention'] = {
                         'enabled': 'true',
                         'keep_days': str(keep_days),
                         'keep_runs': str(keep_runs),
                         'archive_before_delete': 'true' if archive_before_delete else 'false',
-                        'archive_dir': str(getattr(self, "db_archive_dir_edit", None).text() if hasattr(self, "db_archive_dir_edit") else self.retention_policy.archive_dir),
+                        'archive_dir': str(self.db_archive_dir_edit.text()),
                         'vacuum_mode': str(vacuum_mode)
                     }
             except Exception:
                 pass
 
             self.config_manager.save_config(config_data)
+            self._parsed_cfg_cache.clear()
             self.log_message("配置已保存")
 
         except Exception as e:
@@ -1240,39 +1284,61 @@ class MainWindow(QMainWindow):
     def refresh_ports(self):
         """刷新所有串口列表"""
         try:
-            ports = serial.tools.list_ports.comports()
-            port_names = [port.device for port in ports]
+            # comports() 在 Windows 上需枚举设备（数十 ms），短时间内重复刷新复用上次结果
+            now = time.monotonic()
+            cached = self._ports_cache
+            if cached is not None and now - cached[0] < self._ports_cache_ttl:
+                port_names = cached[1]
+            else:
+                port_names = [port.device for port in serial.tools.list_ports.comports()]
+                self._ports_cache = (now, port_names)
 
             # 高压源：已连接时锁定下拉框，刷新时不改动其选项/当前值
             if self.hv_port_combo.isEnabled():
-                current_hv_port = self.hv_port_combo.currentText()
-                self.hv_port_combo.clear()
-                self.hv_port_combo.addItems(port_names)
-                if current_hv_port and current_hv_port in port_names:
-                    self.hv_port_combo.setCurrentText(current_hv_port)
+                self._set_port_items(self.hv_port_combo, port_names)
 
             # 万用表：已连接（下拉框禁用）时不刷新，避免程序性改动当前端口
-            for meter_type in ['cathode', 'gate', 'anode', 'backup', 'vacuum']:
-                combo = getattr(self, f"{meter_type}_port_combo")
-                if not combo.isEnabled():
-                    continue
-                current_port = combo.currentText()
-                combo.clear()
-                combo.addItems(port_names)
-                if current_port and current_port in port_names:
-                    combo.setCurrentText(current_port)
+            for meter_type in METER_TYPES:
+                combo = self._meter_widgets[meter_type]['port_combo']
+                if combo.isEnabled():
+                    self._set_port_items(combo, port_names)
 
             self.log_message(f"刷新串口列表，找到 {len(port_names)} 个可用串口")
         except Exception as e:
             self.log_message(f"刷新串口错误: {str(e)}")
 
 
+    def _set_port_items(self, combo, port_names):
+        """用 port_names 重建串口下拉框并保留当前选择；选项未变化时不做任何改动
+
+        重建期间屏蔽信号：clear/addItems 过程中的中间选择变化不会触发任何槽函数。
+        """
+        new = tuple(port_names)
+        if tuple(combo.itemText(i) for i in range(combo.count())) == new:
+            return
+        current_port = combo.currentText()
+        combo.blockSignals(True)
+        try:
+            combo.clear()
+            combo.addItems(port_names)
+            if current_port and current_port in new:
+                combo.setCurrentText(current_port)
+        finally:
+            combo.blockSignals(False)
+
+    def _on_hv_baudrate_changed(self, text):
+        """波特率下拉框变化：缓存解析后的整数（无效文本保留上次的值）"""
+        try:
+            self._hv_baudrate_int = int(text)
+        except (TypeError, ValueError):
+            pass
+
     def toggle_hv_connection(self):
         """连接/断开高压源"""
         try:
             if self.hv_connect_btn.text() == "连接高压源":
                 port = self.hv_port_combo.currentText()
-                baudrate = int(self.hv_baudrate_combo.currentText())
+                baudrate = self._hv_baudrate_int
 
                 if not port:
                     self.log_message("错误: 请选择高压源串口")
@@ -1354,19 +1420,18 @@ class MainWindow(QMainWindow):
     def toggle_meter_connection(self, meter_type):
         """连接/断开万用表"""
         try:
-            connect_btn = getattr(self, f"{meter_type}_connect_btn")
-            value_label = getattr(self, f"{meter_type}_value_label")
-            meter_names = {'cathode': '阴极', 'gate': '栅极', 'anode': '阳极', 'backup': '收集极', 'vacuum': '真空'}
+            connect_btn = self._meter_widgets[meter_type]['connect_btn']
+            value_label = self._meter_widgets[meter_type]['value_label']
 
             if connect_btn.text() == "连接":
-                port_combo = getattr(self, f"{meter_type}_port_combo")
+                port_combo = self._meter_widgets[meter_type]['port_combo']
                 port = port_combo.currentText()
 
                 if not port:
-                    self.log_message(f"错误: 请选择{meter_names[meter_type]}万用表串口")
+                    self.log_message(f"错误: 请选择{METER_NAMES[meter_type]}万用表串口")
                     return
 
-                self.log_message(f"正在连接{meter_names[meter_type]}万用表: {port}...")
+                self.log_message(f"正在连接{METER_NAMES[meter_type]}万用表: {port}...")
                 if meter_type == 'vacuum':
                     # COMBIVAC CM52：主动查询线程
                     try:
@@ -1378,6 +1443,8 @@ class MainWindow(QMainWindow):
                     except Exception:
                         baud = 19200
                     thread = CM52Thread(port=port, channel=channel, baudrate=baud, poll_ms=300)
+                    # 真空规单位在连接期间不变：连接时确定换算到 Pa 的系数
+                    self._vac_factor = _VACUUM_PA_FACTORS.get(str(thread.unit).strip().lower(), 1.0)
                 else:
                     thread = SerialThread(port, meter_type)
 
@@ -1389,9 +1456,10 @@ class MainWindow(QMainWindow):
                 connect_btn.setText("断开")
                 # 连接后锁定串口下拉框，避免更改
                 port_combo.setEnabled(False)
-                value_label.setText("读取中...")
-                self.log_message(f"{meter_names[meter_type]}万用表已连接到: {port}")
-                self.status_bar.showMessage(f"{meter_names[meter_type]}万用表已连接")
+                self._last_label_state.pop(meter_type, None)
+                self._set_label_text(value_label, "读取中...")
+                self.log_message(f"{METER_NAMES[meter_type]}万用表已连接到: {port}")
+                self.status_bar.showMessage(f"{METER_NAMES[meter_type]}万用表已连接")
 
             else:
                 if meter_type in self.meter_threads:
@@ -1403,13 +1471,14 @@ class MainWindow(QMainWindow):
                         thread.wait(100)
                     del self.meter_threads[meter_type]
 
-                port_combo = getattr(self, f"{meter_type}_port_combo")
+                port_combo = self._meter_widgets[meter_type]['port_combo']
                 port_combo.setEnabled(True)
 
                 connect_btn.setText("连接")
-                value_label.setText("未连接")
-                self.log_message(f"{meter_names[meter_type]}万用表已断开")
-                self.status_bar.showMessage(f"{meter_names[meter_type]}万用表已断开")
+                self._last_label_state.pop(meter_type, None)
+                self._set_label_text(value_label, "未连接")
+                self.log_message(f"{METER_NAMES[meter_type]}万用表已断开")
+                self.status_bar.showMessage(f"{METER_NAMES[meter_type]}万用表已断开")
 
         except Exception as e:
             error_msg = f"万用表连接/断开错误: {str(e)}"
@@ -1419,80 +1488,69 @@ class MainWindow(QMainWindow):
         """处理万用表数据 - 优化性能"""
         try:
             meter_type = data['meter_name']
-            coeff_edit = getattr(self, f"{meter_type}_coeff")
-
-            try:
-                coefficient = float(coeff_edit.text())
-            except ValueError:
-                coefficient = 1.0
+            # 系数文本未变时复用上次解析结果
+            txt = self._meter_widgets[meter_type]['coeff'].text()
+            cached = self._coeff_cache.get(meter_type)
+            if cached is not None and cached[0] == txt:
+                coefficient = cached[1]
+            else:
+                try:
+                    coefficient = float(txt)
+                except ValueError:
+                    coefficient = 1.0
+                self._coeff_cache[meter_type] = (txt, coefficient)
 
             value = data['value'] * coefficient
             unit = data['unit']
 
-
-            # 统一真空规单位：强制使用 Pa（避免出现 mbar / Torr / mPa 等显示）
+            # 统一真空规单位：强制使用 Pa（换算系数在连接时确定，见 toggle_meter_connection）
             if meter_type == 'vacuum':
-                try:
-                    u = str(unit).strip().lower()
-                except Exception:
-                    u = 'pa'
-                try:
-                    v_raw = float(value)
-                except Exception:
-                    v_raw = value
-                # 常见单位换算到 Pa
-                if u in ('mbar', 'mb', 'millibar'):
-                    value = float(v_raw) * 100.0
-                    unit = 'Pa'
-                elif u in ('bar',):
-                    value = float(v_raw) * 1.0e5
-                    unit = 'Pa'
-                elif u in ('torr',):
-                    value = float(v_raw) * 133.32236842105263
-                    unit = 'Pa'
-                elif u in ('mtorr',):
-                    value = float(v_raw) * 0.13332236842105263
-                    unit = 'Pa'
-                elif u in ('pa',):
-                    unit = 'Pa'
-                else:
-                    # 未知单位也按 Pa 显示（不改变数值），避免 UI 出现其他单位
-                    unit = 'Pa'
-            # 优化：减少锁的使用时间
-            self.data_mutex.lock()
-            self.meter_data[meter_type]['value'] = value
-            self.meter_data[meter_type]['unit'] = unit
-            self.meter_data[meter_type]['timestamp'] = time.time()
-            self.meter_data[meter_type]['valid'] = True
-            self.data_mutex.unlock()
-
-            # 优化：使用队列更新显示，避免频繁的UI操作
-            current_time = time.time()
-            if current_time - self.last_meter_update_time > self.meter_update_interval:
-                value_label = getattr(self, f"{meter_type}_value_label")
-                value_label.setText(f"{value:.3e} {unit}" if meter_type=='vacuum' else f"{value:.4f} {unit}")
-                self.last_meter_update_time = current_time
+                value = float(value) * self._vac_factor
+                unit = 'Pa'
+            # 整条记录替换为新的不可变读数（GIL 下引用赋值是原子的），其他线程读取时无需加锁
+            self.meter_data[meter_type] = MeterSample(
+                value, unit, self.meter_data[meter_type].coefficient, time.time(), True)
+            vals = list(self._meter_snapshot)
+            vals[_METER_INDEX[meter_type]] = value
+            self._meter_snapshot = tuple(vals)
+            # 标签由 meter_display_timer 统一刷新（合并多个采样为一次显示更新）
 
         except Exception as e:
             error_msg = f"处理万用表数据错误: {str(e)}"
             self.log_message(error_msg)
 
+    def _show_meter_value(self, meter_type, value, unit):
+        """显示万用表读数；(数值, 单位) 与上次显示相同时跳过格式化与 setText"""
+        state = (value, unit)
+        if self._last_label_state.get(meter_type) == state:
+            return
+        self._last_label_state[meter_type] = state
+        self._set_label_text(self._meter_widgets[meter_type]['value_label'], _METER_FMT[meter_type](value, unit))
+
+    def _set_label_text(self, label, text, style=None):
+        """仅在文本/样式变化时更新标签（与上次显示内容比较，避免无变化的重绘与样式重算）"""
+        last = self._last_label_text.get(label)
+        if last is not None and last[0] == text and (style is None or last[1] == style):
+            return
+        if last is None or last[0] != text:
+            label.setText(text)
+        if style is not None and (last is None or last[1] != style):
+            label.setStyleSheet(style)
+        self._last_label_text[label] = (text, style if style is not None else (last[1] if last else None))
+
     def update_meter_displays(self):
         """定时更新万用表显示 - 优化性能"""
         try:
-            for meter_type in ['cathode', 'gate', 'anode', 'backup', 'vacuum']:
-                value_label = getattr(self, f"{meter_type}_value_label")
-                # 直接从meter_data获取最新值，避免频繁的UI操作
-                self.data_mutex.lock()
-                value = self.meter_data[meter_type]['value']
-                unit = self.meter_data[meter_type]['unit']
-                self.data_mutex.unlock()
-
-                # 只有在值变化时才更新显示
-                current_text = value_label.text()
-                new_text = (f"{value:.3e} {unit}" if meter_type=='vacuum' else f"{value:.4f} {unit}")
-                if current_text != new_text:
-                    value_label.setText(new_text)
+            meter_data = self.meter_data
+            painted = self._meter_painted_ts
+            for meter_type in METER_TYPES:
+                # 每条记录整体替换，取一次引用即得到一致的值/单位/时间戳；上次刷新后没有新采样的通道跳过
+                rec = meter_data[meter_type]
+                ts = rec.timestamp
+                if painted.get(meter_type) == ts:
+                    continue
+                painted[meter_type] = ts
+                self._show_meter_value(meter_type, rec.value, rec.unit)
 
         except Exception as e:
             # 避免频繁的错误日志
@@ -1507,44 +1565,30 @@ class MainWindow(QMainWindow):
             if not w:
                 return
             # 先尝试断开，避免重复连接
-            try:
-                w.io_error.disconnect(self._on_hv_worker_error)
-            except Exception:
-                pass
-            try:
-                w.connected.disconnect(self._on_hv_worker_connected)
-            except Exception:
-                pass
-            try:
-                w.disconnected.disconnect(self._on_hv_worker_disconnected)
-            except Exception:
-                pass
-
-            w.io_error.connect(self._on_hv_worker_error)
-            w.connected.connect(self._on_hv_worker_connected)
-            w.disconnected.connect(self._on_hv_worker_disconnected)
+            self._detach_hv_worker_signals()
+            for sig, slot in self._hv_worker_signal_pairs(w):
+                sig.connect(slot)
         except Exception as e:
             self.log_message(f"绑定高压源worker信号失败: {e}")
 
+    def _hv_worker_signal_pairs(self, w):
+        """高压源 worker 的 (信号, 槽) 列表"""
+        return (
+            (w.io_error, self._on_hv_worker_error),
+            (w.connected, self._on_hv_worker_connected),
+            (w.disconnected, self._on_hv_worker_disconnected),
+        )
+
     def _detach_hv_worker_signals(self):
-        try:
-            w = getattr(self.hv_controller, "_worker", None)
-            if not w:
-                return
-            try:
-                w.io_error.disconnect(self._on_hv_worker_error)
-            except Exception:
-                pass
-            try:
-                w.connected.disconnect(self._on_hv_worker_connected)
-            except Exception:
-                pass
+        w = getattr(self.hv_controller, "_worker", None)
+        if not w:
+            return
+        for sig, slot in self._hv_worker_signal_pairs(w):
             try:
-                w.disconnected.disconnect(self._on_hv_worker_disconnected)
-            except Exception:
+                sig.disconnect(slot)
+            except (TypeError, RuntimeError):
+                # 未连接过该槽
                 pass
-        except Exception:
-            pass
 
     def _on_hv_worker_error(self, msg: str):
         self.log_message(f"[HAPS06] {msg}")
@@ -1652,22 +1696,16 @@ class MainWindow(QMainWindow):
             self.log_message(error_msg)
 
     def update_plots(self):
-        """更新图表 - 优化性能"""
+        """采样一次写入绘图缓冲区（并累积 Influx 数据点）；曲线重绘见 _redraw_plots"""
         try:
-            # 获取当前数据
-            self.data_mutex.lock()
-            cathode_val = self.meter_data['cathode']['value']
-            gate_val = self.meter_data['gate']['value']
-            anode_val = self.meter_data['anode']['value']
-            backup_val = self.meter_data['backup']['value']
-            vacuum_val = self.meter_data.get('vacuum', {}).get('value', 0.0)
-            self.data_mutex.unlock()
+            # 获取当前数据（一次快照）
+            cathode_val, gate_val, anode_val, backup_val, vacuum_val = self._meter_snapshot
 
             # 获取Keithley电压（缓存，避免每次都走GPIB导致卡顿）
-            keithley_voltage = float(getattr(self, "_keithley_v_cache", 0.0))
+            keithley_voltage = self._keithley_v_cache
             if self.keithley_controller.is_connected:
                 now = time.time()
-                ts = float(getattr(self, "_keithley_v_ts", 0.0))
+                ts = self._keithley_v_ts
                 # 0.5s 内复用缓存；仍能保证实时性，但显著降低阻塞
                 if now - ts >= 0.5:
                     v = self.keithley_controller.read_voltage()
@@ -1676,71 +1714,83 @@ class MainWindow(QMainWindow):
                         self._keithley_v_cache = keithley_voltage
                         self._keithley_v_ts = now
 
-            # 添加数据到缓冲区
+            # 添加数据到缓冲区（派生列 栅+阳+备用、阳/阴比 在写入时一并算出）
             self.data_buffer.add_data(cathode_val, gate_val, anode_val, backup_val, keithley_voltage, vacuum_val)
 
             # Optional: write to InfluxDB for dashboards/diagnostics
-            try:
-                gate_plus_anode = float(gate_val) + float(anode_val) + float(backup_val)
-            except Exception:
-                gate_plus_anode = 0.0
-            try:
-                ratio = (float(anode_val) / float(cathode_val) * 100.0) if float(cathode_val) != 0.0 else 0.0
-            except Exception:
-                ratio = 0.0
-
-            try:
-                hv_port = self.hv_port_combo.currentText() if hasattr(self, "hv_port_combo") else ""
-            except Exception:
-                hv_port = ""
-            try:
-                keithley_addr = self.keithley_addr_combo.currentText() if hasattr(self, "keithley_addr_combo") else ""
-            except Exception:
-                keithley_addr = ""
+            if self._influx_on:
+                gate_plus_anode, ratio = self.data_buffer.last_derived()
+                hv_voltage = self.hv_controller.actual_voltage if (
+                        self.hv_controller.is_connected) else 0.0
+                self._push_influx_point(time.time_ns(), (
+                    float(cathode_val), float(gate_val), float(anode_val), float(backup_val),
+                    float(vacuum_val), float(keithley_voltage),
+                    float(hv_voltage) if hv_voltage is not None else 0.0,
+                    gate_plus_anode, ratio,
+                ))
 
-            try:
-                self.influx_writer.enqueue(
-                    fields={
-                        "cathode": float(cathode_val),
-                        "gate": float(gate_val),
-                        "anode": float(anode_val),
-                        "backup": float(backup_val),
-                        "vacuum": float(vacuum_val),
-                        "keithley_voltage": float(keithley_voltage),
-                        "hv_vout": float(hv_voltage),
-                        "gate_plus_anode": float(gate_plus_anode),
-                        "anode_cathode_ratio": float(ratio),
-                        "is_testing": bool(self.is_testing),
-                        "is_stabilizing": bool(self.is_stabilizing),
-                        "is_recording": bool(self.is_recording),
-                    },
-                    tags={
-                        "hv_port": hv_port,
-                        "keithley": keithley_addr,
-                        "session": str(self.session_id),
-                        "run": str(self.current_run_id or ""),
-                    },
-                    timestamp_ns=time.time_ns(),
-                )
-            except Exception:
-                pass
+        except Exception as e:
+            # 避免频繁的错误日志
+            pass
 
-            # 获取绘图数据
-            time_data, cathode_data, gate_data, anode_data, backup_data, keithley_voltage_data, vacuum_data, gate_plus_anode_data, anode_cathode_ratio_data = self.data_buffer.get_plot_data()
+    def _redraw_plots(self):
+        """重绘曲线：各曲线直接取环形缓冲区的 float32 列视图（跨步切片，由 pyqtgraph 自行拷贝；无 Python 列表转换）"""
+        try:
+            buf = self.data_buffer
+            # get_plot_data 仅在有新数据时重建结果，对象未变即无需重绘
+            data = buf.get_plot_data()
+            if data is self._plot_drawn_data:
+                return
+            self._plot_drawn_data = data
+            for key, curve in self.plots.items():
+                curve.setData(*buf.get(key))
+        except Exception:
+            pass
 
-            # 更新图表
-            self.plots['cathode'].setData(time_data, cathode_data)
-            self.plots['gate'].setData(time_data, gate_data)
-            self.plots['anode'].setData(time_data, anode_data)
-            self.plots['backup'].setData(time_data, backup_data)
-            self.plots['keithley_voltage'].setData(time_data, keithley_voltage_data)
-            self.plots['gate_plus_anode'].setData(time_data, gate_plus_anode_data)
-            self.plots['anode_cathode_ratio'].setData(time_data, anode_cathode_ratio_data)
-            if 'vacuum' in self.plots:
-                self.plots['vacuum'].setData(time_data, vacuum_data)
+    def _influx_template(self):
+        """当前 Influx 行协议模板；端口/地址/会话/运行号/bucket 不变时复用（标签只转义一次）"""
+        key = (self.hv_port_combo.currentText(), self.keithley_addr_combo.currentText(),
+               self.session_id, self.current_run_id, self.influx_writer.desired_bucket)
+        if key != self._influx_tpl_key:
+            self._influx_tpl_key = key
+            self._influx_tpl = self.influx_writer.line_template(_INFLUX_FIELDS, {
+                "hv_port": str(key[0]),
+                "keithley": str(key[1]),
+                "session": str(key[2]),
+                "run": str(key[3] or ""),
+            })
+        return self._influx_tpl
+
+    def _push_influx_point(self, ts_ns, values):
+        """累积一个 Influx 数据点（values 为 _INFLUX_FIELDS 前 9 个数值，状态位在此补齐）；
+        满 _influx_batch_capacity 条或距上次提交超过 _influx_flush_interval 时整批提交"""
+        try:
+            if not all(map(math.isfinite, values)):
+                # 行协议不接受 nan/inf，与写入线程原有规则一致记为 0
+                values = tuple(v if math.isfinite(v) else 0.0 for v in values)
+            batch = self._influx_batch
+            batch.append(self._influx_template().format(
+                *values,
+                "true" if self.is_testing else "false",
+                "true" if self.is_stabilizing else "false",
+                "true" if self.is_recording else "false",
+                ts_ns,
+            ))
+            if (len(batch) >= self._influx_batch_capacity
+                    or time.monotonic() - self._influx_last_flush >= self._influx_flush_interval):
+                self._flush_influx_batch()
+        except Exception:
+            pass
 
-        except Exception as e:
-            # 避免频繁的错误日志
+    def _flush_influx_batch(self):
+        """把本地累积的 Influx 数据点整批交给写入线程"""
+        self._influx_last_flush = time.monotonic()
+        if not self._influx_batch:
+            return
+        batch, self._influx_batch = self._influx_batch, []
+        try:
+            self.influx_writer.enqueue_lines(batch)
+        except Exception:
             pass
 
     def start_test(self):
@@ -1751,222 +1801,14 @@ class MainWindow(QMainWindow):
         """开始循环测试"""
         self.test_service.start(cycle=True)
 
-    def _start_test(self, cycle=False):
-        """开始测试的主逻辑"""
-        try:
-            start_v = self.test_params['start_voltage']
-            target_v = self.test_params['target_voltage']
-            step_v = self.test_params['voltage_step']
-            delay = self.test_params['step_delay']
-            cycle_time = self.test_params['cycle_time'] if cycle else 0
-
-            if start_v == target_v:
-                self.log_message("错误: 起始电压和目标电压不能相同")
-                return
-
-            if step_v <= 0:
-                self.log_message("错误: 电压增幅必须大于0")
-                return
-
-            if start_v < target_v:
-                self.test_mode = "升压"
-                self.log_message(f"检测到升压测试模式: {start_v}V -> {target_v}V")
-            else:
-                self.test_mode = "降压"
-                self.log_message(f"检测到降压测试模式: {start_v}V -> {target_v}V")
-
-            self.is_testing = True
-            self.is_cycle_testing = cycle
-            self.start_test_btn.setEnabled(False)
-            self.cycle_test_btn.setEnabled(False)
-            self.stop_test_btn.setEnabled(True)
-            self.manual_set_btn.setEnabled(False)  # 测试时禁用手动设置按钮
-
-            # 单次测试时自动开始记录
-            if not cycle and self.path_label.text() and self.path_label.text() != "未选择保存路径" and not self.is_recording:
-                self.auto_recording = True
-                self.toggle_record()
-                self.log_message("单次测试已自动开始记录数据")
-
-            # 循环测试时自动开始记录
-            if cycle and self.path_label.text() and self.path_label.text() != "未选择保存路径" and not self.is_recording:
-                self.auto_recording = True
-                self.toggle_record()
-                self.log_message("循环测试已自动开始记录数据")
-
-            if cycle:
-                self.current_cycle = 0
-                self.cycle_data = []
-                self.current_cycle_anode_data = []
-
-            test_type = "循环测试" if cycle else "单次测试"
-            self.log_message(f"开始{test_type}...")
-
-            test_thread = threading.Thread(
-                target=self.run_test,
-                args=(start_v, target_v, step_v, delay, cycle_time, cycle),
-            )
-            test_thread.daemon = True
-            test_thread.start()
-
-        except ValueError as e:
-            error_msg = f"测试参数错误: {str(e)}"
-            self.log_message(error_msg)
-
-    def run_test(self, start_voltage, target_voltage, voltage_step, step_delay, cycle_time, is_cycle):
-        """运行测试（支持升压和降压模式）"""
-        try:
-            cycle_count = 0
-
-            while self.is_testing and (is_cycle or cycle_count == 0):
-                cycle_count += 1
-                self.current_cycle = cycle_count
-                self.log_message(f"开始第 {cycle_count} 轮测试")
-                # 循环测试：写入CSV标记行用于分隔不同循环的数据
-                if is_cycle and self.is_recording:
-                    try:
-                        self.data_saver.add_marker_row(f"第{cycle_count}次循环")
-                        self.log_message(f"已写入第{cycle_count}次循环标记行")
-                    except Exception as e:
-                        self.log_message(f"写入循环标记行失败: {str(e)}")
-                if is_cycle and self.is_recording:
-                    self.current_cycle_anode_data = []
-
-                # 设置起始电压
-                success, message = self.hv_controller.set_voltage_only(start_voltage)
-                if success:
-                    self.log_message(f"设置起始电压: {start_voltage:.1f}V - {message}")
-                    time.sleep(step_delay * 0.5)
-                else:
-                    self.log_message(f"设置起始电压失败: {message}")
-                    break
-
-                time.sleep(step_delay)
-
-                # 循环测试：在测试期间激活记录
-                if is_cycle and self.is_recording:
-                    self.cycle_recording_active = True
-                    self.log_message("测试期间数据记录已激活")
-
-                if self.test_mode == "升压":
-                    current_voltage = start_voltage
-                    while current_voltage <= target_voltage and self.is_testing:
-                        success, message = self.hv_controller.set_voltage_only(current_voltage)
-                        if success:
-                            self.log_message(f"设置电压: {current_voltage:.1f}V - {message}")
-                        else:
-                            self.log_message(f"设置电压失败: {message}")
-                            break
-
-                        current_voltage += voltage_step
-                        time.sleep(step_delay)
-                else:
-                    current_voltage = start_voltage
-                    while current_voltage >= target_voltage and self.is_testing:
-                        success, message = self.hv_controller.set_voltage_only(current_voltage)
-                        if success:
-                            self.log_message(f"设置电压: {current_voltage:.1f}V - {message}")
-                        else:
-                            self.log_message(f"设置电压失败: {message}")
-                            break
-
-                        current_voltage -= voltage_step
-                        time.sleep(step_delay)
-
-                if not self.is_testing:
-                    break
-
-                # 循环测试：降到100V等待
-                if is_cycle:
-                    # 计算并保存当前循环的最小阳极值和对应电压
-                    if self.is_recording and self.current_cycle_anode_data:
-                        self.calculate_and_save_cycle_min()
-
-                    # 循环测试：在等待期间暂停记录
-                    if self.is_recording:
-                        self.cycle_recording_active = False
-                        self.log_message("等待期间数据记录已暂停")
-
-                    self.log_message(f"到达目标电压，降至100V等待 {cycle_time} 秒")
-
-                    drop_success, drop_message = self.hv_controller.set_voltage_only(100.0)
-                    if drop_success:
-                        self.log_message(f"电压已设置为100V - {drop_message}")
-
-                        drop_wait_time = 0
-                        max_drop_wait = 10
-                        while drop_wait_time < max_drop_wait and self.is_testing:
-                            set_voltage = self.hv_controller.read_set_voltage()
-                            if set_voltage is not None and abs(set_voltage - 100.0) <= 1.0:
-                                self.log_message(f"确认电压已设置为: {set_voltage:.1f}V (在容差范围内)")
-                                break
-                            time.sleep(1)
-                            drop_wait_time += 1
-                            self.log_message(f"等待电压设置... 当前设置电压: {set_voltage if set_voltage else '未知'}V")
-
-                        if drop_wait_time >= max_drop_wait:
-                            set_voltage = self.hv_controller.read_set_voltage()
-                            self.log_message(
-                                f"警告：电压设置等待超时，当前设置电压: {set_voltage if set_voltage else '未知'}V")
-                    else:
-                        self.log_message(f"电压下降失败: {drop_message}")
-
-                    self.countdown_manager.start(int(cycle_time))
-
-                    wait_start = time.time()
-                    while time.time() - wait_start < cycle_time and self.is_testing:
-                        time.sleep(0.5)
-                        remaining = int(cycle_time - (time.time() - wait_start))
-                        self.update_countdown_display(remaining)
-
-                    self.countdown_manager.stop()
-                else:
-                    # 单次测试完成后降低到100V
-                    self.log_message("单次测试完成，降低电压到100V")
-                    drop_success, drop_message = self.hv_controller.set_voltage_only(100.0)
-                    if drop_success:
-                        self.log_message(f"电压已设置为100V - {drop_message}")
-                    else:
-                        self.log_message(f"电压下降失败: {drop_message}")
-
-            self.is_testing = False
-            self.is_cycle_testing = False
-
-            # 循环测试完成后重置记录状态
-            if is_cycle and self.is_recording:
-                self.cycle_recording_active = False
-
-            # 测试完成后自动停止记录
-            if self.auto_recording and self.is_recording:
-                self.auto_recording = False
-                self.toggle_record()
-                self.log_message("测试已完成，自动停止记录数据")
-
-            QTimer.singleShot(0, self._update_ui_after_test)
-        except Exception as e:
-            error_msg = f"运行测试错误: {str(e)}"
-            self.log_message(error_msg)
-
-            # 异常情况下也停止自动记录
-            if self.auto_recording and self.is_recording:
-                self.auto_recording = False
-                self.toggle_record()
-                self.log_message("测试异常，自动停止记录数据")
-
-            self.is_testing = False
-            self.is_cycle_testing = False
-            QTimer.singleShot(0, self._update_ui_after_test)
-
     def calculate_and_save_cycle_min(self):
         """计算并保存当前循环的最小阳极值和对应电压及时间"""
         try:
             if not self.current_cycle_anode_data:
                 return
 
-            min_anode = min(item[0] for item in self.current_cycle_anode_data)
-            min_data = next(item for item in self.current_cycle_anode_data if item[0] == min_anode)
-            min_voltage = min_data[1]
-            min_time = min_data[2]
+            # 单次遍历取最小项（避免 min + next 两次扫描及浮点相等比较）
+            min_anode, min_voltage, min_time = min(self.current_cycle_anode_data, key=lambda item: item[0])
 
             self.cycle_data.append({
                 'cycle': self.current_cycle,
@@ -1985,18 +1827,6 @@ class MainWindow(QMainWindow):
             error_msg = f"计算循环最小值失败: {str(e)}"
             self.log_message(error_msg)
 
-    def _update_ui_after_test(self):
-        """测试结束后更新UI"""
-        self.stop_test_btn.setEnabled(False)
-        self.start_test_btn.setEnabled(True)
-        self.cycle_test_btn.setEnabled(True)
-        self.manual_set_btn.setEnabled(True)  # 测试结束后重新启用手动设置按钮
-
-        if not self.is_testing:
-            self.log_message("测试完成")
-        else:
-            self.log_message("测试已停止")
-
     def stop_test(self):
         """停止测试"""
         try:
@@ -2050,6 +1880,8 @@ class MainWindow(QMainWindow):
                     # InfluxDB: one bucket per run (named after the CSV filename stem)
                     # Helps manage and query each run independently.
                     try:
+                        # 切换 bucket 前先提交上一段累积的数据点（run_bucket 标签按提交时的 bucket 补全）
+                        self._flush_influx_batch()
                         desired_bucket = self.influx_writer.set_bucket_for_csv(csv_path, create_if_missing=True)
                         if getattr(getattr(self, "influx_writer", None), "cfg", None) and bool(getattr(self.influx_writer.cfg, "enabled", False)):
                             actual_bucket = str(getattr(self.influx_writer.cfg, "bucket", "") or "")
@@ -2097,7 +1929,7 @@ class MainWindow(QMainWindow):
                     self.anode_min_value = None
                     self.anode_min_voltage = None
                     self.anode_min_time = None
-                    self.data_cache.clear()
+                    self._sqlite_cache.clear()
                     try:
                         self._last_cache_send_ts = time.time()
                     except Exception:
@@ -2146,16 +1978,7 @@ class MainWindow(QMainWindow):
                     # 仅在主线程做“轻量计算”，写入交给后台线程处理
                     anode_min = None
                     if (not self.auto_recording) and self.all_anode_data:
-                        try:
-                            # 优先使用运行最小值（更快，且不受 deque 截断影响）
-                            if self.anode_min_value is not None:
-                                anode_min = {"min_anode": self.anode_min_value, "voltage": self.anode_min_voltage, "time": self.anode_min_time}
-                            else:
-                                min_anode = min(item[0] for item in self.all_anode_data)
-                                min_data = next(item for item in self.all_anode_data if item[0] == min_anode)
-                                anode_min = {"min_anode": min_anode, "voltage": min_data[1], "time": min_data[2]}
-                        except Exception:
-                            anode_min = None
+                        anode_min = self._anode_min_summary()
 
                     cycle_data = list(self.cycle_data) if self.cycle_data else None
 
@@ -2190,16 +2013,17 @@ class MainWindow(QMainWindow):
             return
 
         try:
-            current_time = datetime.now()
-            current_time_str = current_time.strftime("%Y-%m-%d %H:%M:%S")
+            # 每行只取一次整数纳秒时间戳；各处（Keithley 缓存、Influx、SQLite、批量判断）由它换算
+            now_ns = time.time_ns()
+            now = now_ns / 1e9
+            current_time_str = self._format_time_text(now_ns // 1_000_000_000)
             hv_voltage = self.hv_controller.actual_voltage if (
-                    getattr(self.hv_controller, 'is_connected', False)) else 0.0
+                    self.hv_controller.is_connected) else 0.0
 
             # 获取Keithley电压（缓存，避免每次都走GPIB导致卡顿）
-            keithley_voltage = float(getattr(self, "_keithley_v_cache", 0.0))
+            keithley_voltage = self._keithley_v_cache
             if self.keithley_controller.is_connected:
-                now = time.time()
-                ts = float(getattr(self, "_keithley_v_ts", 0.0))
+                ts = self._keithley_v_ts
                 # 0.5s 内复用缓存；仍能保证实时性，但显著降低阻塞
                 if now - ts >= 0.5:
                     v = self.keithley_controller.read_voltage()
@@ -2208,78 +2032,43 @@ class MainWindow(QMainWindow):
                         self._keithley_v_cache = keithley_voltage
                         self._keithley_v_ts = now
 
-            # 快速获取数据，减少锁时间
-            self.data_mutex.lock()
-            try:
-                cathode_val = self.meter_data['cathode']['value']
-                gate_val = self.meter_data['gate']['value']
-                anode_val = self.meter_data['anode']['value']
-                backup_val = self.meter_data['backup']['value']
-                vacuum_val = self.meter_data.get('vacuum', {}).get('value', 0.0)
-            finally:
-                self.data_mutex.unlock()
+            # 快速获取数据（一次快照）
+            cathode_val, gate_val, anode_val, backup_val, vacuum_val = self._meter_snapshot
 
             # 计算派生数据
             gate_plus_anode = gate_val + anode_val + backup_val
             anode_cathode_ratio = (anode_val / cathode_val * 100) if cathode_val != 0 else 0
 
-            # 准备数据行（修改：增加栅极电压列）
+            # 准备数据行（原始浮点；小数位由 DataSaver 落盘时统一处理）
             excel_row = [
                 current_time_str,
-                round(hv_voltage, 2) if hv_voltage is not None else "",
-                round(cathode_val, 4),
-                round(gate_val, 4),
-                round(anode_val, 4),
-                round(backup_val, 4),
+                hv_voltage if hv_voltage is not None else "",
+                cathode_val,
+                gate_val,
+                anode_val,
+                backup_val,
                 vacuum_val,
-                round(keithley_voltage, 2),  # 新增：栅极电压
-                round(gate_plus_anode, 4),
-                round(anode_cathode_ratio, 2)
+                keithley_voltage,  # 栅极电压
+                gate_plus_anode,
+                anode_cathode_ratio,
             ]
 
 
             # --- InfluxDB: write the *same* row that is being recorded to Excel (more reliable than plot timer) ---
-            try:
-                # tags
-                try:
-                    hv_port_tag = self.hv_port_combo.currentText() if hasattr(self, "hv_port_combo") else ""
-                except Exception:
-                    hv_port_tag = ""
-                try:
-                    keithley_tag = self.keithley_addr_combo.currentText() if hasattr(self, "keithley_addr_combo") else ""
-                except Exception:
-                    keithley_tag = ""
-                self.influx_writer.enqueue(
-                    fields={
-                        "cathode": float(cathode_val),
-                        "gate": float(gate_val),
-                        "anode": float(anode_val),
-                        "backup": float(backup_val),
-                        "vacuum": float(vacuum_val),
-                        "keithley_voltage": float(keithley_voltage),
-                        "hv_vout": float(hv_voltage) if hv_voltage is not None else 0.0,
-                        "gate_plus_anode": float(gate_plus_anode),
-                        "anode_cathode_ratio": float(anode_cathode_ratio),
-                        "is_testing": bool(self.is_testing),
-                        "is_stabilizing": bool(self.is_stabilizing),
-                        "is_recording": bool(self.is_recording),
-                    },
-                    tags={
-                        "hv_port": str(hv_port_tag),
-                        "keithley": str(keithley_tag),
-                        "session": str(self.session_id),
-                        "run": str(self.current_run_id or ""),
-                    },
-                    timestamp_ns=time.time_ns(),
-                )
-            except Exception:
-                pass
+            if self._influx_on:
+                self._push_influx_point(now_ns, (
+                    float(cathode_val), float(gate_val), float(anode_val), float(backup_val),
+                    float(vacuum_val), float(keithley_voltage),
+                    float(hv_voltage) if hv_voltage is not None else 0.0,
+                    float(gate_plus_anode), float(anode_cathode_ratio),
+                ))
 
             # --- SQLite: crash-safe local persistence (authoritative raw log) ---
+            # 批量入队（flush_data_cache），由记录线程单事务写入
             try:
-                self.sqlite_recorder.enqueue_row(
-                    ts_ms=int(time.time() * 1000),
-                    row={
+                self._sqlite_cache.append((
+                    now_ns // 1_000_000,
+                    {
                         "time_text": current_time_str,
                         "hv_voltage": float(hv_voltage) if hv_voltage is not None else 0.0,
                         "cathode": float(cathode_val),
@@ -2291,12 +2080,12 @@ class MainWindow(QMainWindow):
                         "gate_plus_anode": float(gate_plus_anode),
                         "anode_cathode_ratio": float(anode_cathode_ratio),
                     },
-                )
+                ))
             except Exception:
                 pass
 
-            # 添加到缓存
-            self.data_cache.append(excel_row)
+            # CSV：直接入队到保存线程（excel_row 每次新建，无需拷贝）
+            self.data_saver.add_row(excel_row)
 
             # 保存到内存队列
             self.recorded_data.append(excel_row)
@@ -2314,42 +2103,49 @@ class MainWindow(QMainWindow):
             if self.is_cycle_testing and self.is_recording:
                 self.current_cycle_anode_data.append((anode_val, hv_voltage, current_time_str))
 
-            # 批量发送策略：
+            # SQLite 批量发送策略（CSV 的批量/定时落盘已由 DataSaver 线程负责）：
             # 1) 达到 cache_size 立即入队
-            # 2) 未达到 cache_size 也按时间间隔入队，避免长时间只写表头（尤其在停止前数据未触发阈值时）
-            now_ts = time.time()
-            if len(self.data_cache) >= self.cache_size:
+            # 2) 未达到 cache_size 也按时间间隔入队，避免小批量长时间不落盘
+            if len(self._sqlite_cache) >= self.cache_size:
                 self.flush_data_cache()
-            elif (now_ts - float(getattr(self, "_last_cache_send_ts", 0.0)) >= float(getattr(self, "cache_send_interval", 1.0))):
+            elif now - self._last_cache_send_ts >= self.cache_send_interval:
                 self.flush_data_cache()
 
         except Exception as e:
             error_msg = f"准备保存数据失败: {str(e)}"
             self.log_message(error_msg)
 
+    def _format_time_text(self, sec: int) -> str:
+        """记录行的时间文本（秒精度）；同一秒内复用上次格式化结果，strftime 每秒至多一次"""
+        cached = self._time_text_cache
+        if cached[0] != sec:
+            cached = self._time_text_cache = (sec, time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(sec)))
+        return cached[1]
+
     def flush_data_cache(self, force: bool = False):
-        """将缓存的数据发送到保存线程（批量入队，减少 queue.put 次数，提升长测性能）。
+        """将缓存的 SQLite 行整批交给记录线程，并通知保存线程落盘已入队的 CSV 行。
 
         关键修复：
         - 停止记录时主流程会先把 is_recording 置 False（为了 UI 状态切换），
-          这会导致最后一批 data_cache 无法入队，从而出现 CSV 只有表头。
-        - 因此增加 force 参数：停止阶段可强制 flush，确保数据真正进入保存线程。
+          这会导致最后一批缓存无法入队。
+        - 因此增加 force 参数：停止阶段可强制 flush，确保数据真正进入后台线程。
         """
-        if not self.data_cache:
-            return
         if (not self.is_recording) and (not force):
             return
 
         try:
-            # 重要修复：必须发送 *拷贝*。
-            # 之前直接把 self.data_cache 作为对象引用传给 DataSaver，然后立刻 clear()。
-            # Queue 中保存的是同一个 list 对象引用，保存线程取出时该 list 已被清空，
-            # 就会出现“CSV 只有表头、没有数据”的现象。
-            rows_to_send = list(self.data_cache)
-            self.data_cache.clear()
+            if force:
+                # CSV 行已逐行入队；停止阶段让保存线程立即写出未满的批次
+                self.data_saver.force_save()
 
-            # 批量发送到保存线程（传递拷贝，避免引用被清空）
-            self.data_saver.add_batch(rows_to_send)
+            # SQLite：整批一次入队
+            if self._sqlite_cache:
+                sqlite_rows = list(self._sqlite_cache)
+                self._sqlite_cache.clear()
+                try:
+                    self.sqlite_recorder.enqueue_rows(sqlite_rows)
+                except Exception:
+                    pass
 
             # 更新节流时间戳（用于定时 flush，避免小批量长期不落盘）
             try:
@@ -2360,6 +2156,16 @@ class MainWindow(QMainWindow):
         except Exception as e:
             print(f"刷新数据缓存错误: {e}")
 
+    def _anode_min_summary(self):
+        """本次记录的阳极最小值 {"min_anode", "voltage", "time"}；无数据时返回 None
+
+        取自 save_data 维护的运行最小值，覆盖整次记录（all_anode_data 只保留最近的尾部，
+        完整数据已逐批写入 SQLite / CSV，不再在内存里回扫）。
+        """
+        if self.anode_min_value is None:
+            return None
+        return {"min_anode": self.anode_min_value, "voltage": self.anode_min_voltage, "time": self.anode_min_time}
+
     def calculate_and_save_anode_min(self):
         """计算并保存阳极数据的最小值及对应时间（写入 summary.csv）"""
         try:
@@ -2367,13 +2173,13 @@ class MainWindow(QMainWindow):
                 self.log_message("没有阳极数据可计算最小值")
                 return
 
-            min_anode = min(item[0] for item in self.all_anode_data)
-            min_data = next(item for item in self.all_anode_data if item[0] == min_anode)
-            min_voltage = min_data[1]
-            min_time = min_data[2]
+            anode_min = self._anode_min_summary()
+            if anode_min is None:
+                self.log_message("没有阳极数据可计算最小值")
+                return
+            min_anode, min_voltage, min_time = anode_min["min_anode"], anode_min["voltage"], anode_min["time"]
 
             if self.path_label.text() and self.path_label.text() != "未选择保存路径":
-                anode_min = {"min_anode": min_anode, "voltage": min_voltage, "time": min_time}
                 self.data_saver.request_convert(self.path_label.text(), anode_min=anode_min, cycle_data=list(self.cycle_data) if self.cycle_data else None)
                 self.log_message(f"阳极最小值 - 值: {min_anode:.4f}, 电压: {min_voltage}, 时间: {min_time}")
         except Exception as e:
@@ -2420,7 +2226,7 @@ class MainWindow(QMainWindow):
             if path:
                 self.path_label.setText(path)
                 self.log_message(f"数据保存路径: {path}")
-                self.save_config_from_ui()
+                self.schedule_save_config()
 
         except Exception as e:
             error_msg = f"选择保存路径错误: {str(e)}"
@@ -2436,7 +2242,7 @@ class MainWindow(QMainWindow):
     def get_db_stats(self) -> dict:
         """Return SQLite database stats for GUI/Web diagnostics."""
         try:
-            return db_stats(self.get_sqlite_db_path())
+            return db_stats(self.get_sqlite_db_path(), conn=self.sqlite_recorder.reader_connection())
         except Exception as e:
             return {"path": self.get_sqlite_db_path(), "error": str(e)}
 
@@ -2530,17 +2336,34 @@ class MainWindow(QMainWindow):
             self.log_message(error_msg)
 
     def log_message(self, message):
-        """记录消息"""
-        try:
-            timestamp = datetime.now().strftime("%H:%M:%S")
-            formatted_message = f"[{timestamp}] {message}"
-            self.log_text.append(formatted_message)
-            if self.log_text.document().lineCount() > 1000:
-                cursor = self.log_text.textCursor()
-                cursor.movePosition(QtGui.QTextCursor.Start)
-                cursor.movePosition(QtGui.QTextCursor.Down, QtGui.QTextCursor.KeepAnchor, 500)
-                cursor.removeSelectedText()
-            self.log_text.verticalScrollBar().setValue(self.log_text.verticalScrollBar().maximum())
+        """记录消息（只入队；由 log_flush_timer 在 UI 线程批量写入日志框，任意线程可调用）"""
+        sec = int(time.time())
+        cached = self._log_time_cache
+        if cached[0] != sec:
+            cached = self._log_time_cache = (sec, time.strftime("%H:%M:%S", time.localtime(sec)))
+        self._log_queue.append(f"[{cached[1]}] {message}")
+
+    def _flush_log_queue(self):
+        """将排队的日志一次性追加到日志框（超出 maximumBlockCount 的旧行由文档自动裁剪）"""
+        q = self._log_queue
+        if not q:
+            return
+        batch = []
+        try:
+            while True:
+                batch.append(q.popleft())
+        except IndexError:
+            pass
+        try:
+            doc = self.log_text.document()
+            cursor = QtGui.QTextCursor(doc)
+            cursor.movePosition(QtGui.QTextCursor.End)
+            if not doc.isEmpty():
+                cursor.insertBlock()
+            # 纯文本插入：换行转为段落分隔，每条消息一个 block
+            cursor.insertText("\n".join(batch))
+            sb = self.log_text.verticalScrollBar()
+            sb.setValue(sb.maximum())
         except Exception as e:
             print(f"记录消息错误: {str(e)}")
 
@@ -2580,7 +2403,7 @@ class MainWindow(QMainWindow):
             # If anything goes wrong, proceed with normal shutdown
             pass
         try:
-            self.is_testing = False
+            self.test_service.stop()
             self.is_cycle_testing = False
 
             # 停止稳流控制
@@ -2588,13 +2411,11 @@ class MainWindow(QMainWindow):
                 self.stop_current_stabilization()
 
             # 停止所有定时器
-            self.hv_voltage_update_timer.stop()
+            self._tick_1hz.stop()
             self.stop_hv_voltage_poller()
-            self.keithley_voltage_update_timer.stop()
             self.data_update_timer.stop()
-            self.status_update_timer.stop()
+            self.plot_redraw_timer.stop()
             self.meter_display_timer.stop()
-            self.cache_flush_timer.stop()
             self.countdown_manager.stop()
             self.save_timer.stop()            # 保存最后的数据（尽量不阻塞：转换/写入交给后台线程）
             if self.is_recording:
@@ -2605,16 +2426,7 @@ class MainWindow(QMainWindow):
                 if os.path.exists(csv_path):
                     anode_min = None
                     if (not self.auto_recording) and self.all_anode_data:
-                        try:
-                            # 优先使用运行最小值（更快，且不受 deque 截断影响）
-                            if self.anode_min_value is not None:
-                                anode_min = {"min_anode": self.anode_min_value, "voltage": self.anode_min_voltage, "time": self.anode_min_time}
-                            else:
-                                min_anode = min(item[0] for item in self.all_anode_data)
-                                min_data = next(item for item in self.all_anode_data if item[0] == min_anode)
-                                anode_min = {"min_anode": min_anode, "voltage": min_data[1], "time": min_data[2]}
-                        except Exception:
-                            anode_min = None
+                        anode_min = self._anode_min_summary()
 
                     cycle_data = list(self.cycle_data) if self.cycle_data else None
 
@@ -2640,6 +2452,7 @@ class MainWindow(QMainWindow):
 
             # Stop Influx writer (optional monitoring)
             try:
+                self._flush_influx_batch()
                 self.influx_writer.stop()
             except Exception:
                 pass
@@ -2652,6 +2465,7 @@ class MainWindow(QMainWindow):
                 self.sqlite_recorder.stop()
             except Exception:
                 pass
+            self._save_cfg_timer.stop()
             self.save_config_from_ui()
 
             # 断开设备连接
@@ -2670,7 +2484,7 @@ class MainWindow(QMainWindow):
             # 清理内存
             self.recorded_data.clear()
             self.all_anode_data.clear()
-            self.data_cache.clear()
+            self._sqlite_cache.clear()
             gc.collect()
 
             self.log_message("系统已安全关闭")
@@ -1,13 +1,14 @@
 from __future__ import annotations
 
-import queue
 import threading
 import time
 from dataclasses import dataclass
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 import re
 from pathlib import Path
 
+from ..common_ring import SPSCRing
+
 try:
     import requests  # type: ignore
 except Exception:  # pragma: no cover
@@ -47,14 +48,22 @@ class InfluxConfig:
     token: str = ""
     measurement: str = "hv_test"
     device: str = ""
+    # one HTTP write per batch; InfluxDB recommends <= 5000 lines per request
+    batch_size: int = 1000
+    flush_interval_s: float = 1.0
+    timeout_s: float = 2.5
+
+
+_MAX_BATCH_LINES = 5000
 
 
 class InfluxWriter:
     """
     Background InfluxDB v2 writer.
 
-    - enqueue() is non-blocking (drops on full queue)
-    - thread batches writes
+    - enqueue() is non-blocking (SPSC ring; drops oldest points when full)
+    - line_template()/enqueue_lines() let a hot producer format line protocol itself (no per-point dicts)
+    - thread batches writes: one POST per batch_size lines or flush_interval_s, whichever comes first
     - if InfluxDB is unreachable, data is dropped to protect UI/DAQ stability
     """
 
@@ -64,7 +73,8 @@ class InfluxWriter:
         self.default_bucket: str = (getattr(cfg, 'bucket', '') or 'hv_test').strip() or 'hv_test'
         self.desired_bucket: str = self.default_bucket
         self.bucket_create_error: str = ''
-        self._q: "queue.Queue[Tuple[str, int, Dict[str, str], Dict[str, Any]]]" = queue.Queue(maxsize=20000)
+        # single producer (UI thread) -> single consumer (writer thread)
+        self._q = SPSCRing(20000)
         self._stop = threading.Event()
         self._thread = threading.Thread(target=self._run, name="InfluxWriter", daemon=True)
 
@@ -79,6 +89,10 @@ class InfluxWriter:
         self.last_error: str = ""
         self.total_enqueued: int = 0
 
+        # Line-protocol encode caches (writer thread only)
+        self._prefix_cache: Dict[Tuple[str, tuple], str] = {}
+        self._field_key_cache: Dict[str, str] = {}
+
         if self.cfg.enabled and requests is not None:
             self._thread.start()
 
@@ -311,6 +325,9 @@ class InfluxWriter:
             cfg.token = str(config.get("Monitoring", "influxdb_token", fallback="")).strip()
             cfg.measurement = str(config.get("Monitoring", "influx_measurement", fallback=cfg.measurement)).strip()
             cfg.device = str(config.get("Monitoring", "influx_device", fallback="")).strip()
+            cfg.batch_size = max(1, min(_MAX_BATCH_LINES, int(config.getint("Monitoring", "influx_batch_size", fallback=cfg.batch_size))))
+            cfg.flush_interval_s = max(0.05, float(config.getfloat("Monitoring", "influx_flush_interval_s", fallback=cfg.flush_interval_s)))
+            cfg.timeout_s = max(0.1, float(config.getfloat("Monitoring", "influx_timeout_s", fallback=cfg.timeout_s)))
         except Exception:
             pass
         return cls(cfg)
@@ -327,7 +344,7 @@ class InfluxWriter:
             "bucket": self.cfg.bucket,
             "measurement": self.cfg.measurement,
             "device": self.cfg.device,
-            "queue_size": int(getattr(self._q, "qsize", lambda: 0)()),
+            "queue_size": len(self._q),
             "last_write_ts": self.last_write_ts,
             "last_status": self.last_status,
             "last_error": self.last_error,
@@ -353,46 +370,84 @@ class InfluxWriter:
         except Exception:
             pass
 
-        try:
-            self._q.put_nowait((m, ts, t, dict(fields)))
-            try:
-                self.total_enqueued += 1
-            except Exception:
-                pass
-        except Exception:
-            # drop if queue is full
-            pass
+        self._q.put((m, ts, t, dict(fields)))
+        self.total_enqueued += 1
+
+    def line_template(
+        self,
+        field_keys: Tuple[str, ...],
+        tags: Optional[Dict[str, str]] = None,
+        measurement: Optional[str] = None,
+    ) -> str:
+        """str.format template "<measurement>,<tags> k1={},k2={},... {}" for a fixed field order.
+
+        Tags are completed like enqueue() (device, run_bucket) and escaped once here. The caller
+        fills in field values already in line-protocol form (floats as-is, bools as "true"/"false")
+        followed by the ns timestamp, and passes the lines to enqueue_lines(). Rebuild the
+        template whenever the tags or the run bucket change.
+        """
+        t = dict(tags or {})
+        if self.cfg.device:
+            t.setdefault("device", self.cfg.device)
+        t.setdefault("run_bucket", str(getattr(self, 'desired_bucket', self.cfg.bucket) or self.cfg.bucket))
+        prefix = self._encode_prefix(measurement or self.cfg.measurement, tuple(sorted(t.items())))
+        prefix = prefix.replace("{", "{{").replace("}", "}}")
+        fields = ",".join(f"{_escape_tag(str(k)).replace('{', '{{').replace('}', '}}')}={{}}" for k in field_keys)
+        return f"{prefix} {fields} {{}}"
+
+    def enqueue_lines(self, lines: List[str]) -> None:
+        """Enqueue pre-formatted line-protocol strings (see line_template)."""
+        if not self.cfg.enabled or requests is None or not lines:
+            return
+        put = self._q.put
+        for line in lines:
+            put(line)
+        self.total_enqueued += len(lines)
 
-    def _build_line(self, measurement: str, ts: int, tags: Dict[str, str], fields: Dict[str, Any]) -> str:
-        m = _escape_measurement(measurement)
-        # tags
+    @staticmethod
+    def _encode_prefix(measurement: str, tag_items: tuple) -> str:
         tag_parts = []
-        for k in sorted(tags.keys()):
-            vv = tags.get(k)
+        for k, vv in tag_items:
             if vv is None or vv == "":
                 continue
             tag_parts.append(f"{_escape_tag(str(k))}={_escape_tag(str(vv))}")
-        tag_str = ("," + ",".join(tag_parts)) if tag_parts else ""
-
-        # fields
+        return _escape_measurement(measurement) + (("," + ",".join(tag_parts)) if tag_parts else "")
+
+    def _line_prefix(self, measurement: str, tags: Dict[str, str]) -> str:
+        """Escaped "measurement,tag=v,..." (cached: tag sets repeat for every point of a run)."""
+        key = (measurement, tuple(sorted(tags.items())))
+        prefix = self._prefix_cache.get(key)
+        if prefix is None:
+            prefix = self._encode_prefix(measurement, key[1])
+            if len(self._prefix_cache) >= 256:
+                self._prefix_cache.clear()
+            self._prefix_cache[key] = prefix
+        return prefix
+
+    def _build_line(self, measurement: str, ts: int, tags: Dict[str, str], fields: Dict[str, Any]) -> bytes:
+        # fields (keys come from a small fixed set; escaped once and cached)
+        keys = self._field_key_cache
         field_parts = []
         for k, v in fields.items():
             if v is None:
                 continue
-            field_parts.append(f"{_escape_tag(str(k))}={_format_field_value(v)}")
+            ek = keys.get(k)
+            if ek is None:
+                ek = keys[k] = _escape_tag(str(k))
+            field_parts.append(f"{ek}={_format_field_value(v)}")
         if not field_parts:
-            return ""
-        field_str = ",".join(field_parts)
-        return f"{m}{tag_str} {field_str} {ts}"
+            return b""
+        return f"{self._line_prefix(measurement, tags)} {','.join(field_parts)} {ts}".encode("utf-8")
 
-    def _write_lines(self, lines: str) -> None:
+    def _write_lines(self, lines: bytes) -> None:
         if not lines or requests is None:
             return
         url = self.cfg.url.rstrip("/") + "/api/v2/write"
         headers = {"Authorization": f"Token {self.cfg.token}"} if self.cfg.token else {}
         params = {"org": self.cfg.org, "bucket": self.cfg.bucket, "precision": "ns"}
         try:
-            resp = requests.post(url, params=params, data=lines.encode("utf-8"), headers=headers, timeout=2.5)
+            resp = requests.post(url, params=params, data=lines, headers=headers,
+                                 timeout=self.cfg.timeout_s)
             self.last_write_ts = time.time()
             self.last_status = int(getattr(resp, "status_code", 0) or 0)
             if self.last_status != 204:
@@ -409,39 +464,42 @@ class InfluxWriter:
             self.last_status = 0
             self.last_error = str(e)[:500]
 
+    def _flush(self, batch: list) -> None:
+        lines = []
+        for item in batch:
+            if type(item) is str:
+                # already formatted by the producer (enqueue_lines)
+                lines.append(item.encode("utf-8"))
+                continue
+            m, ts, tags, fields = item
+            line = self._build_line(m, ts, tags, fields)
+            if line:
+                lines.append(line)
+        if lines:
+            self._write_lines(b"\n".join(lines))
+
     def _run(self):
-        batch: list[Tuple[str, int, Dict[str, str], Dict[str, Any]]] = []
-        last_flush = time.time()
+        # items: (measurement, ts, tags, fields) tuples or pre-formatted line strings
+        batch: list = []
+        batch_size = max(1, min(_MAX_BATCH_LINES, int(self.cfg.batch_size)))
+        interval = float(self.cfg.flush_interval_s)
+        last_flush = time.monotonic()
         while not self._stop.is_set():
-            try:
-                item = self._q.get(timeout=0.25)
-                batch.append(item)
-            except Exception:
-                pass
+            if not self._q.get_many(batch, batch_size - len(batch)):
+                self._stop.wait(0.05)
 
-            now = time.time()
-            if len(batch) >= 250 or (batch and (now - last_flush) >= 1.0):
+            now = time.monotonic()
+            if len(batch) >= batch_size or (batch and (now - last_flush) >= interval):
                 try:
-                    lines = []
-                    for m, ts, tags, fields in batch:
-                        line = self._build_line(m, ts, tags, fields)
-                        if line:
-                            lines.append(line)
-                    if lines:
-                        self._write_lines("\n".join(lines))
+                    self._flush(batch)
                 finally:
                     batch.clear()
                     last_flush = now
 
-        # flush remaining
-        if batch:
-            try:
-                lines = []
-                for m, ts, tags, fields in batch:
-                    line = self._build_line(m, ts, tags, fields)
-                    if line:
-                        lines.append(line)
-                if lines:
-                    self._write_lines("\n".join(lines))
-            except Exception:
-                pass
+        # flush remaining (still in batch_size chunks)
+        try:
+            while self._q.get_many(batch, batch_size - len(batch)) or batch:
+                self._flush(batch)
+                batch.clear()
+        except Exception:
+            pass
@@ -1,16 +1,36 @@
 from __future__ import annotations
 
+import math
 import threading
-import time
 
 from PyQt5.QtCore import QObject, pyqtSignal
 
 
+def ramp_steps(start_v: float, target_v: float, step_v: float) -> list:
+    """Setpoints from start_v to target_v (either direction) in step_v increments.
+
+    Each point is computed from its index (no float accumulation); the last point is
+    exactly target_v even when the span is not a whole number of steps.
+    """
+    span = abs(target_v - start_v)
+    sign = 1.0 if target_v >= start_v else -1.0
+    # tolerance keeps e.g. 0.9 / 0.3 from rounding up to an extra step
+    n = int(math.ceil(span / step_v - 1e-9)) + 1
+    steps = [start_v + sign * step_v * i for i in range(n)]
+    steps[-1] = float(target_v)
+    return steps
+
+
 class TestService(QObject):
     """Orchestrates single/cycle tests.
 
     This service intentionally keeps the existing behavior (step logic, logging,
     recording toggles) but moves the long-running test loop out of MainWindow.
+
+    The loop stays on a worker thread because every HV step is blocking serial I/O
+    (write + read-back confirm). Its waits block on a stop event instead of polling
+    time.sleep(), so stop() interrupts a step delay or cycle wait immediately, and
+    all UI updates go through the signals above.
     """
 
     log = pyqtSignal(str)
@@ -21,6 +41,7 @@ class TestService(QObject):
     def __init__(self, mw, parent=None):
         super().__init__(parent)
         self.mw = mw
+        self._stop_evt = threading.Event()
 
     def start(self, cycle: bool):
         """Start a test (single or cycle)."""
@@ -28,6 +49,13 @@ class TestService(QObject):
 
     def stop(self):
         self.mw.is_testing = False
+        self._stop_evt.set()
+
+    def _wait(self, seconds: float) -> bool:
+        """Sleep up to `seconds`; returns True if the test was stopped meanwhile."""
+        if seconds > 0:
+            self._stop_evt.wait(seconds)
+        return self._stop_evt.is_set() or not self.mw.is_testing
 
     def _start_test(self, cycle: bool = False):
         try:
@@ -51,6 +79,7 @@ class TestService(QObject):
                 self.mw.test_mode = "降压"
                 self.log.emit(f"检测到降压测试模式: {start_v}V -> {target_v}V")
 
+            self._stop_evt.clear()
             self.mw.is_testing = True
             self.mw.is_cycle_testing = cycle
 
@@ -86,6 +115,7 @@ class TestService(QObject):
 
     def _run_test(self, start_voltage, target_voltage, voltage_step, step_delay, cycle_time, is_cycle):
         try:
+            steps = ramp_steps(start_voltage, target_voltage, voltage_step)
             cycle_count = 0
             while self.mw.is_testing and (is_cycle or cycle_count == 0):
                 cycle_count += 1
@@ -105,38 +135,29 @@ class TestService(QObject):
                 ok, msg = self.mw.hv_controller.set_voltage_only(start_voltage)
                 if ok:
                     self.log.emit(f"设置起始电压: {start_voltage:.1f}V - {msg}")
-                    time.sleep(step_delay * 0.5)
                 else:
                     self.log.emit(f"设置起始电压失败: {msg}")
                     break
 
-                time.sleep(step_delay)
+                if self._wait(step_delay * 1.5):
+                    break
 
                 if is_cycle and self.mw.is_recording:
                     self.mw.cycle_recording_active = True
                     self.log.emit("测试期间数据记录已激活")
 
+                # 升压/降压共用同一组预先计算的设定点
                 ramp_failed = False
-                if self.mw.test_mode == "升压":
-                    current_voltage = start_voltage
-                    while current_voltage <= target_voltage and self.mw.is_testing:
-                        ok, msg = self.mw.hv_controller.set_voltage_only(current_voltage)
-                        self.log.emit((f"设置电压: {current_voltage:.1f}V - {msg}") if ok else f"设置电压失败: {msg}")
-                        if not ok:
-                            ramp_failed = True
-                            break
-                        current_voltage += voltage_step
-                        time.sleep(step_delay)
-                else:
-                    current_voltage = start_voltage
-                    while current_voltage >= target_voltage and self.mw.is_testing:
-                        ok, msg = self.mw.hv_controller.set_voltage_only(current_voltage)
-                        self.log.emit((f"设置电压: {current_voltage:.1f}V - {msg}") if ok else f"设置电压失败: {msg}")
-                        if not ok:
-                            ramp_failed = True
-                            break
-                        current_voltage -= voltage_step
-                        time.sleep(step_delay)
+                for current_voltage in steps:
+                    if not self.mw.is_testing:
+                        break
+                    ok, msg = self.mw.hv_controller.set_voltage_only(current_voltage)
+                    self.log.emit((f"设置电压: {current_voltage:.1f}V - {msg}") if ok else f"设置电压失败: {msg}")
+                    if not ok:
+                        ramp_failed = True
+                        break
+                    if self._wait(step_delay):
+                        break
 
                 if not self.mw.is_testing:
                     break
@@ -181,9 +202,7 @@ class TestService(QObject):
                         self.state_change.emit({"countdown_start": int(cycle_time)})
                     except Exception:
                         pass
-                    start_t = time.time()
-                    while self.mw.is_testing and (time.time() - start_t) < cycle_time:
-                        time.sleep(0.2)
+                    self._wait(cycle_time)
                     try:
                         self.state_change.emit({"countdown_stop": True})
                     except Exception:
@@ -8,6 +8,11 @@ import time
 from dataclasses import dataclass
 from typing import Any, Dict, List, Optional, Tuple
 
+from .sqlite_recorder import list_shard_paths
+
+# SQLite's default SQLITE_MAX_ATTACHED is 10; keep headroom
+_ATTACH_CHUNK = 8
+
 
 @dataclass
 class RetentionPolicy:
@@ -41,7 +46,14 @@ def load_retention_from_config(config) -> RetentionPolicy:
     )
 
 
-def db_stats(db_path: str) -> Dict[str, Any]:
+def db_stats(db_path: str, conn: Optional[sqlite3.Connection] = None) -> Dict[str, Any]:
+    """Row/run counts for diagnostics; `conn` may be a shared read-only connection.
+
+    With day shards present (shard_by_day), counts cover the base file plus all shards.
+    """
+    shards = [p for _, p in list_shard_paths(db_path)]
+    if shards:
+        return _sharded_stats(db_path, shards)
     out: Dict[str, Any] = {
         "path": db_path,
         "exists": os.path.isfile(db_path),
@@ -49,8 +61,10 @@ def db_stats(db_path: str) -> Dict[str, Any]:
     }
     if not os.path.isfile(db_path):
         return out
+    own = conn is None
     try:
-        conn = sqlite3.connect(db_path)
+        if own:
+            conn = sqlite3.connect(db_path, timeout=5.0)
         cur = conn.cursor()
         cur.execute("SELECT COUNT(1) FROM runs")
         out["runs"] = int(cur.fetchone()[0])
@@ -60,7 +74,51 @@ def db_stats(db_path: str) -> Dict[str, Any]:
         mn, mx = cur.fetchone()
         out["min_ts_ms"] = int(mn) if mn is not None else 0
         out["max_ts_ms"] = int(mx) if mx is not None else 0
-        conn.close()
+        if own:
+            conn.close()
+    except Exception as e:
+        out["error"] = str(e)
+    return out
+
+
+def _sharded_stats(db_path: str, shards: List[str]) -> Dict[str, Any]:
+    paths = ([db_path] if os.path.isfile(db_path) else []) + shards
+    out: Dict[str, Any] = {
+        "path": db_path,
+        "exists": True,
+        "shards": len(shards),
+        "size_bytes": sum(int(os.path.getsize(p)) for p in paths if os.path.isfile(p)),
+    }
+    run_ids: set = set()
+    rows = 0
+    mins: List[int] = []
+    maxs: List[int] = []
+    try:
+        # ATTACH shards in chunks and aggregate with UNION ALL (one query per chunk)
+        for i in range(0, len(paths), _ATTACH_CHUNK):
+            chunk = paths[i:i + _ATTACH_CHUNK]
+            conn = sqlite3.connect(":memory:", uri=True, timeout=5.0)
+            try:
+                aliases = []
+                for k, p in enumerate(chunk):
+                    conn.execute(f"ATTACH DATABASE ? AS d{k}", ("file:" + os.path.abspath(p).replace("\\", "/") + "?mode=ro",))
+                    aliases.append(f"d{k}")
+                union_runs = " UNION ".join(f"SELECT run_id FROM {a}.runs" for a in aliases)
+                run_ids.update(r[0] for r in conn.execute(union_runs))
+                union_data = " UNION ALL ".join(
+                    f"SELECT COUNT(1), MIN(ts_ms), MAX(ts_ms) FROM {a}.data" for a in aliases)
+                for n, mn, mx in conn.execute(union_data):
+                    rows += int(n or 0)
+                    if mn is not None:
+                        mins.append(int(mn))
+                    if mx is not None:
+                        maxs.append(int(mx))
+            finally:
+                conn.close()
+        out["runs"] = len(run_ids)
+        out["rows"] = rows
+        out["min_ts_ms"] = min(mins) if mins else 0
+        out["max_ts_ms"] = max(maxs) if maxs else 0
     except Exception as e:
         out["error"] = str(e)
     return out
@@ -86,8 +144,9 @@ def _select_runs_to_delete(conn: sqlite3.Connection, *, keep_days: int, keep_run
     return sorted(delete_ids)
 
 
-def _archive_runs_to_csv(conn: sqlite3.Connection, run_ids: List[str], archive_dir: str) -> Tuple[int, int]:
-    """Archive selected runs to CSV files.
+def _archive_runs_to_csv(conn: sqlite3.Connection, run_ids: List[str], archive_dir: str,
+                         suffix: str = "") -> Tuple[int, int]:
+    """Archive selected runs to CSV files (`suffix` keeps per-shard parts of one run apart).
 
     Returns: (files_written, rows_written)
     """
@@ -115,7 +174,7 @@ def _archive_runs_to_csv(conn: sqlite3.Connection, run_ids: List[str], archive_d
     ]
 
     for rid in run_ids:
-        fn = f"run_{rid}.csv"
+        fn = f"run_{rid}{suffix}.csv"
         fp = os.path.join(archive_dir, fn)
         with open(fp, "w", newline="", encoding="utf-8") as f:
             w = csv.writer(f)
@@ -151,12 +210,20 @@ def cleanup_db(
     - Optionally archives those runs to CSV
     - Deletes data and runs rows inside a transaction
     - Performs WAL checkpoint and vacuum (incremental or full)
+    - With day shards (shard_by_day), shards older than keep_days are dropped as whole files
     """
+    shards = list_shard_paths(db_path)
+    if shards:
+        return _cleanup_shards(
+            shards, keep_days=keep_days, keep_runs=keep_runs, archive_before_delete=archive_before_delete,
+            archive_dir=archive_dir, vacuum_mode=vacuum_mode,
+        )
     if not os.path.isfile(db_path):
         return {"ok": True, "message": "db not found", "data": {"deleted_runs": 0, "deleted_rows": 0}}
 
     t0 = time.time()
-    conn = sqlite3.connect(db_path)
+    conn = sqlite3.connect(db_path, timeout=5.0)
+    conn.execute("PRAGMA busy_timeout=5000;")
     conn.execute("PRAGMA foreign_keys=ON;")
     conn.execute("PRAGMA journal_mode=WAL;")
 
@@ -225,3 +292,114 @@ def cleanup_db(
             "elapsed_s": round(dt, 3),
         },
     }
+
+
+def _remove_db_file(path: str):
+    for p in (path, path + "-wal", path + "-shm", path + "-journal"):
+        if os.path.isfile(p):
+            os.remove(p)
+
+
+def _cleanup_shards(
+    shards: List[Tuple[str, str]],
+    *,
+    keep_days: int,
+    keep_runs: int,
+    archive_before_delete: bool,
+    archive_dir: str,
+    vacuum_mode: str,
+) -> Dict[str, Any]:
+    """Retention for day shards: whole-file drop by age, then keep_runs across the remaining shards."""
+    t0 = time.time()
+    vacuum_mode = (vacuum_mode or "incremental").strip().lower()
+    cutoff_day = time.strftime("%Y%m%d", time.localtime(time.time() - keep_days * 86400)) if keep_days >= 0 else ""
+    deleted_runs: set = set()
+    deleted_rows = 0
+    archived_files = 0
+    archived_rows = 0
+    dropped_shards = 0
+    remaining: List[Tuple[str, str]] = []
+
+    for day, path in shards:
+        if not (cutoff_day and day < cutoff_day):
+            remaining.append((day, path))
+            continue
+        try:
+            conn = sqlite3.connect(path, timeout=5.0)
+            try:
+                run_ids = [r[0] for r in conn.execute("SELECT run_id FROM runs")]
+                deleted_rows += int(conn.execute("SELECT COUNT(1) FROM data").fetchone()[0])
+                if archive_before_delete and run_ids:
+                    f, r = _archive_runs_to_csv(conn, run_ids, archive_dir, suffix=f"_{day}")
+                    archived_files += f
+                    archived_rows += r
+            finally:
+                conn.close()
+            _remove_db_file(path)
+        except Exception as e:
+            return {"ok": False, "message": f"drop shard {os.path.basename(path)} failed: {e}", "data": None}
+        deleted_runs.update(run_ids)
+        dropped_shards += 1
+
+    # keep_runs: newest runs across all remaining shards
+    if keep_runs >= 0 and remaining:
+        starts: Dict[str, int] = {}
+        for _, path in remaining:
+            conn = sqlite3.connect(path, timeout=5.0)
+            try:
+                for rid, start_ms in conn.execute("SELECT run_id, start_ms FROM runs"):
+                    starts[rid] = min(int(start_ms), starts.get(rid, int(start_ms)))
+            finally:
+                conn.close()
+        ordered = sorted(starts, key=starts.get, reverse=True)
+        doomed = ordered[keep_runs:]
+        if doomed:
+            q_marks = ",".join(["?"] * len(doomed))
+            for day, path in remaining:
+                conn = sqlite3.connect(path, timeout=5.0)
+                try:
+                    conn.execute("PRAGMA busy_timeout=5000;")
+                    conn.execute("PRAGMA foreign_keys=ON;")
+                    present = [r[0] for r in conn.execute(f"SELECT run_id FROM runs WHERE run_id IN ({q_marks})", tuple(doomed))]
+                    if not present:
+                        continue
+                    if archive_before_delete:
+                        f, r = _archive_runs_to_csv(conn, present, archive_dir, suffix=f"_{day}")
+                        archived_files += f
+                        archived_rows += r
+                    p_marks = ",".join(["?"] * len(present))
+                    conn.execute("BEGIN;")
+                    deleted_rows += int(conn.execute(
+                        f"SELECT COUNT(1) FROM data WHERE run_id IN ({p_marks})", tuple(present)).fetchone()[0])
+                    conn.execute(f"DELETE FROM data WHERE run_id IN ({p_marks})", tuple(present))
+                    conn.execute(f"DELETE FROM runs WHERE run_id IN ({p_marks})", tuple(present))
+                    conn.commit()
+                    deleted_runs.update(present)
+                    try:
+                        conn.execute("PRAGMA wal_checkpoint(TRUNCATE);")
+                        conn.execute("VACUUM;" if vacuum_mode == "vacuum" else "PRAGMA incremental_vacuum;")
+                    except Exception:
+                        pass
+                except Exception as e:
+                    conn.rollback()
+                    return {"ok": False, "message": f"delete failed: {e}", "data": None}
+                finally:
+                    conn.close()
+
+    if not deleted_runs and not dropped_shards:
+        return {"ok": True, "message": "nothing to delete", "data": {"deleted_runs": 0, "deleted_rows": 0}}
+
+    return {
+        "ok": True,
+        "message": "OK",
+        "data": {
+            "deleted_runs": len(deleted_runs),
+            "deleted_rows": deleted_rows,
+            "dropped_shards": dropped_shards,
+            "archived_files": archived_files,
+            "archived_rows": archived_rows,
+            "archive_dir": archive_dir,
+            "vacuum_mode": vacuum_mode,
+            "elapsed_s": round(time.time() - t0, 3),
+        },
+    }
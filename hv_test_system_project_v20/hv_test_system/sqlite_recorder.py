@@ -1,13 +1,15 @@
 from __future__ import annotations
 
+import glob
 import json
 import os
 import queue
+import re
 import sqlite3
 import threading
 import time
 from dataclasses import dataclass
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 
 @dataclass
@@ -18,6 +20,40 @@ class SQLiteRecorderConfig:
     auto_vacuum: str = "INCREMENTAL"  # NONE|FULL|INCREMENTAL
     commit_every_rows: int = 200
     commit_every_ms: int = 500
+    busy_timeout_ms: int = 5000
+    temp_store: str = "MEMORY"
+    cache_size_kib: int = 20000  # PRAGMA cache_size=-N (KiB)
+    shard_by_day: bool = False  # write to <stem>_YYYYMMDD<ext>, rolling at local midnight
+    page_size: int = 8192  # applied only when a database file is created
+
+
+_INSERT_SQL = """
+    INSERT INTO data(
+        run_id, ts_ms, time_text, hv_voltage, cathode, gate, anode, backup, vacuum,
+        keithley_voltage, gate_plus_anode, anode_cathode_ratio
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+_SHARD_RE = re.compile(r"_(\d{8})$")
+
+
+def shard_path(base_path: str, day: str) -> str:
+    """Per-day shard file for `base_path`, e.g. data/session.sqlite -> data/session_20240131.sqlite."""
+    root, ext = os.path.splitext(base_path)
+    return f"{root}_{day}{ext}"
+
+
+def list_shard_paths(base_path: str) -> List[Tuple[str, str]]:
+    """Existing (day, path) shards of `base_path`, oldest first."""
+    root, ext = os.path.splitext(base_path)
+    out = []
+    for p in glob.glob(glob.escape(root) + "_" + "[0-9]" * 8 + glob.escape(ext)):
+        m = _SHARD_RE.search(os.path.splitext(p)[0])
+        if m:
+            out.append((m.group(1), p))
+    out.sort()
+    return out
 
 
 class SQLiteRecorder:
@@ -36,8 +72,18 @@ class SQLiteRecorder:
         self._stop = threading.Event()
 
         self._conn: Optional[sqlite3.Connection] = None
+        # Insert cursor reused for every batch on the current connection (statement stays prepared)
+        self._ins: Optional[sqlite3.Cursor] = None
+        # Separate read connection for stats queries (never contends with the writer under WAL)
+        self._reader: Optional[sqlite3.Connection] = None
+        self._reader_lock = threading.Lock()
         self._run_id: str = ""
         self._run_start_ms: int = 0
+        # Writer-thread state for day sharding
+        self._db_path: str = cfg.path
+        self._day: str = ""
+        self._w_run: Optional[Tuple[str, int, str]] = None  # (run_id, start_ms, params_json)
+        self._w_run_paths: List[str] = []  # shards that hold a runs row for _w_run
 
         # Diagnostics
         self.total_enqueued = 0
@@ -63,6 +109,11 @@ class SQLiteRecorder:
             auto_vacuum=_get("SQLite", "auto_vacuum", "INCREMENTAL"),
             commit_every_rows=int(float(_get("SQLite", "commit_every_rows", "200")) or 200),
             commit_every_ms=int(float(_get("SQLite", "commit_every_ms", "500")) or 500),
+            busy_timeout_ms=int(float(_get("SQLite", "busy_timeout_ms", "5000")) or 5000),
+            temp_store=_get("SQLite", "temp_store", "MEMORY"),
+            cache_size_kib=int(float(_get("SQLite", "cache_size_kib", "20000")) or 20000),
+            shard_by_day=_get("SQLite", "shard_by_day", "false").strip().lower() in ("1", "true", "yes"),
+            page_size=int(float(_get("SQLite", "page_size", "8192")) or 8192),
         )
         return cls(cfg)
 
@@ -81,10 +132,11 @@ class SQLiteRecorder:
             pass
         if self._thread:
             self._thread.join(timeout=timeout_s)
+        self.close_reader()
 
     def status(self) -> Dict[str, Any]:
         return {
-            "path": self.cfg.path,
+            "path": self._db_path,
             "run_id": self._run_id,
             "queue_size": int(getattr(self._q, "qsize", lambda: 0)()),
             "total_enqueued": int(self.total_enqueued),
@@ -94,6 +146,29 @@ class SQLiteRecorder:
             "thread_alive": bool(self._thread and self._thread.is_alive()),
         }
 
+    def reader_connection(self) -> Optional[sqlite3.Connection]:
+        """Lazily opened read-only connection for diagnostics (db_stats)."""
+        with self._reader_lock:
+            if self._reader is None and os.path.isfile(self.cfg.path):
+                try:
+                    uri = "file:" + os.path.abspath(self.cfg.path).replace("\\", "/") + "?mode=ro"
+                    conn = sqlite3.connect(uri, uri=True, check_same_thread=False,
+                                           timeout=self.cfg.busy_timeout_ms / 1000.0)
+                    conn.execute(f"PRAGMA busy_timeout={int(self.cfg.busy_timeout_ms)};")
+                    self._reader = conn
+                except Exception as e:
+                    self.last_error = f"open sqlite reader failed: {e}"
+            return self._reader
+
+    def close_reader(self):
+        with self._reader_lock:
+            if self._reader is not None:
+                try:
+                    self._reader.close()
+                except Exception:
+                    pass
+                self._reader = None
+
     def start_run(self, run_id: str, *, params: Optional[Dict[str, Any]] = None):
         """Open a new logical run (session).
 
@@ -137,6 +212,24 @@ class SQLiteRecorder:
         }
         self._enqueue(payload)
 
+    def enqueue_rows(self, rows: List[Tuple[int, Dict[str, Any]]]):
+        """Enqueue a batch of (ts_ms, row) pairs as one queue item.
+
+        The whole batch is inserted by one executemany() inside one transaction.
+        """
+        if not self._run_id or not rows:
+            return
+        run_id = self._run_id
+        payload = {
+            "cmd": "rows",
+            "rows": [self._row_tuple(run_id, ts_ms, row) for ts_ms, row in rows],
+        }
+        try:
+            self._q.put_nowait(payload)
+            self.total_enqueued += len(rows)
+        except queue.Full:
+            self.last_error = "sqlite queue full, dropping"
+
     def _enqueue(self, payload: Dict[str, Any]):
         try:
             self._q.put_nowait(payload)
@@ -146,33 +239,52 @@ class SQLiteRecorder:
             self.last_error = "sqlite queue full, dropping"
 
     # ---------------- internal ----------------
-    def _open(self) -> sqlite3.Connection:
-        os.makedirs(os.path.dirname(self.cfg.path) or ".", exist_ok=True)
+    def _target(self) -> Tuple[str, str]:
+        """(day, path) the writer should use now; day is "" when sharding is off."""
+        if not self.cfg.shard_by_day:
+            return "", self.cfg.path
+        day = time.strftime("%Y%m%d")
+        return day, shard_path(self.cfg.path, day)
+
+    def _open(self, path: Optional[str] = None) -> sqlite3.Connection:
+        path = path or self.cfg.path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
         # If the main DB file was deleted manually while WAL/SHM remain, SQLite may replay old data.
         # Purge orphaned sidecar files to ensure a truly fresh database on next start.
-        if not os.path.exists(self.cfg.path):
+        is_new = not os.path.exists(path)
+        if is_new:
             for suffix in ("-wal", "-shm", "-journal"):
-                sidecar = self.cfg.path + suffix
+                sidecar = path + suffix
                 if os.path.isfile(sidecar):
                     try:
                         os.remove(sidecar)
                     except Exception:
                         pass
-        conn = sqlite3.connect(self.cfg.path, check_same_thread=False)
+        conn = sqlite3.connect(path, check_same_thread=False, timeout=self.cfg.busy_timeout_ms / 1000.0)
+        if is_new:
+            # must precede the first write (and WAL mode) to take effect; larger pages = fewer splits
+            try:
+                conn.execute(f"PRAGMA page_size={int(self.cfg.page_size)};")
+            except Exception:
+                pass
         conn.execute("PRAGMA foreign_keys=ON;")
-        try:
-            conn.execute(f"PRAGMA journal_mode={self.cfg.journal_mode};")
-        except Exception:
-            pass
-        try:
-            conn.execute(f"PRAGMA synchronous={self.cfg.synchronous};")
-        except Exception:
-            pass
+        for pragma in (
+            f"journal_mode={self.cfg.journal_mode}",
+            f"synchronous={self.cfg.synchronous}",
+            f"busy_timeout={int(self.cfg.busy_timeout_ms)}",
+            f"temp_store={self.cfg.temp_store}",
+            f"cache_size=-{int(self.cfg.cache_size_kib)}",
+        ):
+            try:
+                conn.execute(f"PRAGMA {pragma};")
+            except Exception:
+                pass
         try:
             conn.execute(f"PRAGMA auto_vacuum={self.cfg.auto_vacuum};")
         except Exception:
             pass
         self._init_schema(conn)
+        self._ins = conn.cursor()
         return conn
 
     @staticmethod
@@ -210,11 +322,37 @@ class SQLiteRecorder:
         conn.execute("CREATE INDEX IF NOT EXISTS idx_data_run_ts ON data(run_id, ts_ms);")
         conn.commit()
 
+    def _roll_shard(self, batch: list):
+        """Switch to the next day's shard (writer thread only): flush, reopen, carry the active run over."""
+        day, path = self._target()
+        if day == self._day:
+            return
+        self._flush_batch(batch)
+        batch.clear()
+        try:
+            self._conn.close()
+        except Exception:
+            pass
+        self._conn = self._open(path)
+        self._day, self._db_path = day, path
+        if self._w_run is not None:
+            # data.run_id references runs(run_id): every shard holding rows of a run needs its runs row
+            try:
+                self._conn.execute(
+                    "INSERT OR IGNORE INTO runs(run_id, start_ms, end_ms, params_json) VALUES (?, ?, NULL, ?)",
+                    self._w_run,
+                )
+                self._conn.commit()
+                self._w_run_paths.append(path)
+            except Exception as e:
+                self.last_error = f"carry run to shard failed: {e}"
+
     def _run(self):
         batch = []
         last_commit = time.time()
         try:
-            self._conn = self._open()
+            self._day, self._db_path = self._target()
+            self._conn = self._open(self._db_path)
         except Exception as e:
             self.last_error = f"open sqlite failed: {e}"
             return
@@ -225,6 +363,13 @@ class SQLiteRecorder:
             except queue.Empty:
                 item = None
 
+            if self.cfg.shard_by_day:
+                try:
+                    self._roll_shard(batch)
+                except Exception as e:
+                    self.last_error = f"shard roll failed: {e}"
+                    return
+
             if item is None:
                 # commit on time
                 if batch and (time.time() - last_commit) * 1000 >= self.cfg.commit_every_ms:
@@ -243,26 +388,44 @@ class SQLiteRecorder:
                         (item.get("run_id"), int(item.get("start_ms")), item.get("params_json")),
                     )
                     self._conn.commit()
+                    self._w_run = (item.get("run_id"), int(item.get("start_ms")), item.get("params_json"))
+                    self._w_run_paths = [self._db_path]
                 except Exception as e:
                     self.last_error = f"start_run failed: {e}"
                 continue
             if cmd == "stop_run":
+                args = (int(item.get("end_ms")), item.get("run_id"))
                 try:
-                    self._conn.execute(
-                        "UPDATE runs SET end_ms=? WHERE run_id=?",
-                        (int(item.get("end_ms")), item.get("run_id")),
-                    )
+                    self._conn.execute("UPDATE runs SET end_ms=? WHERE run_id=?", args)
                     self._conn.commit()
                 except Exception as e:
                     self.last_error = f"stop_run failed: {e}"
+                # earlier shards of a run that crossed midnight
+                for path in self._w_run_paths:
+                    if path == self._db_path:
+                        continue
+                    try:
+                        conn = sqlite3.connect(path, timeout=self.cfg.busy_timeout_ms / 1000.0)
+                        try:
+                            conn.execute("UPDATE runs SET end_ms=? WHERE run_id=?", args)
+                            conn.commit()
+                        finally:
+                            conn.close()
+                    except Exception as e:
+                        self.last_error = f"stop_run failed: {e}"
+                self._w_run = None
+                self._w_run_paths = []
                 continue
             if cmd == "row":
-                batch.append(item)
-                if len(batch) >= self.cfg.commit_every_rows:
-                    self._flush_batch(batch)
-                    batch.clear()
-                    last_commit = time.time()
+                batch.append(self._row_tuple(item.get("run_id"), item.get("ts_ms"), item.get("row") or {}))
+            elif cmd == "rows":
+                batch.extend(item.get("rows") or ())
+            else:
                 continue
+            if len(batch) >= self.cfg.commit_every_rows:
+                self._flush_batch(batch)
+                batch.clear()
+                last_commit = time.time()
 
         # final flush
         if batch:
@@ -274,41 +437,41 @@ class SQLiteRecorder:
         except Exception:
             pass
 
-    def _flush_batch(self, batch_items):
-        if not batch_items or not self._conn:
+    @staticmethod
+    def _row_tuple(run_id, ts_ms, row: Dict[str, Any]) -> tuple:
+        return (
+            run_id,
+            int(ts_ms),
+            row.get("time_text"),
+            row.get("hv_voltage"),
+            row.get("cathode"),
+            row.get("gate"),
+            row.get("anode"),
+            row.get("backup"),
+            row.get("vacuum"),
+            row.get("keithley_voltage"),
+            row.get("gate_plus_anode"),
+            row.get("anode_cathode_ratio"),
+        )
+
+    def insert_many(self, rows: List[tuple]):
+        """Insert row tuples with one executemany() in a single write transaction (one fsync)."""
+        conn = self._conn
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._ins.executemany(_INSERT_SQL, rows)
+        except Exception:
+            conn.rollback()
+            raise
+        conn.commit()
+
+    def _flush_batch(self, rows):
+        if not rows or not self._conn:
             return
         try:
-            rows = []
-            for it in batch_items:
-                row = it.get("row") or {}
-                rows.append(
-                    (
-                        it.get("run_id"),
-                        int(it.get("ts_ms")),
-                        row.get("time_text"),
-                        row.get("hv_voltage"),
-                        row.get("cathode"),
-                        row.get("gate"),
-                        row.get("anode"),
-                        row.get("backup"),
-                        row.get("vacuum"),
-                        row.get("keithley_voltage"),
-                        row.get("gate_plus_anode"),
-                        row.get("anode_cathode_ratio"),
-                    )
-                )
-            self._conn.executemany(
-                """
-                INSERT INTO data(
-                    run_id, ts_ms, time_text, hv_voltage, cathode, gate, anode, backup, vacuum,
-                    keithley_voltage, gate_plus_anode, anode_cathode_ratio
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                rows,
-            )
-            self._conn.commit()
+            self.insert_many(rows)
             self.total_inserted += len(rows)
             self.last_commit_ts = time.time()
             self.last_error = ""
         except Exception as e:
-            self.last_error = f"insert failed: {e}"
\ No newline at end of file
+            self.last_error = f"insert failed: {e}"
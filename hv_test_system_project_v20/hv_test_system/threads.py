@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import datetime
+from queue import SimpleQueue
 
 from .common import *
 # 类型注解在 Python 默认会被运行时求值；这里需要显式导入，避免 NameError。
@@ -103,6 +104,27 @@ class HVConnectThread(QThread):
             self.finished.emit(False, f"连接异常: {e}", self.port)
 
 
+class GpibScanThread(QThread):
+    """后台枚举 VISA 资源（NI-VISA 下 list_resources 可能耗时数秒，避免阻塞UI线程）。
+
+    finished: (gpib_resources, error)；error 为 "import" 表示未安装 pyvisa
+    """
+
+    finished = pyqtSignal(list, str)
+
+    def run(self):
+        try:
+            import pyvisa
+        except ImportError:
+            self.finished.emit([], "import")
+            return
+        try:
+            resources = pyvisa.ResourceManager().list_resources()
+            self.finished.emit([r for r in resources if 'gpib' in r.lower()], "")
+        except Exception as e:
+            self.finished.emit([], str(e))
+
+
 class PIDController:
     """PID控制器（带死区、抗积分饱和与方向保护的更稳健实现）"""
 
@@ -201,11 +223,11 @@ class CurrentStabilizationThread(QThread):
     update_status_signal = pyqtSignal(str)
     stabilization_complete_signal = pyqtSignal()
 
-    def __init__(self, keithley_controller, meter_data, data_mutex, params):
+    def __init__(self, keithley_controller, meter_data, params):
         super().__init__()
         self.keithley_controller = keithley_controller
+        # 每个万用表的记录由 UI 线程整条替换，此处取一次引用即为一致快照（无需加锁）
         self.meter_data = meter_data
-        self.data_mutex = data_mutex
         self.params = params  # 稳流参数
         self.running = False
         self.pid = PIDController()
@@ -515,36 +537,35 @@ class CurrentStabilizationThread(QThread):
         """获取当前电流值"""
         try:
             if self.params['current_source'] == 'keithley':
-                # 使用Keithley自身读取的电流
+                # 使用Keithley自身读取的电流；设备支持复合查询时一次往返顺带刷新电压缓存
+                if self.keithley_controller.compound_query_supported:
+                    _, current = self.keithley_controller.read_voltage_current()
+                    return current
                 return self.keithley_controller.read_current()
             else:
                 # 使用万用表数据
-                self.data_mutex.lock()
-                try:
-                    meter_type = self.params['current_source']
-                    if meter_type in self.meter_data:
-                        # 读取值/单位/时间戳（用于判断断连或停止更新）
-                        value = self.meter_data[meter_type]['value']
-                        unit = self.meter_data[meter_type]['unit']
-                        ts = self.meter_data[meter_type].get('timestamp', 0.0)
-                        valid = self.meter_data[meter_type].get('valid', False)
-
-                        # 如果万用表长时间未更新/无效，则保持电压不变（不再调整）
-                        timeout_s = float(self.params.get('meter_timeout_s', 3.0))
-                        if (not valid) or (ts <= 0) or (time.time() - ts > timeout_s):
-                            return None
-
-                        # 根据单位转换
-                        if unit == 'mA':
-                            return value * 1000  # 转换为uA
-                        elif unit == 'A':
-                            return value * 1e6  # 转换为uA
-                        else:
-                            return value  # 假设已经是uA
-                finally:
-                    self.data_mutex.unlock()
+                rec = self.meter_data.get(self.params['current_source'])
+                if rec is not None:
+                    # 读取值/单位/时间戳（用于判断断连或停止更新）
+                    value = rec.value
+                    unit = rec.unit
+                    ts = rec.timestamp
+                    valid = rec.valid
+
+                    # 如果万用表长时间未更新/无效，则保持电压不变（不再调整）
+                    timeout_s = float(self.params.get('meter_timeout_s', 3.0))
+                    if (not valid) or (ts <= 0) or (time.time() - ts > timeout_s):
+                        return None
+
+                    # 根据单位转换
+                    if unit == 'mA':
+                        return value * 1000  # 转换为uA
+                    elif unit == 'A':
+                        return value * 1e6  # 转换为uA
+                    else:
+                        return value  # 假设已经是uA
         except Exception as e:
-            logger.info(f"获取电流值错误: {str(e)}")
+            logger.info("获取电流值错误: %s", e)
         return None
 
     def stop(self):
@@ -564,7 +585,7 @@ class CurrentStabilizationThread(QThread):
                 except Exception:
                     pass
         except Exception as e:
-            logger.info(f"停止稳流置零/关高压失败: {e}")
+            logger.info("停止稳流置零/关高压失败: %s", e)
 
         # 通知UI归零显示
         try:
@@ -859,6 +880,8 @@ class CM52Thread(QThread):
     """
     data_received = pyqtSignal(dict)
     log_message_signal = pyqtSignal(str)
+    # 上报数值的单位（固定，连接时据此确定换算到 Pa 的系数）
+    unit = "Pa"
 
     def __init__(self, port: str, channel: int = 3, baudrate: int = 19200, poll_ms: int = 300, parent=None):
         super().__init__(parent)
@@ -1064,7 +1087,7 @@ class CM52Thread(QThread):
 
                             "value": float(val),
 
-                            "unit": "Pa",
+                            "unit": self.unit,
 
                             "raw": s
 
@@ -1156,19 +1179,24 @@ class DataSaver(QThread):
     save_complete = pyqtSignal()
     convert_complete = pyqtSignal()
 
+    # 各列保留的小数位（与 DATA_HEADERS 对应，None 表示原样写出）
+    _COLUMN_DIGITS = (None, 2, 4, 4, 4, 4, None, 2, 4, 2)
+
     def __init__(self):
         super().__init__()
         self.headers = DATA_HEADERS
-        self.queue = Queue()
+        # 多生产者（UI 线程 / 测试服务）单消费者；SimpleQueue 无 maxsize/task 记账，入队开销更小
+        self.queue = SimpleQueue()
 
         self.csv_path: str | None = None
         self.running = True
 
         # 批量写入：避免每行都 flush
         self.batch_size = 100
-        # 定时 flush：避免持续高频入队导致长期不落盘
-        self.flush_interval_sec = 3600.0  # disabled; use batch_size flush
+        # 定时 flush：批次未满时，最早一行入队后最多等待 flush_interval_sec 即落盘
+        self.flush_interval_sec = 1.0
         self._last_flush_ts = time.time()
+        self._batch_start_ts = 0.0
         self._next_retry_ts = 0.0
         self._retry_interval_sec = 2.0  # avoid tight loop when file is locked
         self._stop_requested = False
@@ -1198,6 +1226,18 @@ class DataSaver(QThread):
         except Exception:
             pass
 
+    def add_row(self, row: list):
+        """追加单行数据（采集端直接入队；批量/定时落盘由保存线程负责）。
+
+        调用方每次传入新建的 list，入队后不再修改，因此无需拷贝。
+        """
+        if not row:
+            return
+        try:
+            self.queue.put_nowait(("row", row))
+        except Exception:
+            pass
+
     def add_marker_row(self, text: str):
         """写入标记行（用于循环分隔）。"""
         if not text:
@@ -1257,6 +1297,14 @@ class DataSaver(QThread):
         writer = csv.writer(fh)
         return fh, writer
 
+    def _rounded_rows(self, rows: list[list]) -> list[list]:
+        """采集端入队的是原始浮点，落盘前在保存线程按列取整（标记行等非浮点单元格原样保留）。"""
+        digits = self._COLUMN_DIGITS
+        return [
+            [v if d is None or not isinstance(v, float) else round(v, d) for v, d in zip(row, digits)]
+            for row in rows
+        ]
+
     def _write_header_if_needed(self, writer, path: str):
         if self._needs_header(path):
             writer.writerow(list(self.headers))
@@ -1275,7 +1323,7 @@ class DataSaver(QThread):
             fh, writer = self._open_writer(path)
             try:
                 self._write_header_if_needed(writer, path)
-                writer.writerows(rows)
+                writer.writerows(self._rounded_rows(rows))
             finally:
                 try:
                     fh.close()
@@ -1300,7 +1348,7 @@ class DataSaver(QThread):
             with open(out_path, "w", newline="", encoding="utf-8-sig") as fh:
                 w = csv.writer(fh)
                 w.writerow(list(self.headers))
-                w.writerows(rows)
+                w.writerows(self._rounded_rows(rows))
             return out_path
         except Exception:
             return None
@@ -1346,32 +1394,83 @@ class DataSaver(QThread):
 
     # -------- thread loop --------
 
+    def _flush_pending(self, now_ts: float, path: str | None = None) -> bool:
+        """把 pending 行一次 writerows 落盘（调用方持有 _lock）；失败时保留 pending 并推迟重试。"""
+        path = path or self.csv_path
+        if not self._pending_rows or not path:
+            return True
+        ok = self._append_rows_to_csv(path, self._pending_rows)
+        if ok:
+            self._pending_rows.clear()
+            self._last_flush_ts = now_ts
+            self._next_retry_ts = 0.0
+            self.save_complete.emit()
+        else:
+            # CSV 被占用时：保留 pending，不清空，等待下次重试
+            self._next_retry_ts = now_ts + self._retry_interval_sec
+        return ok
+
+    def _flush_final(self, path: str | None = None) -> bool:
+        """停止/生成统计前的最终落盘（调用方持有 _lock）：CSV 被占用时改写 recovery 文件。
+
+        只有数据确实写入某个文件后才清空 pending；两者都失败时保留，不丢数。
+        """
+        path = path or self.csv_path
+        if self._flush_pending(time.time(), path):
+            return True
+        # 文件可能被 Excel 锁定：写入 recovery 文件避免丢数
+        rec = self._write_recovery_csv(path, self._pending_rows)
+        if not rec:
+            return False
+        self._pending_rows.clear()
+        self.last_convert_success = True
+        self.last_convert_message = f"CSV 被占用，剩余数据已写入: {rec}"
+        self.save_complete.emit()
+        return True
+
+    def _flush_due_rows(self, now_ts: float):
+        """批次已满或最早一行已等待超过 flush_interval_sec 时落盘（调用方持有 _lock）。"""
+        if not self._pending_rows or not self.csv_path:
+            return
+        if len(self._pending_rows) < self.batch_size and now_ts - self._batch_start_ts < self.flush_interval_sec:
+            return
+        # If the CSV is locked (e.g., opened in Excel), avoid retrying too frequently.
+        if now_ts < self._next_retry_ts:
+            return
+        self._flush_pending(now_ts)
+
     def run(self):
         while True:
+            # 有未落盘的行时只等到其最大延迟截止；空闲时长等待
+            # CSV 被占用（等待重试）时等到重试时刻，避免以 10ms 间隔空转
+            timeout = 0.2
+            if self._pending_rows:
+                now_ts = time.time()
+                due_ts = max(self._batch_start_ts + self.flush_interval_sec, self._next_retry_ts)
+                timeout = max(0.01, min(timeout, due_ts - now_ts))
             try:
-                cmd, payload = self.queue.get(timeout=0.2)
+                cmd, payload = self.queue.get(timeout=timeout)
             except Exception:
                 cmd, payload = None, None
 
             if cmd is None:
+                with self._lock:
+                    self._flush_due_rows(time.time())
+                continue
+
+            if cmd == "row":
+                now_ts = time.time()
+                with self._lock:
+                    if not self._pending_rows:
+                        self._batch_start_ts = now_ts
+                    self._pending_rows.append(payload)
+                    self._flush_due_rows(now_ts)
                 continue
 
             if cmd == "stop":
                 # stop 前务必落盘（避免只写了表头、数据未写入）
                 with self._lock:
-                    if self.csv_path and self._pending_rows:
-                        ok = self._append_rows_to_csv(self.csv_path, self._pending_rows)
-                        if ok:
-                            self._pending_rows.clear()
-                            self.save_complete.emit()
-                        else:
-                            # 文件可能被 Excel 锁定：写入 recovery 文件避免丢数
-                            rec = self._write_recovery_csv(self.csv_path, self._pending_rows)
-                            if rec:
-                                self._pending_rows.clear()
-                                self.last_convert_success = True
-                                self.last_convert_message = f"CSV 被占用，剩余数据已写入: {rec}"
-                                self.save_complete.emit()
+                    self._flush_final()
                 break
 
             if cmd == "add_batch":
@@ -1380,22 +1479,10 @@ class DataSaver(QThread):
                     continue
                 now_ts = time.time()
                 with self._lock:
+                    if not self._pending_rows:
+                        self._batch_start_ts = now_ts
                     self._pending_rows.extend(rows)
-                    need_flush = (len(self._pending_rows) >= self.batch_size)
-                    if need_flush and self.csv_path and self._pending_rows:
-                        # If the CSV is locked (e.g., opened in Excel), avoid retrying too frequently.
-                        if now_ts < self._next_retry_ts:
-                            continue
-
-                        ok = self._append_rows_to_csv(self.csv_path, self._pending_rows)
-                        if ok:
-                            self._pending_rows.clear()
-                            self._last_flush_ts = now_ts
-                            self._next_retry_ts = 0.0
-                            self.save_complete.emit()
-                        else:
-                            # CSV 被占用时：保留 pending，不清空，等待下次重试
-                            self._next_retry_ts = now_ts + self._retry_interval_sec
+                    self._flush_due_rows(now_ts)
                 continue
 
             elif cmd == "marker":
@@ -1404,32 +1491,16 @@ class DataSaver(QThread):
                 with self._lock:
                     # marker row: first column comment, rest empty
                     row = [f"# {text}"] + [""] * (len(self.headers) - 1)
+                    if not self._pending_rows:
+                        self._batch_start_ts = now_ts
                     self._pending_rows.append(row)
 
                     # Do NOT write immediately; keep the same batching rule as data rows.
-                    if self.csv_path and len(self._pending_rows) >= self.batch_size:
-                        if now_ts < self._next_retry_ts:
-                            continue
-                        ok = self._append_rows_to_csv(self.csv_path, self._pending_rows)
-                        if ok:
-                            self._pending_rows.clear()
-                            self._last_flush_ts = now_ts
-                            self._next_retry_ts = 0.0
-                            self.save_complete.emit()
-                        else:
-                            self._next_retry_ts = now_ts + self._retry_interval_sec
+                    self._flush_due_rows(now_ts)
             elif cmd == "flush":
                 with self._lock:
-                    if self._pending_rows and self.csv_path:
-                        ok = self._append_rows_to_csv(self.csv_path, self._pending_rows)
-                        if ok:
-                            self._pending_rows.clear()
-                            self._last_flush_ts = time.time()
-                            self._next_retry_ts = 0.0
-                            self.save_complete.emit()
-                        else:
-                            # CSV 被占用：保留 pending，稍后再试
-                            self._next_retry_ts = time.time() + self._retry_interval_sec
+                    # 强制落盘：不受批次大小/时间条件限制
+                    self._flush_pending(time.time())
                 continue
 
             elif cmd == "cycle_row":
@@ -1445,20 +1516,7 @@ class DataSaver(QThread):
 
                     with self._lock:
                         # flush pending rows first
-                        if self._pending_rows and csv_path:
-                            ok = self._append_rows_to_csv(csv_path, self._pending_rows)
-                            if ok:
-                                self._pending_rows.clear()
-                                self._last_flush_ts = time.time()
-                                self._next_retry_ts = 0.0
-                                self.save_complete.emit()
-                            else:
-                                rec = self._write_recovery_csv(csv_path, self._pending_rows)
-                                if rec:
-                                    self._pending_rows.clear()
-                                    self.last_convert_success = True
-                                    self.last_convert_message = f"CSV 被占用，剩余数据已写入: {rec}"
-                                    self.save_complete.emit()
+                        self._flush_final(csv_path)
 
                         # overwrite summary/cycle
                         if csv_path:
@@ -1477,9 +1535,7 @@ class DataSaver(QThread):
         # shutdown flush
         try:
             with self._lock:
-                if self._pending_rows and self.csv_path:
-                    self._append_rows_to_csv(self.csv_path, self._pending_rows)
-                    self._pending_rows.clear()
+                self._flush_final()
         except Exception:
             pass
 
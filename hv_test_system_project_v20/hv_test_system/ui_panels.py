@@ -376,6 +376,8 @@ class ControlPanel(QWidget):
         layout.setContentsMargins(8, 15, 8, 8)
         self.main_window.log_text = QTextEdit()
         self.main_window.log_text.setReadOnly(True)
+        # 限制行数：超出后文档自动丢弃最早的行，长测时内存与重排版开销有界
+        self.main_window.log_text.document().setMaximumBlockCount(5000)
         self.main_window.log_text.setMinimumHeight(120)
         layout.addWidget(self.main_window.log_text)
         return group
@@ -6,6 +6,19 @@ from typing import Any, Dict, Optional
 
 from PyQt5.QtCore import QObject, pyqtSignal, pyqtSlot, Qt
 
+from ..constants import METER_TYPES, CURRENT_SOURCES
+
+# current_source values accepted from the web API: canonical keys plus common Chinese labels
+_CURRENT_SOURCE_ALIASES = {
+    **{src: src for src in CURRENT_SOURCES},
+    "keithley自身": "keithley",
+    "自身": "keithley",
+    "阴极": "cathode",
+    "栅极": "gate",
+    "阳极": "anode",
+    "收集极": "backup",
+}
+
 class WebBridge(QObject):
     """
     Thread-safe bridge between FastAPI (background thread) and Qt main thread.
@@ -162,21 +175,8 @@ class WebBridge(QObject):
                     if "current_source" in params:
                         src = str(params.get("current_source") or "").strip().lower()
                         # Accept both key-form and some common Chinese labels
-                        mapping = {
-                            "keithley": "keithley",
-                            "keithley自身": "keithley",
-                            "自身": "keithley",
-                            "cathode": "cathode",
-                            "阴极": "cathode",
-                            "gate": "gate",
-                            "栅极": "gate",
-                            "anode": "anode",
-                            "阳极": "anode",
-                            "backup": "backup",
-                            "收集极": "backup",
-                        }
-                        if src in mapping:
-                            sp["current_source"] = mapping[src]
+                        if src in _CURRENT_SOURCE_ALIASES:
+                            sp["current_source"] = _CURRENT_SOURCE_ALIASES[src]
                         else:
                             self._result_signal.emit(cmd_id, err(f"Invalid current_source: {src}"))
                             return
@@ -190,8 +190,8 @@ class WebBridge(QObject):
                     self.mw.update_settings_display()
                     # Persist to config (Qt dialog does this)
                     try:
-                        if hasattr(self.mw, "save_config_from_ui"):
-                            self.mw.save_config_from_ui()
+                        if hasattr(self.mw, "schedule_save_config"):
+                            self.mw.schedule_save_config()
                     except Exception:
                         pass
 
@@ -205,7 +205,8 @@ class WebBridge(QObject):
                 meter_type = str(params.get("meter_type"))
                 coeff = float(params.get("coefficient", 1.0))
                 if meter_type in self.mw.meter_data:
-                    self.mw.meter_data[meter_type]["coefficient"] = coeff
+                    # publish a new immutable sample (readers on other threads never see a half-updated record)
+                    self.mw.meter_data[meter_type] = self.mw.meter_data[meter_type]._replace(coefficient=coeff)
                     self._result_signal.emit(cmd_id, ok())
                 else:
                     self._result_signal.emit(cmd_id, err(f"Unknown meter_type: {meter_type}"))
@@ -360,13 +361,13 @@ class WebBridge(QObject):
         meters = {}
         try:
             for k, v in self.mw.meter_data.items():
-                meters[k] = dict(v)
+                meters[k] = v._asdict()
         except Exception:
             pass
 
 
         # Add connection flags for meters (aligned with desktop UI button text)
-        for _k in ["cathode", "gate", "anode", "backup", "vacuum"]:
+        for _k in METER_TYPES:
             try:
                 btn = getattr(self.mw, f"{_k}_connect_btn", None)
                 if btn is not None and _k in meters:
@@ -422,7 +423,7 @@ class WebBridge(QObject):
 
         # Meters
         meters: Dict[str, Any] = {}
-        for key in ["cathode", "gate", "anode", "backup", "vacuum"]:
+        for key in METER_TYPES:
             try:
                 port_combo = getattr(self.mw, f"{key}_port_combo", None)
                 port = port_combo.currentText() if port_combo else ""